@@ -4,7 +4,7 @@ Lich CLI - Main Typer application.
 import typer
 from rich.console import Console
 from lich import __version__
-from lich.commands import init, dev, version, upgrade, adopt, shell, routes, test, seed, git, doctor
+from lich.commands import init, dev, version, upgrade, adopt, shell, routes, test, seed, git, doctor, profile
 from lich.commands.migration import migration_app
 from lich.commands.make import make_app
 from lich.commands.middleware import middleware_app
@@ -50,6 +50,7 @@ app.command(name="shell", help="Interactive Python shell")(shell.shell_command)
 app.command(name="routes", help="List all API routes")(routes.routes_command)
 app.command(name="test", help="Run project tests")(test.test_command)
 app.command(name="seed", help="Seed database with test data")(seed.seed_command)
+app.command(name="profile", help="Profile a request against a running backend")(profile.profile_command)
 app.command(name="commit", help="Create a Semantic Commit")(git.git_commit)
 app.command(name="tag", help="Create a Version Tag")(git.git_tag)
 app.command(name="push", help="Push changes to remote")(git.git_push)
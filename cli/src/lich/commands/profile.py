@@ -0,0 +1,142 @@
+"""
+lich profile - Profile a request against a running backend.
+"""
+import hashlib
+import hmac
+import os
+import time
+import webbrowser
+from pathlib import Path
+from typing import List, Optional
+from urllib.parse import urlsplit
+
+import requests
+import typer
+from rich.console import Console
+
+console = Console()
+
+# Report format -> file extension (must match api/middleware/profiling.py)
+FORMATS = {
+    "html": ".html",
+    "speedscope": ".speedscope.json",
+}
+
+
+def sign_profile_request(secret: str, method: str, path: str, timestamp: Optional[int] = None) -> str:
+    """X-Profile header value, as computed by the backend's ProfilingMiddleware."""
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    message = f"{timestamp}:{method.upper()}:{path}".encode()
+    signature = hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+    return f"{timestamp}:{signature}"
+
+
+def get_profiling_secret() -> Optional[str]:
+    """PROFILING_SECRET from the environment or backend/.env."""
+    secret = os.environ.get("PROFILING_SECRET")
+    if secret:
+        return secret
+
+    for env_file in (Path("backend/.env"), Path(".env")):
+        if env_file.exists():
+            for line in env_file.read_text().splitlines():
+                if line.startswith("PROFILING_SECRET="):
+                    return line.split("=", 1)[1].strip().strip('"').strip("'") or None
+    return None
+
+
+def profile_command(
+    path: str = typer.Argument(..., help="Request path, e.g. /api/v1/users"),
+    method: str = typer.Option("GET", "--method", "-X", help="HTTP method"),
+    url: str = typer.Option("http://localhost:8000", "--url", "-u", help="Backend base URL"),
+    data: Optional[str] = typer.Option(None, "--data", "-d", help="Request body (JSON)"),
+    header: List[str] = typer.Option([], "--header", "-H", help="Extra header, e.g. 'Authorization: Bearer ...'"),
+    report_format: str = typer.Option("html", "--format", "-f", help="Report format: html or speedscope"),
+    output: Optional[Path] = typer.Option(None, "--output", "-o", help="Save the report to this file"),
+    open_report: bool = typer.Option(True, "--open/--no-open", help="Open HTML reports in the browser"),
+    secret: Optional[str] = typer.Option(None, "--secret", help="Profiling secret (default: PROFILING_SECRET)"),
+):
+    """
+    Send one profiled request to a running backend and fetch its report.
+
+    The backend must run with PROFILING_SECRET set; the request is signed
+    with the same secret so only you can trigger profiling.
+
+    Examples:
+        lich profile /api/v1/users
+        lich profile /api/v1/users -H "Authorization: Bearer $TOKEN"
+        lich profile /api/v1/users -X POST -d '{"email": "a@b.c"}'
+        lich profile /api/v1/users -f speedscope -o users.json
+    """
+    secret = secret or get_profiling_secret()
+    if not secret:
+        console.print("[red]❌ No profiling secret![/red]")
+        console.print("[dim]Set PROFILING_SECRET for the backend and here (or in backend/.env)[/dim]")
+        raise typer.Exit(1)
+
+    if report_format not in FORMATS:
+        console.print(f"[red]❌ Unknown format: {report_format}[/red] (use html or speedscope)")
+        raise typer.Exit(1)
+
+    method = method.upper()
+    base_url = url.rstrip("/")
+    request_path = urlsplit(path).path
+    headers = {}
+    for item in header:
+        name, _, value = item.partition(":")
+        headers[name.strip()] = value.strip()
+    headers["X-Profile"] = sign_profile_request(secret, method, request_path)
+    headers["X-Profile-Format"] = report_format
+    if data is not None:
+        headers.setdefault("Content-Type", "application/json")
+
+    console.print(f"\n🔬 [bold blue]Profiling {method} {path}[/bold blue]\n")
+
+    try:
+        response = requests.request(method, f"{base_url}{path}", headers=headers, data=data, timeout=120)
+    except requests.exceptions.RequestException as e:
+        console.print(f"[red]❌ Request failed: {e}[/red]")
+        raise typer.Exit(1)
+
+    console.print(f"  Status: {response.status_code}")
+    console.print(f"  Time:   {response.elapsed.total_seconds() * 1000:.1f}ms")
+
+    report_id = response.headers.get("X-Profile-Id")
+    if not report_id:
+        console.print("[red]❌ The request was not profiled.[/red]")
+        console.print("[dim]Is ProfilingMiddleware enabled with the same secret? Only one request is profiled at a time.[/dim]")
+        raise typer.Exit(1)
+
+    report = _fetch_report(base_url, report_id, secret)
+    if report is None:
+        console.print(f"[red]❌ Could not fetch report {report_id}[/red]")
+        raise typer.Exit(1)
+
+    output = output or Path(f"profile-{report_id[:8]}{FORMATS[report_format]}")
+    output.write_bytes(report)
+    console.print(f"\n[green]✓ Report saved to {output}[/green]")
+
+    if report_format == "speedscope":
+        console.print("[dim]Open it at https://www.speedscope.app[/dim]")
+    elif open_report:
+        webbrowser.open(output.resolve().as_uri())
+
+
+def _fetch_report(base_url: str, report_id: str, secret: str, attempts: int = 10) -> Optional[bytes]:
+    """Download a report; the backend writes it just after responding."""
+    report_path = f"/_profiles/{report_id}"
+    for _ in range(attempts):
+        try:
+            response = requests.get(
+                f"{base_url}{report_path}",
+                headers={"X-Profile": sign_profile_request(secret, "GET", report_path)},
+                timeout=30,
+            )
+        except requests.exceptions.RequestException:
+            return None
+        if response.status_code == 200:
+            return response.content
+        if response.status_code != 404:
+            return None
+        time.sleep(0.5)
+    return None
@@ -0,0 +1,82 @@
+"""
+Tests for lich profile command.
+"""
+import hashlib
+import hmac
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from typer.testing import CliRunner
+
+from lich.cli import app
+from lich.commands.profile import sign_profile_request
+
+
+def _response(status_code=200, headers=None, content=b""):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.content = content
+    response.elapsed.total_seconds.return_value = 0.012
+    return response
+
+
+class TestSignProfileRequest:
+    """The signature must match the backend's ProfilingMiddleware."""
+
+    def test_signature_format(self):
+        expected = hmac.new(b"secret", b"1700000000:GET:/api/v1/users", hashlib.sha256).hexdigest()
+
+        assert sign_profile_request("secret", "get", "/api/v1/users", 1700000000) == f"1700000000:{expected}"
+
+
+class TestProfileCommand:
+    """Tests for profile command."""
+
+    def test_profile_requires_secret(self, runner: CliRunner, temp_dir: Path, monkeypatch):
+        """Test that profile fails without a profiling secret."""
+        monkeypatch.chdir(temp_dir)
+        monkeypatch.delenv("PROFILING_SECRET", raising=False)
+
+        result = runner.invoke(app, ["profile", "/api/v1/users"])
+
+        assert result.exit_code == 1
+        assert "No profiling secret" in result.output
+
+    def test_profile_reads_secret_from_backend_env(self, runner: CliRunner, in_lich_project: Path, monkeypatch):
+        """Test that the secret is read from backend/.env and the report is saved."""
+        monkeypatch.delenv("PROFILING_SECRET", raising=False)
+        (in_lich_project / "backend" / ".env").write_text("DEBUG=true\nPROFILING_SECRET=from-env\n")
+
+        with patch("lich.commands.profile.requests.request") as request, \
+                patch("lich.commands.profile.requests.get") as get:
+            request.return_value = _response(headers={"X-Profile-Id": "a" * 32})
+            get.return_value = _response(content=b"<html>report</html>")
+            result = runner.invoke(app, ["profile", "/api/v1/users?limit=5", "--no-open", "-o", "report.html"])
+
+        assert result.exit_code == 0
+        sent = request.call_args.kwargs["headers"]["X-Profile"]
+        timestamp = int(sent.split(":")[0])
+        # Signed without the query string, as the backend verifies scope["path"]
+        assert sent == sign_profile_request("from-env", "GET", "/api/v1/users", timestamp)
+        assert get.call_args.args[0] == f"http://localhost:8000/_profiles/{'a' * 32}"
+        assert (in_lich_project / "report.html").read_bytes() == b"<html>report</html>"
+
+    def test_profile_reports_unprofiled_request(self, runner: CliRunner, temp_dir: Path, monkeypatch):
+        """Test that a response without X-Profile-Id is reported."""
+        monkeypatch.chdir(temp_dir)
+
+        with patch("lich.commands.profile.requests.request", return_value=_response()):
+            result = runner.invoke(app, ["profile", "/api/v1/users", "--secret", "s"])
+
+        assert result.exit_code == 1
+        assert "not profiled" in result.output
+
+    def test_profile_rejects_unknown_format(self, runner: CliRunner, temp_dir: Path, monkeypatch):
+        """Test that only html and speedscope are accepted."""
+        monkeypatch.chdir(temp_dir)
+
+        result = runner.invoke(app, ["profile", "/", "--secret", "s", "--format", "pdf"])
+
+        assert result.exit_code == 1
+        assert "Unknown format" in result.output
@@ -37,20 +37,7 @@ async def register(
 ):
     """Register a new user."""
     user = await user_service.create_user(request)
-    return UserResponse(
-        id=user.id,
-        email=user.email,
-        username=user.username,
-        first_name=user.first_name,
-        last_name=user.last_name,
-        full_name=user.full_name,
-        role=user.role.value,
-        status=user.status.value,
-        is_verified=user.is_verified,
-        avatar_url=user.avatar_url,
-        created_at=user.created_at,
-        updated_at=user.updated_at,
-    )
+    return UserResponse.from_entity(user)
 
 
 @router.post("/login", response_model=LoginResponse)
@@ -84,20 +71,7 @@ async def login(
     refresh_token = create_refresh_token({"sub": str(user.id)})
     
     return LoginResponse(
-        user=UserResponse(
-            id=user.id,
-            email=user.email,
-            username=user.username,
-            first_name=user.first_name,
-            last_name=user.last_name,
-            full_name=user.full_name,
-            role=user.role.value,
-            status=user.status.value,
-            is_verified=user.is_verified,
-            avatar_url=user.avatar_url,
-            created_at=user.created_at,
-            updated_at=user.updated_at,
-        ),
+        user=UserResponse.from_entity(user),
         tokens=TokenResponse(
             access_token=access_token,
             refresh_token=refresh_token,
@@ -257,20 +231,7 @@ async def google_callback(
     refresh_token = create_refresh_token({"sub": str(user.id)})
     
     return LoginResponse(
-        user=UserResponse(
-            id=user.id,
-            email=user.email,
-            username=user.username,
-            first_name=user.first_name,
-            last_name=user.last_name,
-            full_name=user.full_name,
-            role=user.role.value,
-            status=user.status.value,
-            is_verified=user.is_verified,
-            avatar_url=user.avatar_url,
-            created_at=user.created_at,
-            updated_at=user.updated_at,
-        ),
+        user=UserResponse.from_entity(user),
         tokens=TokenResponse(
             access_token=access_token,
             refresh_token=refresh_token,
@@ -301,20 +262,7 @@ async def get_current_user_info(
     current_user: User = Depends(get_current_user),
 ):
     """Get current authenticated user info."""
-    return UserResponse(
-        id=current_user.id,
-        email=current_user.email,
-        username=current_user.username,
-        first_name=current_user.first_name,
-        last_name=current_user.last_name,
-        full_name=current_user.full_name,
-        role=current_user.role.value,
-        status=current_user.status.value,
-        is_verified=current_user.is_verified,
-        avatar_url=current_user.avatar_url,
-        created_at=current_user.created_at,
-        updated_at=current_user.updated_at,
-    )
+    return UserResponse.from_entity(current_user)
 
 
 @router.post("/logout", response_model=MessageResponse)
@@ -3,6 +3,13 @@ Health check endpoints.
 """
 from fastapi import APIRouter
 from internal.dto.responses import HealthResponse
+{%- if cookiecutter.database == 'postgresql' %}
+from internal.adapters.db.connection import pool_stats
+{%- endif %}
+{%- if cookiecutter.use_redis == 'yes' %}
+from internal.adapters.cache.near_cache import near_cache_stats
+from internal.adapters.cache.redis_cache import redis_stats
+{%- endif %}
 
 router = APIRouter()
 
@@ -26,3 +33,19 @@ async def readiness_check():
         service="{{ cookiecutter.project_slug }}-api",
         version="1.0.0",
     )
+{%- if cookiecutter.database == 'postgresql' %}
+
+
+@router.get("/metrics/pool")
+async def pool_metrics():
+    """Database connection pool statistics (primary and replicas)."""
+    return pool_stats()
+{%- endif %}
+{%- if cookiecutter.use_redis == 'yes' %}
+
+
+@router.get("/metrics/cache")
+async def cache_metrics():
+    """Redis pool utilization, and near cache hit ratios per tier (local, Redis)."""
+    return {"redis": redis_stats(), "near_cache": near_cache_stats()}
+{%- endif %}
@@ -0,0 +1,19 @@
+"""
+Response classes shared by the HTTP routers.
+"""
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson.
+
+    Used as the application's default_response_class. UUIDs and datetimes
+    are serialized natively, with UTC written as "Z" to match Pydantic.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
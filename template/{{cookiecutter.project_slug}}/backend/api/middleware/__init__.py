@@ -6,6 +6,12 @@ Available middlewares (opt-in):
     - RequestLoggingMiddleware: Log all requests
     - SecurityHeadersMiddleware: Add security headers
     - TimingMiddleware: Add response timing
+{%- if cookiecutter.database == 'postgresql' %}
+    - QueryStatsMiddleware: Per-request query counts and N+1 warnings
+      (enabled by settings.db_query_stats_enabled)
+{%- endif %}
+    - ProfilingMiddleware: Profile signed or sampled requests
+      (enabled by settings.profiling_secret / profiling_sample_rate)
 
 To enable, add to main.py:
     from api.middleware.rate_limit import RateLimitMiddleware
@@ -18,4 +24,13 @@ To enable, add to main.py:
     app.add_middleware(SecurityHeadersMiddleware)
     app.add_middleware(RequestLoggingMiddleware)
     app.add_middleware(RateLimitMiddleware, requests_per_minute=60)
+
+All middlewares are pure ASGI (no BaseHTTPMiddleware), so streaming
+responses pass through untouched. Header-only middlewares (timing,
+security, logging, audit) can share one layer via HeaderPipeline:
+    from api.middleware.pipeline import HeaderPipeline
+    app.add_middleware(
+        HeaderPipeline,
+        middlewares=[TimingMiddleware(), SecurityHeadersMiddleware(), RequestLoggingMiddleware()],
+    )
 """
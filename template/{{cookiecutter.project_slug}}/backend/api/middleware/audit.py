@@ -4,19 +4,24 @@ Audit Logging Middleware - Log all state-changing API requests.
 To enable, add to main.py:
     from api.middleware.audit import AuditMiddleware
     app.add_middleware(AuditMiddleware)
+
+With persist_to_db=True entries are written to the audit_logs table
+(collection) in batches by a background AuditSink; the request only
+pays for an in-memory queue append.
 """
 import json
 import logging
 from datetime import datetime
-from typing import Callable, Optional
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from typing import Any, Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Scope
+
+from api.middleware.pipeline import HeaderMiddleware
 
 logger = logging.getLogger("audit")
 
 
-class AuditMiddleware(BaseHTTPMiddleware):
+class AuditMiddleware(HeaderMiddleware):
     """
     Audit Logging Middleware.
     
@@ -31,7 +36,7 @@ class AuditMiddleware(BaseHTTPMiddleware):
     Usage:
         app.add_middleware(AuditMiddleware)
         
-        # With DB persistence:
+        # With DB persistence (entries are no longer logged unless log_entries=True):
         app.add_middleware(AuditMiddleware, persist_to_db=True)
     """
     
@@ -39,123 +44,101 @@ class AuditMiddleware(BaseHTTPMiddleware):
     
     def __init__(
         self,
-        app,
+        app: ASGIApp = None,
         persist_to_db: bool = False,
         exclude_paths: list = None,
+        log_entries: Optional[bool] = None,
     ):
         super().__init__(app)
         self.persist_to_db = persist_to_db
-        self.exclude_paths = exclude_paths or [
+        # The database is the record when persisting; skip the extra log line
+        self.log_entries = (not persist_to_db) if log_entries is None else log_entries
+        self.exclude_paths = tuple(exclude_paths or [
             "/health", "/api/health", "/api/docs", 
             "/api/openapi.json", "/metrics"
-        ]
+        ])
     
-    def _get_client_ip(self, request: Request) -> str:
+    def _get_client_ip(self, scope: Scope, headers: Headers) -> str:
         """Get client IP address, handling proxies."""
         # Check X-Forwarded-For header (from reverse proxy)
-        forwarded = request.headers.get("X-Forwarded-For")
+        forwarded = headers.get("X-Forwarded-For")
         if forwarded:
             return forwarded.split(",")[0].strip()
         
         # Check X-Real-IP header
-        real_ip = request.headers.get("X-Real-IP")
+        real_ip = headers.get("X-Real-IP")
         if real_ip:
             return real_ip
         
         # Fall back to direct connection
-        if request.client:
-            return request.client.host
+        client = scope.get("client")
+        if client:
+            return client[0]
         
         return "unknown"
     
-    def _get_user_id(self, request: Request) -> Optional[str]:
+    def _get_user_id(self, scope: Scope, headers: Headers) -> Optional[str]:
         """Extract user ID from request state or JWT."""
         # Try request.state.user (set by auth middleware)
-        if hasattr(request.state, "user"):
-            user = request.state.user
+        user = scope.get("state", {}).get("user")
+        if user is not None:
             if hasattr(user, "id"):
                 return str(user.id)
             elif isinstance(user, dict):
                 return str(user.get("id", user.get("sub", "unknown")))
         
         # Try to decode from Authorization header (basic extraction)
-        auth = request.headers.get("Authorization", "")
+        auth = headers.get("Authorization", "")
         if auth.startswith("Bearer "):
             # Just log that there was a token, don't decode here
             return "authenticated"
         
         return "anonymous"
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Skip non-audited methods
-        if request.method not in self.AUDITED_METHODS:
-            return await call_next(request)
-        
-        # Skip excluded paths
-        if any(request.url.path.startswith(path) for path in self.exclude_paths):
-            return await call_next(request)
-        
-        start_time = datetime.utcnow()
-        
-        # Process request
-        response = await call_next(request)
+    def on_request(self, scope: Scope) -> Any:
+        # Skip non-audited methods and excluded paths
+        if scope["method"] not in self.AUDITED_METHODS:
+            return None
+        if scope["path"].startswith(self.exclude_paths):
+            return None
+        return datetime.utcnow()
+    
+    def on_response(self, scope: Scope, state: Any, status: int, headers: MutableHeaders) -> None:
+        if state is None:
+            return
         
-        end_time = datetime.utcnow()
-        duration_ms = (end_time - start_time).total_seconds() * 1000
+        start_time = state
+        duration_ms = (datetime.utcnow() - start_time).total_seconds() * 1000
+        request_headers = Headers(scope=scope)
         
         # Build audit entry
         audit_entry = {
             "timestamp": start_time.isoformat() + "Z",
-            "method": request.method,
-            "path": request.url.path,
-            "query": str(request.query_params) or None,
-            "user_id": self._get_user_id(request),
-            "client_ip": self._get_client_ip(request),
-            "user_agent": request.headers.get("User-Agent", "unknown")[:200],
-            "status_code": response.status_code,
+            "method": scope["method"],
+            # Clipped to the audit_logs column widths: one oversized value
+            # would otherwise fail the whole batch insert
+            "path": scope["path"][:500],
+            "query": scope.get("query_string", b"").decode("latin-1")[:1000] or None,
+            "user_id": self._get_user_id(scope, request_headers)[:100],
+            "client_ip": self._get_client_ip(scope, request_headers)[:50],
+            "user_agent": request_headers.get("User-Agent", "unknown")[:200],
+            "status_code": status,
             "duration_ms": round(duration_ms, 2),
         }
         
         # Log the audit entry
-        logger.info(json.dumps(audit_entry))
+        if self.log_entries:
+            logger.info(json.dumps(audit_entry))
         
-        # Optionally persist to database
+        # Optionally persist to database, without holding up the response
         if self.persist_to_db:
-            await self._persist_audit_log(audit_entry)
-        
-        return response
+            self._persist_audit_log(audit_entry)
     
-    async def _persist_audit_log(self, entry: dict):
-        """Persist audit log to database. Override this method for custom storage."""
-        # This is a placeholder - implement based on your DB setup
-        # Example with SQLAlchemy:
-        # async with get_session() as session:
-        #     audit_log = AuditLog(**entry)
-        #     session.add(audit_log)
-        #     await session.commit()
-        pass
+    def _persist_audit_log(self, entry: dict):
+        """
+        Hand the entry to the audit sink. Override this method for custom
+        storage; it runs on the request path, so it must not block.
+        """
+        from internal.services.audit_sink import get_audit_sink
+        get_audit_sink().submit(entry)
 
-
-# Optional: AuditLog entity for DB persistence
-"""
-To use DB persistence, create this entity:
-
-# internal/entities/audit_log.py
-from datetime import datetime
-from sqlalchemy import Column, String, Integer, DateTime
-from internal.adapters.db.base import Base
-
-class AuditLog(Base):
-    __tablename__ = "audit_logs"
-    
-    id = Column(Integer, primary_key=True)
-    timestamp = Column(DateTime, default=datetime.utcnow)
-    method = Column(String(10))
-    path = Column(String(500))
-    query = Column(String(1000), nullable=True)
-    user_id = Column(String(100))
-    client_ip = Column(String(50))
-    user_agent = Column(String(200))
-    status_code = Column(Integer)
-    duration_ms = Column(Integer)
-"""
@@ -0,0 +1,36 @@
+"""
+Request body helpers for pure ASGI middlewares.
+
+A middleware that needs the body must read it from `receive` and then
+hand the app a `receive` that replays it.
+"""
+from starlette.types import Message, Receive
+
+
+async def read_body(receive: Receive) -> bytes:
+    """Read the whole request body from the ASGI receive channel."""
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            # Client disconnected; the app will see an empty body
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+def replay_body(body: bytes, receive: Receive) -> Receive:
+    """Return a receive callable that yields `body` once, then defers to `receive`."""
+    sent = False
+    
+    async def replay() -> Message:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # Later calls wait for http.disconnect like the original channel
+        return await receive()
+    
+    return replay
@@ -8,13 +8,16 @@ To enable, add to main.py:
 import secrets
 import hashlib
 import hmac
-from typing import Callable, Optional
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response, JSONResponse
+from typing import Optional
+from urllib.parse import parse_qs
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
+from api.middleware.body import read_body, replay_body
 
-class CSRFMiddleware(BaseHTTPMiddleware):
+
+class CSRFMiddleware:
     """
     CSRF Protection Middleware.
     
@@ -36,17 +39,17 @@ class CSRFMiddleware(BaseHTTPMiddleware):
     
     def __init__(
         self,
-        app,
+        app: Optional[ASGIApp],
         secret_key: str,
         header_name: str = "X-CSRF-Token",
         cookie_name: str = "csrf_token",
         exempt_paths: list = None,
     ):
-        super().__init__(app)
+        self.app = app
         self.secret_key = secret_key.encode()
         self.header_name = header_name
         self.cookie_name = cookie_name
-        self.exempt_paths = exempt_paths or ["/health", "/api/health", "/api/docs"]
+        self.exempt_paths = tuple(exempt_paths or ["/health", "/api/health", "/api/docs"])
     
     def _generate_token(self) -> str:
         """Generate a new CSRF token."""
@@ -64,36 +67,39 @@ class CSRFMiddleware(BaseHTTPMiddleware):
         except (ValueError, AttributeError):
             return False
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Skip for safe methods
-        if request.method in self.SAFE_METHODS:
-            response = await call_next(request)
-            return response
-        
-        # Skip for exempt paths
-        if any(request.url.path.startswith(path) for path in self.exempt_paths):
-            response = await call_next(request)
-            return response
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Skip for non-HTTP, safe methods and exempt paths
+        if (
+            scope["type"] != "http"
+            or scope["method"] in self.SAFE_METHODS
+            or scope["path"].startswith(self.exempt_paths)
+        ):
+            await self.app(scope, receive, send)
+            return
         
         # Get token from header or form data
-        token = request.headers.get(self.header_name)
+        headers = Headers(scope=scope)
+        token = headers.get(self.header_name)
         
         if not token:
             # Try to get from form data
-            content_type = request.headers.get("content-type", "")
+            content_type = headers.get("content-type", "")
             if "application/x-www-form-urlencoded" in content_type:
-                form = await request.form()
-                token = form.get("_csrf_token")
+                body = await read_body(receive)
+                receive = replay_body(body, receive)
+                values = parse_qs(body.decode("latin-1")).get("_csrf_token")
+                token = values[0] if values else None
         
         # Validate token
         if not token or not self._validate_token(token):
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=403,
                 content={"detail": "CSRF token missing or invalid"}
             )
+            await response(scope, receive, send)
+            return
         
-        response = await call_next(request)
-        return response
+        await self.app(scope, receive, send)
 
 
 # Endpoint to get CSRF token - add to your routes
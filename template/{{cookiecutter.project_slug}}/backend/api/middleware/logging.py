@@ -7,10 +7,11 @@ To enable, add to main.py:
 """
 import time
 import uuid
-from typing import Callable
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from typing import Any
+from starlette.datastructures import MutableHeaders
+from starlette.types import Scope
+
+from api.middleware.pipeline import HeaderMiddleware
 {%- if cookiecutter.use_structured_logging == 'yes' %}
 from pkg.logger.setup import get_logger
 
@@ -22,7 +23,7 @@ logger = logging.getLogger(__name__)
 {%- endif %}
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+class RequestLoggingMiddleware(HeaderMiddleware):
     """
     Log all incoming HTTP requests with timing.
     
@@ -37,51 +38,42 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         app.add_middleware(RequestLoggingMiddleware)
     """
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Generate request ID
-        request_id = str(uuid.uuid4())[:8]
-        
-        # Get client info
-        client_ip = request.client.host if request.client else "unknown"
-        method = request.method
-        path = request.url.path
-        
-        # Start timer
-        start_time = time.time()
-        
-        # Process request
-        try:
-            response = await call_next(request)
-        except Exception as e:
-            # Log error
-            process_time = (time.time() - start_time) * 1000
-            logger.error(
-                f"[{request_id}] {method} {path} - ERROR after {process_time:.2f}ms",
-                extra={
-                    "request_id": request_id,
-                    "method": method,
-                    "path": path,
-                    "client_ip": client_ip,
-                    "error": str(e),
-                    "duration_ms": process_time,
-                }
-            )
-            raise
+    def on_request(self, scope: Scope) -> Any:
+        # Generate request ID and start timer
+        return uuid.uuid4().hex[:8], time.perf_counter()
+    
+    def on_response(self, scope: Scope, state: Any, status: int, headers: MutableHeaders) -> None:
+        request_id, start_time = state
         
         # Calculate response time
-        process_time = (time.time() - start_time) * 1000
+        process_time = (time.perf_counter() - start_time) * 1000
         
         # Log request
-        log_message = f"[{request_id}] {method} {path} - {response.status_code} ({process_time:.2f}ms)"
+        log_message = f"[{request_id}] {scope['method']} {scope['path']} - {status} ({process_time:.2f}ms)"
         
-        if response.status_code >= 500:
+        if status >= 500:
             logger.error(log_message)
-        elif response.status_code >= 400:
+        elif status >= 400:
             logger.warning(log_message)
         else:
             logger.info(log_message)
         
         # Add request ID to response headers
-        response.headers["X-Request-ID"] = request_id
+        headers["X-Request-ID"] = request_id
+    
+    def on_error(self, scope: Scope, state: Any, exc: Exception) -> None:
+        request_id, start_time = state
+        process_time = (time.perf_counter() - start_time) * 1000
+        client = scope.get("client")
         
-        return response
+        logger.error(
+            f"[{request_id}] {scope['method']} {scope['path']} - ERROR after {process_time:.2f}ms",
+            extra={
+                "request_id": request_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "client_ip": client[0] if client else "unknown",
+                "error": str(exc),
+                "duration_ms": process_time,
+            }
+        )
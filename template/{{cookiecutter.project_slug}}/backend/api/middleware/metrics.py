@@ -0,0 +1,93 @@
+"""
+Metrics Middleware - Prometheus request metrics.
+
+Records request count, latency and in-flight requests, labelled by the
+matched route template (e.g. /api/v1/users/{user_id}) so label
+cardinality stays bounded no matter what paths clients send. Requests
+that match no route are labelled "unmatched", and non-standard HTTP
+methods "OTHER".
+
+Enabled in main.py when settings.metrics_enabled is set; metrics are
+served at /metrics.
+"""
+import time
+from typing import Dict, Tuple
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from pkg.metrics import HTTP_REQUESTS, HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT
+
+
+# Anything else a client sends is labelled "OTHER"
+HTTP_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "TRACE", "CONNECT"})
+
+
+def method_label(scope: Scope) -> str:
+    """The request method, or "OTHER" for non-standard ones."""
+    method = scope["method"]
+    return method if method in HTTP_METHODS else "OTHER"
+
+
+def route_template(scope: Scope) -> str:
+    """The matched route's path template, or "unmatched"."""
+    # Recent FastAPI versions resolve included routers lazily: the route
+    # only knows its own path, the effective context has the full one.
+    fastapi_scope = scope.get("fastapi")
+    if isinstance(fastapi_scope, dict):
+        template = getattr(fastapi_scope.get("effective_route_context"), "path_format", None)
+        if template:
+            return template
+    return getattr(scope.get("route"), "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording Prometheus HTTP metrics.
+
+    Usage:
+        app.add_middleware(MetricsMiddleware, exclude_paths=("/metrics", "/health"))
+    """
+
+    def __init__(self, app: ASGIApp, exclude_paths: Tuple[str, ...] = ("/metrics",)):
+        self.app = app
+        self.exclude_paths = frozenset(exclude_paths)
+        # Label children are looked up once per (method, route[, status])
+        self._durations: Dict[Tuple[str, str], object] = {}
+        self._counts: Dict[Tuple[str, str, int], object] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            self._observe(scope, status, elapsed)
+
+    def _observe(self, scope: Scope, status: int, elapsed: float) -> None:
+        template = route_template(scope)
+        method = method_label(scope)
+
+        key = (method, template)
+        duration = self._durations.get(key)
+        if duration is None:
+            duration = self._durations[key] = HTTP_REQUEST_DURATION.labels(method, template)
+        duration.observe(elapsed)
+
+        count_key = (method, template, status)
+        count = self._counts.get(count_key)
+        if count is None:
+            count = self._counts[count_key] = HTTP_REQUESTS.labels(method, template, str(status))
+        count.inc()
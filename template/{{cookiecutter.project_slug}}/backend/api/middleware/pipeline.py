@@ -0,0 +1,109 @@
+"""
+Header Pipeline - run several header-only middlewares as one ASGI layer.
+
+Header-only middlewares (timing, security headers, request logging,
+audit) only need the request scope and the response status/headers.
+Each one is usable on its own, but stacking them still costs one ASGI
+layer and one `send` wrapper per middleware. HeaderPipeline runs all of
+their hooks from a single layer.
+
+To enable, add to main.py (instead of adding each middleware):
+    from api.middleware.pipeline import HeaderPipeline
+    from api.middleware.timing import TimingMiddleware
+    from api.middleware.security import SecurityHeadersMiddleware
+    app.add_middleware(
+        HeaderPipeline,
+        middlewares=[TimingMiddleware(), SecurityHeadersMiddleware()],
+    )
+
+Order: the first middleware in the list behaves as the outermost one -
+its request hook runs first and its response hook runs last.
+"""
+from typing import Any, List, Optional, Sequence
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class HeaderMiddleware:
+    """
+    Base class for pure ASGI middlewares that only touch headers.
+    
+    Subclasses implement the hooks; the base class provides `__call__`
+    so the middleware can also be added on its own with
+    `app.add_middleware`. Hooks are synchronous on purpose: they run on
+    every request and must not block or do I/O.
+    """
+    
+    def __init__(self, app: Optional[ASGIApp] = None):
+        self.app = app
+    
+    def on_request(self, scope: Scope) -> Any:
+        """Called before the app; the return value is passed to the other hooks."""
+        return None
+    
+    def on_response(self, scope: Scope, state: Any, status: int, headers: MutableHeaders) -> None:
+        """Called when the response starts; may modify `headers`."""
+        pass
+    
+    def on_error(self, scope: Scope, state: Any, exc: Exception) -> None:
+        """Called if the app raises before a response was sent."""
+        pass
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        state = self.on_request(scope)
+        
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                self.on_response(scope, state, message["status"], headers)
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            self.on_error(scope, state, exc)
+            raise
+
+
+class HeaderPipeline:
+    """
+    Runs the hooks of several HeaderMiddlewares from a single ASGI layer.
+    
+    Usage:
+        app.add_middleware(
+            HeaderPipeline,
+            middlewares=[TimingMiddleware(), RequestLoggingMiddleware()],
+        )
+    """
+    
+    def __init__(self, app: ASGIApp, middlewares: Sequence[HeaderMiddleware]):
+        self.app = app
+        self.middlewares: List[HeaderMiddleware] = list(middlewares)
+        self._reversed = self.middlewares[::-1]
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.middlewares:
+            await self.app(scope, receive, send)
+            return
+        
+        states = [mw.on_request(scope) for mw in self.middlewares]
+        
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(scope=message)
+                # Innermost first, like nested middlewares would
+                for mw, state in zip(self._reversed, reversed(states)):
+                    mw.on_response(scope, state, status, headers)
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            for mw, state in zip(self._reversed, reversed(states)):
+                mw.on_error(scope, state, exc)
+            raise
@@ -0,0 +1,197 @@
+"""
+Profiling Middleware - Sample-profile live requests with pyinstrument.
+
+A request is profiled when it carries a valid signed X-Profile header
+(see sign_profile_request(); `lich profile` sends one) or is picked by
+`sample_rate`. The report is written to `output_dir` and its id returned
+in the X-Profile-Id response header; fetch it with a signed
+GET {reports_path}/{id}. Reports are HTML flame charts by default, or
+speedscope JSON when the request sends X-Profile-Format: speedscope.
+Only the newest `max_reports` are kept; older ones are deleted as new
+reports are saved.
+
+Enabled in main.py when settings.profiling_secret or
+settings.profiling_sample_rate is set; otherwise it is not installed at
+all, so unprofiled deployments pay nothing.
+"""
+import asyncio
+import hashlib
+import hmac
+import logging
+import random
+import re
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from pyinstrument import Profiler
+from pyinstrument.renderers import HTMLRenderer, SpeedscopeRenderer
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+FORMAT_HEADER = b"x-profile-format"
+
+# Report format -> (file extension, content type)
+FORMATS = {
+    "html": (".html", "text/html; charset=utf-8"),
+    "speedscope": (".speedscope.json", "application/json"),
+}
+
+_REPORT_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+def sign_profile_request(secret: str, method: str, path: str, timestamp: Optional[int] = None) -> str:
+    """X-Profile header value authorizing `method path` for a few minutes."""
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    message = f"{timestamp}:{method.upper()}:{path}".encode()
+    signature = hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+    return f"{timestamp}:{signature}"
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware profiling signed or sampled requests.
+
+    Usage:
+        app.add_middleware(ProfilingMiddleware, secret=settings.profiling_secret)
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        secret: str = "",
+        sample_rate: float = 0.0,
+        output_dir: str = "profiles",
+        interval: float = 0.001,
+        max_age_seconds: int = 300,
+        max_concurrent: int = 1,
+        reports_path: str = "/_profiles",
+        max_reports: int = 100,
+    ):
+        self.app = app
+        self.secret = secret
+        self.sample_rate = sample_rate
+        self.output_dir = Path(output_dir)
+        self.interval = interval
+        self.max_age_seconds = max_age_seconds
+        self.max_concurrent = max_concurrent
+        self.reports_path = reports_path.rstrip("/") + "/"
+        self.max_reports = max_reports
+        self._active = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        signed = self.secret and self._is_signed(scope)
+        if scope["path"].startswith(self.reports_path):
+            await self._serve_report(scope, send, signed)
+            return
+        if not signed and (not self.sample_rate or random.random() >= self.sample_rate):
+            await self.app(scope, receive, send)
+            return
+        if self._active >= self.max_concurrent:
+            await self.app(scope, receive, send)
+            return
+
+        await self._profile(scope, receive, send)
+
+    def _is_signed(self, scope: Scope) -> bool:
+        value = _header(scope, PROFILE_HEADER)
+        if value is None:
+            return False
+        timestamp, _, _ = value.partition(":")
+        try:
+            age = time.time() - int(timestamp)
+        except ValueError:
+            return False
+        if not -60 <= age <= self.max_age_seconds:
+            return False
+        expected = sign_profile_request(self.secret, scope["method"], scope["path"], int(timestamp))
+        return hmac.compare_digest(value, expected)
+
+    async def _profile(self, scope: Scope, receive: Receive, send: Send) -> None:
+        report_format = _header(scope, FORMAT_HEADER) or "html"
+        if report_format not in FORMATS:
+            report_format = "html"
+        report_id = uuid.uuid4().hex
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", report_id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        self._active += 1
+        profiler = Profiler(interval=self.interval, async_mode="enabled")
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            session = profiler.stop()
+            self._active -= 1
+            # The response has been sent; rendering only delays this task
+            try:
+                await asyncio.to_thread(self._save, session, report_id, report_format)
+            except Exception:
+                logger.exception("Failed to save profile %s", report_id)
+
+    def _save(self, session, report_id: str, report_format: str) -> None:
+        extension, _ = FORMATS[report_format]
+        renderer = SpeedscopeRenderer() if report_format == "speedscope" else HTMLRenderer()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        path = self.output_dir / f"{report_id}{extension}"
+        partial = path.with_name(path.name + ".tmp")
+        partial.write_text(renderer.render(session), encoding="utf-8")
+        partial.replace(path)
+        logger.info("Saved profile %s (%.3fs)", path, session.duration)
+        self._prune()
+
+    def _prune(self) -> None:
+        """Delete the oldest reports beyond max_reports (0 keeps all)."""
+        if self.max_reports <= 0:
+            return
+        reports = []
+        for path in self.output_dir.iterdir():
+            if any(path.name.endswith(extension) for extension, _ in FORMATS.values()):
+                try:
+                    reports.append((path.stat().st_mtime, path))
+                except FileNotFoundError:
+                    continue
+        reports.sort()
+        for _, path in reports[:-self.max_reports]:
+            path.unlink(missing_ok=True)
+
+    async def _serve_report(self, scope: Scope, send: Send, signed: bool) -> None:
+        status, content_type, body = 404, "text/plain; charset=utf-8", b"Not Found"
+        report_id = scope["path"][len(self.reports_path):]
+        if not signed:
+            status, body = 403, b"Forbidden"
+        elif _REPORT_ID.match(report_id):
+            for extension, media_type in FORMATS.values():
+                path = self.output_dir / f"{report_id}{extension}"
+                if path.exists():
+                    status, content_type, body = 200, media_type, await asyncio.to_thread(path.read_bytes)
+                    break
+
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", content_type.encode()),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def _header(scope: Scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
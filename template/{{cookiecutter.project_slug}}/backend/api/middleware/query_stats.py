@@ -0,0 +1,83 @@
+{%- if cookiecutter.database == 'postgresql' %}
+"""
+Query Stats Middleware - per-request database query counts.
+
+Counts the statements each request runs and the time spent in them (see
+internal/adapters/db/query_stats.py), reports them in a Server-Timing
+header and as Prometheus histograms labelled by route template, and
+logs likely N+1 patterns.
+
+    Server-Timing: db;dur=12.40;desc="7 queries"
+
+Enabled in main.py when settings.db_query_stats_enabled is set.
+"""
+from typing import Tuple
+
+from prometheus_client import Counter, Histogram
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.middleware.metrics import method_label, route_template
+from internal.adapters.db.query_stats import track_queries
+from pkg.config.settings import settings
+from pkg.metrics.registry import LATENCY_BUCKETS
+
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "Statements executed per HTTP request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds",
+    "Time spent executing statements per HTTP request",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_N_PLUS_ONE = Counter(
+    "db_n_plus_one_total",
+    "Requests that repeated one statement db_n_plus_one_threshold times or more",
+    ["method", "route"],
+)
+
+
+class QueryStatsMiddleware:
+    """
+    Pure ASGI middleware collecting query statistics per request.
+
+    Usage:
+        app.add_middleware(QueryStatsMiddleware, exclude_paths=("/metrics", "/health"))
+    """
+
+    def __init__(self, app: ASGIApp, exclude_paths: Tuple[str, ...] = ("/metrics",)):
+        self.app = app
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = method_label(scope)
+        with track_queries(f"{method} {scope['path']}") as stats:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Server-Timing",
+                        f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries"',
+                    )
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = route_template(scope)
+                DB_QUERIES_PER_REQUEST.labels(method, route).observe(stats.count)
+                DB_TIME_PER_REQUEST.labels(method, route).observe(stats.duration)
+                if stats.repeated(settings.db_n_plus_one_threshold):
+                    DB_N_PLUS_ONE.labels(method, route).inc()
+{%- else %}
+"""Query statistics are only collected for the SQLAlchemy (PostgreSQL) adapter."""
+{%- endif %}
@@ -4,77 +4,181 @@ Rate Limit Middleware - Prevent API abuse.
 To enable, add to main.py:
     from api.middleware.rate_limit import RateLimitMiddleware
     app.add_middleware(RateLimitMiddleware, requests_per_minute=60)
+
+Per-route and per-user quotas:
+    app.add_middleware(
+        RateLimitMiddleware,
+        requests_per_minute=300,
+        user_requests_per_minute=120,
+        route_limits={"/api/auth/login": 10, "/api/auth/register": 5},
+    )
 """
-import time
-from typing import Dict, Callable
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response, JSONResponse
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from pkg.config.settings import settings
+from pkg.ratelimit import Decision, RateLimitBackend, LocalRateLimitBackend
+
+
+logger = logging.getLogger(__name__)
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+def default_backend() -> RateLimitBackend:
+    """Redis when configured and available, otherwise in-process."""
+    {%- if cookiecutter.use_redis == 'yes' %}
+    if settings.rate_limit_backend == "redis":
+        from internal.adapters.cache.redis_cache import get_redis
+        from pkg.ratelimit import RedisRateLimitBackend
+        try:
+            return RedisRateLimitBackend(get_redis())
+        except RuntimeError:
+            # Redis not initialized (e.g. tests without the lifespan)
+            pass
+    {%- endif %}
+    return LocalRateLimitBackend(max_keys=settings.rate_limit_max_keys)
+
+
+class RateLimitMiddleware:
     """
-    Simple in-memory rate limiter.
+    Sliding-window rate limiter.
     
-    For production, consider using Redis-based rate limiting.
+    Every request is limited per client IP, and per IP on routes listed
+    in `route_limits`. When `user_requests_per_minute` is set, requests
+    with a valid bearer token are also limited per user (the token's
+    `sub`); this is an extra check, so an unverified or rotated token
+    never gets around the IP limits.
+    
+    Counters live in Redis when `RATE_LIMIT_BACKEND=redis` (shared by all
+    workers), otherwise in a bounded in-process LRU. If Redis fails, the
+    request is checked against per-process counters instead.
     
     Args:
         requests_per_minute: Maximum requests per IP per minute
+        user_requests_per_minute: Maximum requests per user per minute
+        route_limits: Extra per-IP limits by path prefix (longest prefix wins)
+        backend: Counter storage; defaults to `default_backend()`
+        token_subject: Returns the `sub` of a valid token, None otherwise;
+            defaults to `internal.services.auth_deps.token_subject`
         
     Usage:
         app.add_middleware(RateLimitMiddleware, requests_per_minute=60)
     """
     
-    def __init__(self, app, requests_per_minute: int = 60):
-        super().__init__(app)
+    window_seconds = 60
+    
+    def __init__(
+        self,
+        app: ASGIApp,
+        requests_per_minute: int = 60,
+        user_requests_per_minute: Optional[int] = None,
+        route_limits: Optional[Dict[str, int]] = None,
+        backend: Optional[RateLimitBackend] = None,
+        token_subject: Optional[Callable[[str], Awaitable[Optional[str]]]] = None,
+    ):
+        self.app = app
         self.requests_per_minute = requests_per_minute
-        self.requests: Dict[str, list] = {}
+        self.user_requests_per_minute = user_requests_per_minute
+        # Longest prefix first so the most specific route matches
+        self.route_limits: List[Tuple[str, int]] = sorted(
+            (route_limits or {}).items(), key=lambda item: len(item[0]), reverse=True
+        )
+        # Resolved on first request: Redis is only initialized in the lifespan
+        self._backend = backend
+        # Used while the shared backend is failing
+        self._fallback = LocalRateLimitBackend(max_keys=settings.rate_limit_max_keys)
+        self._degraded = False
+        self._token_subject = token_subject
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    @property
+    def backend(self) -> RateLimitBackend:
+        if self._backend is None:
+            self._backend = default_backend()
+        return self._backend
+    
+    def _client_ip(self, scope: Scope, headers: Headers) -> str:
         # Get client IP - respect X-Forwarded-For header for proxied requests
         # This is critical when running behind Traefik, Nginx, or any reverse proxy
-        forwarded = request.headers.get("x-forwarded-for")
+        forwarded = headers.get("x-forwarded-for")
         if forwarded:
             # X-Forwarded-For can contain multiple IPs: "client, proxy1, proxy2"
             # The first IP is the original client
-            client_ip = forwarded.split(",")[0].strip()
-        else:
-            client_ip = request.client.host if request.client else "unknown"
-        
+            return forwarded.split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+    
+    async def _user(self, headers: Headers) -> Optional[str]:
+        """Subject of a verified bearer token, if any."""
+        auth = headers.get("authorization", "")
+        if auth[:7].lower() != "bearer " or len(auth) <= 7:
+            return None
+        if self._token_subject is None:
+            from internal.services.auth_deps import token_subject
+            self._token_subject = token_subject
+        return await self._token_subject(auth[7:])
+    
+    async def _hit(self, checks: Sequence[Tuple[str, int]]) -> Decision:
+        try:
+            decision = await self.backend.hit(checks, self.window_seconds)
+        except Exception as e:
+            if not self._degraded:
+                logger.warning("Rate limit backend failed, using per-process limits: %s", e)
+                self._degraded = True
+            return await self._fallback.hit(checks, self.window_seconds)
+        if self._degraded:
+            logger.info("Rate limit backend recovered")
+            self._degraded = False
+        return decision
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         # Skip rate limiting for health checks
-        if request.url.path in ["/health", "/api/health"]:
-            return await call_next(request)
+        path = scope.get("path", "")
+        if scope["type"] != "http" or path in ("/health", "/api/health"):
+            await self.app(scope, receive, send)
+            return
         
-        # Current time
-        now = time.time()
-        minute_ago = now - 60
+        headers = Headers(scope=scope)
+        # Keys of one hit share a {hash tag} so Redis Cluster keeps them on one slot
+        client = "{ip:%s}" % self._client_ip(scope, headers)
+        checks = [(client, self.requests_per_minute)]
+        for prefix, route_limit in self.route_limits:
+            if path.startswith(prefix):
+                checks.append((f"{client}:route:{prefix}", route_limit))
+                break
         
-        # Clean old requests
-        if client_ip in self.requests:
-            self.requests[client_ip] = [
-                t for t in self.requests[client_ip] if t > minute_ago
-            ]
-        else:
-            self.requests[client_ip] = []
+        decision: Decision = await self._hit(checks)
+        if decision.allowed and self.user_requests_per_minute:
+            user = await self._user(headers)
+            if user is not None:
+                user_decision = await self._hit([("{user:%s}" % user, self.user_requests_per_minute)])
+                if not user_decision.allowed or user_decision.remaining < decision.remaining:
+                    decision = user_decision
         
         # Check rate limit
-        if len(self.requests[client_ip]) >= self.requests_per_minute:
-            return JSONResponse(
+        if not decision.allowed:
+            response = JSONResponse(
                 status_code=429,
                 content={
                     "detail": "Too many requests",
-                    "retry_after": 60
+                    "retry_after": decision.reset_after,
+                },
+                headers={
+                    "Retry-After": str(decision.reset_after),
+                    "X-RateLimit-Limit": str(decision.limit),
+                    "X-RateLimit-Remaining": "0",
                 },
-                headers={"Retry-After": "60"}
             )
-        
-        # Record request
-        self.requests[client_ip].append(now)
+            await response(scope, receive, send)
+            return
         
         # Add rate limit headers
-        response = await call_next(request)
-        remaining = self.requests_per_minute - len(self.requests[client_ip])
-        response.headers["X-RateLimit-Limit"] = str(self.requests_per_minute)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-RateLimit-Limit"] = str(decision.limit)
+                headers["X-RateLimit-Remaining"] = str(decision.remaining)
+            await send(message)
         
-        return response
+        await self.app(scope, receive, send_wrapper)
@@ -5,13 +5,14 @@ To enable, add to main.py:
     from api.middleware.security import SecurityHeadersMiddleware
     app.add_middleware(SecurityHeadersMiddleware)
 """
-from typing import Callable
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from typing import Any, List, Tuple
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Scope
 
+from api.middleware.pipeline import HeaderMiddleware
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+
+class SecurityHeadersMiddleware(HeaderMiddleware):
     """
     Add security headers to all responses.
     
@@ -34,42 +35,36 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     
     def __init__(
         self,
-        app,
+        app: ASGIApp = None,
         content_security_policy: str = None,
         hsts_max_age: int = 31536000,  # 1 year
     ):
         super().__init__(app)
         self.csp = content_security_policy
         self.hsts_max_age = hsts_max_age
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        response = await call_next(request)
-        
-        # Prevent MIME type sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        
-        # Prevent clickjacking
-        response.headers["X-Frame-Options"] = "DENY"
-        
-        # XSS Protection (legacy, but still useful)
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        
-        # Referrer Policy
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        
-        # HSTS - only add for HTTPS
-        if request.url.scheme == "https":
-            response.headers["Strict-Transport-Security"] = (
-                f"max-age={self.hsts_max_age}; includeSubDomains"
-            )
         
+        # The header set is fixed, so build it once
+        self.headers: List[Tuple[str, str]] = [
+            # Prevent MIME type sniffing
+            ("X-Content-Type-Options", "nosniff"),
+            # Prevent clickjacking
+            ("X-Frame-Options", "DENY"),
+            # XSS Protection (legacy, but still useful)
+            ("X-XSS-Protection", "1; mode=block"),
+            # Referrer Policy
+            ("Referrer-Policy", "strict-origin-when-cross-origin"),
+            # Permissions Policy
+            ("Permissions-Policy", "geolocation=(), microphone=(), camera=()"),
+        ]
         # Content Security Policy (optional)
         if self.csp:
-            response.headers["Content-Security-Policy"] = self.csp
-        
-        # Permissions Policy
-        response.headers["Permissions-Policy"] = (
-            "geolocation=(), microphone=(), camera=()"
-        )
+            self.headers.append(("Content-Security-Policy", self.csp))
+        self.hsts = f"max-age={self.hsts_max_age}; includeSubDomains"
+    
+    def on_response(self, scope: Scope, state: Any, status: int, headers: MutableHeaders) -> None:
+        for name, value in self.headers:
+            headers[name] = value
         
-        return response
+        # HSTS - only add for HTTPS
+        if scope.get("scheme") == "https":
+            headers["Strict-Transport-Security"] = self.hsts
@@ -6,13 +6,14 @@ To enable, add to main.py:
     app.add_middleware(TimingMiddleware)
 """
 import time
-from typing import Callable
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from typing import Any
+from starlette.datastructures import MutableHeaders
+from starlette.types import Scope
 
+from api.middleware.pipeline import HeaderMiddleware
 
-class TimingMiddleware(BaseHTTPMiddleware):
+
+class TimingMiddleware(HeaderMiddleware):
     """
     Add response timing information to headers.
     
@@ -24,15 +25,12 @@ class TimingMiddleware(BaseHTTPMiddleware):
         app.add_middleware(TimingMiddleware)
     """
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        start_time = time.time()
-        
-        response = await call_next(request)
-        
-        process_time = (time.time() - start_time) * 1000
+    def on_request(self, scope: Scope) -> Any:
+        return time.perf_counter()
+    
+    def on_response(self, scope: Scope, state: Any, status: int, headers: MutableHeaders) -> None:
+        process_time = (time.perf_counter() - state) * 1000
         
         # Add timing headers
-        response.headers["X-Response-Time"] = f"{process_time:.2f}ms"
-        response.headers["Server-Timing"] = f"app;dur={process_time:.2f}"
-        
-        return response
+        headers["X-Response-Time"] = f"{process_time:.2f}ms"
+        headers["Server-Timing"] = f"app;dur={process_time:.2f}"
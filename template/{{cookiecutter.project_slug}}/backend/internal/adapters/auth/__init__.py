@@ -0,0 +1,6 @@
+"""Auth adapters package."""
+{%- if cookiecutter.auth_strategy == 'keycloak' %}
+from .jwks import init_jwks, close_jwks, get_jwks_cache, JWKSCache
+
+__all__ = ["init_jwks", "close_jwks", "get_jwks_cache", "JWKSCache"]
+{%- endif %}
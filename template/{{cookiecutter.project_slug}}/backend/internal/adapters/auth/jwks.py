@@ -0,0 +1,161 @@
+{%- if cookiecutter.auth_strategy == 'keycloak' %}
+"""
+Keycloak JWKS Adapter.
+
+Keeps the realm's signing keys in memory, keyed by ``kid``, so verifying
+a token does not cost an HTTP round-trip. Keys are refreshed in the
+background before they expire; an unknown ``kid`` (key rotation) forces
+an immediate, rate-limited refresh.
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+import httpx
+
+from pkg.config.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class JWKSCache:
+    """Process-wide cache of JSON Web Keys."""
+    
+    def __init__(
+        self,
+        jwks_url: str,
+        client: Optional[httpx.AsyncClient] = None,
+        ttl_seconds: float = 300,
+        min_refresh_interval: float = 10,
+    ):
+        self.jwks_url = jwks_url
+        self.ttl_seconds = ttl_seconds
+        self.min_refresh_interval = min_refresh_interval
+        self._client = client
+        self._owns_client = client is None
+        self._keys: Dict[str, dict] = {}
+        self._fetched_at: Optional[float] = None
+        self._last_attempt: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(5.0),
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+            )
+        return self._client
+    
+    @property
+    def is_expired(self) -> bool:
+        if self._fetched_at is None:
+            return True
+        return time.monotonic() - self._fetched_at >= self.ttl_seconds
+    
+    async def get_key(self, kid: Optional[str]) -> Optional[dict]:
+        """
+        Return the JWK for ``kid``.
+        
+        Refreshes when the cache has expired or the kid is unknown, at most
+        once per ``min_refresh_interval``, so neither a flood of tokens with
+        bogus kids nor traffic during an outage can hammer Keycloak.
+        Returns None if the key is still unknown.
+        """
+        if self.is_expired:
+            await self.refresh()
+        elif kid not in self._keys:
+            await self.refresh(force=True)
+        return self._keys.get(kid)
+    
+    async def refresh(self, force: bool = False) -> None:
+        """Fetch the key set; concurrent callers share a single fetch."""
+        started = time.monotonic()
+        async with self._lock:
+            # Someone else refreshed while we were waiting for the lock
+            if self._last_attempt is not None and self._last_attempt >= started:
+                return
+            # Rate-limit refetches (unknown kids, Keycloak outages), also
+            # before the first successful load, so requests arriving while
+            # Keycloak is down do not each trigger a fetch
+            if (
+                self._last_attempt is not None
+                and started - self._last_attempt < self.min_refresh_interval
+            ):
+                return
+            self._last_attempt = time.monotonic()
+            try:
+                response = await self.client.get(self.jwks_url)
+                response.raise_for_status()
+                keys = {
+                    key["kid"]: key
+                    for key in response.json().get("keys", [])
+                    if "kid" in key
+                }
+            except (httpx.HTTPError, ValueError) as e:
+                # Keep serving the keys we have; Keycloak may be briefly down
+                logger.warning("JWKS refresh from %s failed: %s", self.jwks_url, e)
+                return
+            self._keys = keys
+            self._fetched_at = time.monotonic()
+    
+    async def _refresh_loop(self) -> None:
+        # Refresh ahead of expiry so requests never wait on Keycloak
+        interval = max(self.ttl_seconds * 0.8, self.min_refresh_interval)
+        while True:
+            await asyncio.sleep(interval)
+            await self.refresh()
+    
+    async def start(self) -> None:
+        """Load the keys and start the background refresh task."""
+        await self.refresh()
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+    
+    async def close(self) -> None:
+        """Stop the background refresh and close the HTTP client."""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Process-wide cache
+jwks_cache: Optional[JWKSCache] = None
+
+
+async def init_jwks():
+    """Initialize the JWKS cache and start background refresh."""
+    await get_jwks_cache().start()
+
+
+async def close_jwks():
+    """Stop background refresh and release the HTTP client."""
+    global jwks_cache
+    if jwks_cache:
+        await jwks_cache.close()
+        jwks_cache = None
+
+
+def get_jwks_cache() -> JWKSCache:
+    """Get the JWKS cache, creating it lazily when used outside the app lifespan."""
+    global jwks_cache
+    if jwks_cache is None:
+        jwks_cache = JWKSCache(
+            f"{settings.keycloak_url}/realms/{settings.keycloak_realm}/protocol/openid-connect/certs",
+            ttl_seconds=settings.keycloak_jwks_ttl_seconds,
+            min_refresh_interval=settings.keycloak_jwks_min_refresh_seconds,
+        )
+    return jwks_cache
+{%- else %}
+"""JWKS adapter placeholder (Keycloak not enabled)."""
+{%- endif %}
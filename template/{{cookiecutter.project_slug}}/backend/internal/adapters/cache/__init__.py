@@ -1,6 +1,17 @@
 """Cache adapters package."""
 {%- if cookiecutter.use_redis == 'yes' %}
-from .redis_cache import init_redis, close_redis, get_redis, RedisCacheRepository
+from .redis_cache import init_redis, close_redis, get_redis, get_redis_binary, RedisCacheRepository
+from .near_cache import NearCache, init_near_cache, close_near_cache, get_near_cache
 
-__all__ = ["init_redis", "close_redis", "get_redis", "RedisCacheRepository"]
+__all__ = [
+    "init_redis",
+    "close_redis",
+    "get_redis",
+    "get_redis_binary",
+    "RedisCacheRepository",
+    "NearCache",
+    "init_near_cache",
+    "close_near_cache",
+    "get_near_cache",
+]
 {%- endif %}
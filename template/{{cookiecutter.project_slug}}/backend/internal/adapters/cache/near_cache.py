@@ -0,0 +1,349 @@
+{%- if cookiecutter.use_redis == 'yes' %}
+"""
+Near Cache - an in-process tier in front of Redis.
+
+Hot values are served from a bounded LRU without a network round-trip.
+Writes and deletes go to Redis and are announced on a pub/sub channel;
+every process drops its local copy of the key when it hears about it.
+Pub/sub is fire-and-forget, so the local TTL (a few seconds) bounds how
+stale a copy can get if a message is missed, and the local tier is
+cleared whenever the subscription is (re)established. Reads fetch the
+remaining Redis TTL along with the value, so a local copy never
+outlives the key in Redis.
+
+Enabled for @cached when settings.near_cache_enabled is set; the
+subscriber is started from the application lifespan.
+"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from fnmatch import fnmatchcase
+from typing import AsyncIterator, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+from uuid import uuid4
+
+import redis.asyncio as redis
+
+from internal.adapters.cache.redis_cache import RedisCacheRepository, cache_stats, key_batches, get_redis
+from internal.ports.repositories import CacheBatch, CacheRepository
+from pkg.cache import TTLCache
+from pkg.config.settings import settings
+from pkg.metrics import register_stats
+
+
+logger = logging.getLogger(__name__)
+
+
+def _ratio(hits: int, misses: int) -> Optional[float]:
+    total = hits + misses
+    return round(hits / total, 4) if total else None
+
+
+class NearCacheBatch(CacheBatch):
+    """Pipelined writes; NearCache.pipeline() invalidates their keys once sent."""
+
+    def __init__(self, batch: CacheBatch):
+        self.batch = batch
+        self.keys: List[str] = []
+
+    def set(self, key: str, value: str, expire_seconds: Optional[int] = None) -> None:
+        self.batch.set(key, value, expire_seconds)
+        self.keys.append(key)
+
+    def delete(self, key: str) -> None:
+        self.batch.delete(key)
+        self.keys.append(key)
+
+
+class NearCache(CacheRepository):
+    """CacheRepository with a local LRU tier invalidated over Redis pub/sub."""
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        local_ttl_seconds: float = 5,
+        max_size: int = 10_000,
+        channel: str = "cache:invalidate",
+    ):
+        self.client = client
+        self.remote = RedisCacheRepository(client)
+        self.local = TTLCache(max_size=max_size, ttl_seconds=local_ttl_seconds)
+        self.local_ttl_seconds = local_ttl_seconds
+        self.channel = channel
+        # Lets the listener skip our own announcements
+        self.node_id = uuid4().hex
+        # Bumped whenever the local tier changes for a write; see get()
+        self._generation = 0
+        self._listener: Optional[asyncio.Task] = None
+        self.stats = {
+            "local_hits": 0,
+            "local_misses": 0,
+            "remote_hits": 0,
+            "remote_misses": 0,
+            "invalidations_sent": 0,
+            "invalidations_received": 0,
+        }
+
+    async def get(self, key: str) -> Optional[str]:
+        value = self.local.get(key)
+        if value is not None:
+            self.stats["local_hits"] += 1
+            return value
+        self.stats["local_misses"] += 1
+
+        generation = self._generation
+        found = await self._read([key])
+        if key not in found:
+            self.stats["remote_misses"] += 1
+            return None
+        self.stats["remote_hits"] += 1
+        value, remote_ttl = found[key]
+        # An invalidation that arrived while we were reading may be for
+        # this key; don't keep what might be the old value
+        if generation == self._generation:
+            self._keep_local(key, value, remote_ttl)
+        return value
+
+    async def set(
+        self,
+        key: str,
+        value: str,
+        expire_seconds: Optional[int] = None,
+    ) -> bool:
+        await self.remote.set(key, value, expire_seconds)
+        self._set_local(key, value, expire_seconds)
+        await self._announce([key])
+        return True
+
+    async def delete(self, key: str) -> bool:
+        self._drop_local([key])
+        result = await self.remote.delete(key)
+        await self._announce([key])
+        return result
+
+    async def exists(self, key: str) -> bool:
+        return key in self.local or await self.remote.exists(key)
+
+    async def get_many(self, keys: Sequence[str]) -> Dict[str, str]:
+        found: Dict[str, str] = {}
+        missing: List[str] = []
+        for key in dict.fromkeys(keys):
+            value = self.local.get(key)
+            if value is not None:
+                found[key] = value
+            else:
+                missing.append(key)
+        self.stats["local_hits"] += len(found)
+        self.stats["local_misses"] += len(missing)
+        if not missing:
+            return found
+
+        generation = self._generation
+        remote = await self._read(missing)
+        self.stats["remote_hits"] += len(remote)
+        self.stats["remote_misses"] += len(missing) - len(remote)
+        for key, (value, remote_ttl) in remote.items():
+            if generation == self._generation:
+                self._keep_local(key, value, remote_ttl)
+            found[key] = value
+        return found
+
+    async def set_many(
+        self,
+        items: Mapping[str, str],
+        expire_seconds: Union[None, int, Mapping[str, int]] = None,
+    ) -> int:
+        written = await self.remote.set_many(items, expire_seconds)
+        for key, value in items.items():
+            ttl = expire_seconds.get(key) if isinstance(expire_seconds, Mapping) else expire_seconds
+            self._set_local(key, value, ttl)
+        await self._announce(items)
+        return written
+
+    async def delete_many(self, keys: Sequence[str]) -> int:
+        self._drop_local(keys)
+        deleted = await self.remote.delete_many(keys)
+        await self._announce(keys)
+        return deleted
+
+    async def delete_pattern(self, pattern: str) -> int:
+        self._drop_pattern(pattern)
+        deleted = await self.remote.delete_pattern(pattern)
+        await self._publish(f"p:{pattern}")
+        return deleted
+
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = False) -> AsyncIterator["NearCacheBatch"]:
+        async with self.remote.pipeline(transaction) as batch:
+            near = NearCacheBatch(batch)
+            yield near
+        # Sent; the next read fetches the new values
+        self._drop_local(near.keys)
+        await self._announce(near.keys)
+
+    def hit_ratios(self) -> dict:
+        """Hit ratio of each tier and overall (None before the first lookup)."""
+        s = self.stats
+        return {
+            "local": _ratio(s["local_hits"], s["local_misses"]),
+            "remote": _ratio(s["remote_hits"], s["remote_misses"]),
+            "overall": _ratio(s["local_hits"] + s["remote_hits"], s["remote_misses"]),
+        }
+
+    async def _read(self, keys: Sequence[str]) -> Dict[str, Tuple[str, Optional[float]]]:
+        """Value and remaining TTL in seconds (None: no expiry) of each key found."""
+        found: Dict[str, Tuple[str, Optional[float]]] = {}
+        for batch in key_batches(keys, self.remote.BATCH_MAX_KEYS, self.remote.BATCH_MAX_BYTES):
+            # GET and PTTL together, so the TTL belongs to the value read
+            async with self.client.pipeline(transaction=False) as pipe:
+                for key in batch:
+                    pipe.get(key)
+                    pipe.pttl(key)
+                replies = await pipe.execute()
+            for key, value, pttl in zip(batch, replies[::2], replies[1::2]):
+                # PTTL is -1 without an expiry and -2 once the key is gone
+                if value is not None and pttl != -2:
+                    found[key] = (value, pttl / 1000 if pttl >= 0 else None)
+        cache_stats["hits"] += len(found)
+        cache_stats["misses"] += len(keys) - len(found)
+        return found
+
+    def _set_local(self, key: str, value: str, expire_seconds: Optional[int]) -> None:
+        self._generation += 1
+        self._keep_local(key, value, expire_seconds or None)
+
+    def _keep_local(self, key: str, value: str, remote_ttl: Optional[float]) -> None:
+        # Never outlive the Redis copy
+        ttl = min(self.local_ttl_seconds, remote_ttl) if remote_ttl is not None else None
+        if ttl is not None and ttl <= 0:
+            return
+        self.local.set(key, value, ttl_seconds=ttl)
+
+    def _drop_local(self, keys: Iterable[str]) -> None:
+        # Any read in flight may return a value older than this change
+        self._generation += 1
+        for key in keys:
+            self.local.delete(key)
+
+    def _drop_pattern(self, pattern: str) -> None:
+        self._generation += 1
+        for key in self.local.keys():
+            if fnmatchcase(key, pattern):
+                self.local.delete(key)
+
+    async def _announce(self, keys: Iterable[str]) -> None:
+        # Messages are "<node>:k:<key>\n<key>..." or "<node>:p:<pattern>"
+        for batch in key_batches(
+            dict.fromkeys(keys), self.remote.BATCH_MAX_KEYS, self.remote.BATCH_MAX_BYTES,
+        ):
+            await self._publish("k:" + "\n".join(batch))
+
+    async def _publish(self, payload: str) -> None:
+        try:
+            await self.client.publish(self.channel, f"{self.node_id}:{payload}")
+            self.stats["invalidations_sent"] += 1
+        except Exception as e:
+            # Other processes catch up when their local TTL runs out
+            logger.warning("Near cache invalidation publish failed: %s", e)
+
+    def _invalidate_local(self, message: str) -> None:
+        node_id, kind, payload = message.split(":", 2)
+        if node_id == self.node_id:
+            return
+        if kind == "p":
+            self._drop_pattern(payload)
+        else:
+            self._drop_local(payload.split("\n"))
+        self.stats["invalidations_received"] += 1
+
+    async def _listen(self) -> None:
+        backoff = 0.5
+        while True:
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                # Anything published while we were not subscribed is lost
+                self._generation += 1
+                self.local.clear()
+                backoff = 0.5
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        data = message["data"]
+                        self._invalidate_local(data.decode() if isinstance(data, bytes) else data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Near cache subscription lost: %s", e)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+            finally:
+                await pubsub.aclose()
+
+    def start(self) -> None:
+        """Start listening for invalidations from other processes."""
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def close(self) -> None:
+        """Stop listening and drop the local tier."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        self.local.clear()
+
+
+# Process-wide near cache
+near_cache: Optional[NearCache] = None
+
+
+def near_cache_stats() -> Optional[dict]:
+    """Per-tier counters and hit ratios."""
+    if near_cache is None:
+        return None
+    return {**near_cache.stats, "hit_ratios": near_cache.hit_ratios()}
+
+
+register_stats(
+    "near_cache",
+    lambda: near_cache.stats if near_cache is not None else None,
+    counters=(
+        "local_hits",
+        "local_misses",
+        "remote_hits",
+        "remote_misses",
+        "invalidations_sent",
+        "invalidations_received",
+    ),
+)
+
+
+def get_near_cache() -> NearCache:
+    """Get the near cache, creating it on first use (Redis must be initialized)."""
+    global near_cache
+    if near_cache is None:
+        near_cache = NearCache(
+            get_redis(),
+            local_ttl_seconds=settings.near_cache_ttl_seconds,
+            max_size=settings.near_cache_max_size,
+            channel=settings.near_cache_channel,
+        )
+    return near_cache
+
+
+async def init_near_cache():
+    """Create the near cache and subscribe to invalidations."""
+    get_near_cache().start()
+
+
+async def close_near_cache():
+    """Unsubscribe and drop the local tier."""
+    global near_cache
+    if near_cache:
+        await near_cache.close()
+        near_cache = None
+{%- else %}
+"""Near cache placeholder (Redis not enabled)."""
+{%- endif %}
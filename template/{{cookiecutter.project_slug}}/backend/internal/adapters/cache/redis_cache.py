@@ -1,33 +1,191 @@
 {%- if cookiecutter.use_redis == 'yes' %}
 """
 Redis Cache Adapter.
+
+init_redis() builds the client for settings.redis_mode:
+- "standalone": one server, through a blocking pool that waits up to
+  redis_pool_timeout_seconds for a free connection instead of failing
+- "sentinel": the current master of redis_sentinel_master, found via
+  redis_sentinels and followed across failovers
+- "cluster": a Redis Cluster, discovered from redis_cluster_nodes
+
+get_redis() returns strings (decode_responses=True); get_redis_binary()
+returns raw bytes for binary payloads. It has its own pool, opened on
+first use.
 """
-from typing import Optional
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
 import redis.asyncio as redis
+from redis.asyncio.cluster import ClusterNode, RedisCluster
+from redis.asyncio.sentinel import Sentinel
 
 from pkg.config.settings import settings
-from internal.ports.repositories import CacheRepository
+from pkg.metrics import register_stats
+from internal.ports.repositories import CacheBatch, CacheRepository
 
 
-# Redis client
+# Redis clients
 redis_client: Optional[redis.Redis] = None
+redis_binary_client: Optional[redis.Redis] = None
+
+# Cache lookups served by RedisCacheRepository (this process)
+cache_stats = {"hits": 0, "misses": 0}
+
+
+class InstrumentedConnectionPool(redis.BlockingConnectionPool):
+    """Blocking pool that records how long callers wait for a connection."""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+    
+    async def get_connection(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await super().get_connection(*args, **kwargs)
+        except redis.ConnectionError as e:
+            if isinstance(e.__cause__, asyncio.TimeoutError):
+                self.timeouts += 1
+            raise
+        finally:
+            self.checkouts += 1
+            self.wait_seconds_total += time.perf_counter() - started
+
+
+def _pool_usage(client) -> Tuple[int, int, int]:
+    """(in use, idle, max) connections across a client's pools."""
+    if isinstance(client, RedisCluster):
+        nodes = client.get_nodes()
+        in_use = sum(len(node._connections) - len(node._free) for node in nodes)
+        idle = sum(len(node._free) for node in nodes)
+        return in_use, idle, sum(node.max_connections for node in nodes)
+    pool = client.connection_pool
+    return (
+        len(getattr(pool, "_in_use_connections", ())),
+        len(getattr(pool, "_available_connections", ())),
+        pool.max_connections,
+    )
+
+
+def redis_stats() -> Optional[dict]:
+    """Connection pool usage and cache hit counters."""
+    if redis_client is None:
+        return None
+    stats = {
+        "connections_in_use": 0,
+        "connections_idle": 0,
+        "connections_max": 0,
+        "pool_checkouts": 0,
+        "pool_timeouts": 0,
+        "pool_wait_seconds": 0.0,
+        "cache_hits": cache_stats["hits"],
+        "cache_misses": cache_stats["misses"],
+    }
+    for client in (redis_client, redis_binary_client):
+        if client is None:
+            continue
+        in_use, idle, maximum = _pool_usage(client)
+        stats["connections_in_use"] += in_use
+        stats["connections_idle"] += idle
+        stats["connections_max"] += maximum
+        pool = getattr(client, "connection_pool", None)
+        if isinstance(pool, InstrumentedConnectionPool):
+            stats["pool_checkouts"] += pool.checkouts
+            stats["pool_timeouts"] += pool.timeouts
+            stats["pool_wait_seconds"] += round(pool.wait_seconds_total, 6)
+    stats["pool_utilization"] = (
+        round(stats["connections_in_use"] / stats["connections_max"], 4)
+        if stats["connections_max"] else 0.0
+    )
+    return stats
+
+
+register_stats(
+    "redis",
+    redis_stats,
+    gauges=("connections_in_use", "connections_idle", "connections_max"),
+    counters=("pool_checkouts", "pool_timeouts", "pool_wait_seconds", "cache_hits", "cache_misses"),
+)
+
+
+def _hosts(addresses: Iterable[str]) -> List[Tuple[str, int]]:
+    """Parse "host:port" strings."""
+    hosts = []
+    for address in addresses:
+        host, _, port = address.strip().rpartition(":")
+        hosts.append((host, int(port)))
+    return hosts
+
+
+def connection_options(decode_responses: bool = True) -> Dict[str, Any]:
+    """Connection keyword arguments shared by every topology."""
+    return {
+        "password": settings.redis_password or None,
+        "socket_timeout": settings.redis_socket_timeout_seconds,
+        "socket_connect_timeout": settings.redis_connect_timeout_seconds,
+        # PING connections idle this long before reuse, so a connection
+        # silently dropped by a proxy or firewall fails here, not mid-command
+        "health_check_interval": settings.redis_health_check_interval_seconds,
+        "decode_responses": decode_responses,
+    }
+
+
+def create_redis_client(decode_responses: bool = True):
+    """Build a client for settings.redis_mode."""
+    options = connection_options(decode_responses)
+    mode = settings.redis_mode
+    if mode == "standalone":
+        pool = InstrumentedConnectionPool.from_url(
+            settings.redis_url,
+            max_connections=settings.redis_max_connections,
+            timeout=settings.redis_pool_timeout_seconds,
+            **options,
+        )
+        return redis.Redis.from_pool(pool)
+    if mode == "sentinel":
+        sentinel = Sentinel(
+            _hosts(settings.redis_sentinels),
+            sentinel_kwargs={
+                "password": settings.redis_sentinel_password or None,
+                "socket_timeout": settings.redis_socket_timeout_seconds,
+                "socket_connect_timeout": settings.redis_connect_timeout_seconds,
+            },
+        )
+        return sentinel.master_for(
+            settings.redis_sentinel_master,
+            db=settings.redis_db,
+            max_connections=settings.redis_max_connections,
+            **options,
+        )
+    if mode == "cluster":
+        nodes = _hosts(settings.redis_cluster_nodes) or [(settings.redis_host, settings.redis_port)]
+        return RedisCluster(
+            startup_nodes=[ClusterNode(host, port) for host, port in nodes],
+            # Per node
+            max_connections=settings.redis_max_connections,
+            **options,
+        )
+    raise ValueError(f"Unknown redis_mode: {mode!r} (expected standalone, sentinel or cluster)")
 
 
 async def init_redis():
     """Initialize Redis connection."""
     global redis_client
-    redis_client = redis.from_url(
-        settings.redis_url,
-        encoding="utf-8",
-        decode_responses=True,
-    )
+    redis_client = create_redis_client()
 
 
 async def close_redis():
-    """Close Redis connection."""
-    global redis_client
-    if redis_client:
-        await redis_client.close()
+    """Close Redis connections."""
+    global redis_client, redis_binary_client
+    for client in (redis_client, redis_binary_client):
+        if client is not None:
+            await client.aclose()
+    redis_client = None
+    redis_binary_client = None
 
 
 def get_redis() -> redis.Redis:
@@ -37,14 +195,67 @@ def get_redis() -> redis.Redis:
     return redis_client
 
 
+def get_redis_binary() -> redis.Redis:
+    """Get a Redis client that returns bytes (for msgpack, pickles, images...)."""
+    global redis_binary_client
+    if redis_client is None:
+        raise RuntimeError("Redis not initialized")
+    if redis_binary_client is None:
+        redis_binary_client = create_redis_client(decode_responses=False)
+    return redis_binary_client
+
+
+def key_batches(
+    keys: Iterable[str],
+    max_keys: int,
+    max_bytes: int,
+    sizes: Optional[Mapping[str, str]] = None,
+) -> Iterator[List[str]]:
+    """Split keys into batches bounded by count and by key + value bytes."""
+    batch: List[str] = []
+    size = 0
+    for key in keys:
+        key_size = len(key) + (len(sizes[key]) if sizes is not None else 0)
+        if batch and (len(batch) >= max_keys or size + key_size > max_bytes):
+            yield batch
+            batch, size = [], 0
+        batch.append(key)
+        size += key_size
+    if batch:
+        yield batch
+
+
+class RedisCacheBatch(CacheBatch):
+    """Writes queued on a redis pipeline."""
+    
+    def __init__(self, pipe):
+        self.pipe = pipe
+    
+    def set(self, key: str, value: str, expire_seconds: Optional[int] = None) -> None:
+        self.pipe.set(key, value, ex=expire_seconds or None)
+    
+    def delete(self, key: str) -> None:
+        self.pipe.delete(key)
+
+
 class RedisCacheRepository(CacheRepository):
     """Redis implementation of CacheRepository."""
     
+    # Batch operations send at most BATCH_MAX_KEYS keys, or BATCH_MAX_BYTES
+    # of keys and values, per round-trip - large enough to amortize the
+    # network, small enough not to stall Redis or balloon client buffers.
+    BATCH_MAX_KEYS = 1000
+    BATCH_MAX_BYTES = 1 << 20
+    # Keys examined per SCAN call in delete_pattern()
+    SCAN_COUNT = 1000
+    
     def __init__(self, client: redis.Redis = None):
         self.client = client or get_redis()
     
     async def get(self, key: str) -> Optional[str]:
-        return await self.client.get(key)
+        value = await self.client.get(key)
+        cache_stats["hits" if value is not None else "misses"] += 1
+        return value
     
     async def set(
         self,
@@ -52,10 +263,7 @@ class RedisCacheRepository(CacheRepository):
         value: str,
         expire_seconds: Optional[int] = None,
     ) -> bool:
-        if expire_seconds:
-            await self.client.setex(key, expire_seconds, value)
-        else:
-            await self.client.set(key, value)
+        await self.client.set(key, value, ex=expire_seconds or None)
         return True
     
     async def delete(self, key: str) -> bool:
@@ -65,6 +273,70 @@ class RedisCacheRepository(CacheRepository):
     async def exists(self, key: str) -> bool:
         result = await self.client.exists(key)
         return result > 0
+    
+    async def get_many(self, keys: Sequence[str]) -> Dict[str, str]:
+        found: Dict[str, str] = {}
+        for batch in key_batches(dict.fromkeys(keys), self.BATCH_MAX_KEYS, self.BATCH_MAX_BYTES):
+            for key, value in zip(batch, await self._mget(batch)):
+                if value is not None:
+                    found[key] = value
+        cache_stats["hits"] += len(found)
+        cache_stats["misses"] += len(set(keys)) - len(found)
+        return found
+    
+    async def set_many(
+        self,
+        items: Mapping[str, str],
+        expire_seconds: Union[None, int, Mapping[str, int]] = None,
+    ) -> int:
+        for batch in key_batches(items, self.BATCH_MAX_KEYS, self.BATCH_MAX_BYTES, sizes=items):
+            if not expire_seconds:
+                await self._mset({key: items[key] for key in batch})
+                continue
+            async with self.client.pipeline(transaction=False) as pipe:
+                for key in batch:
+                    ttl = expire_seconds.get(key) if isinstance(expire_seconds, Mapping) else expire_seconds
+                    pipe.set(key, items[key], ex=ttl or None)
+                await pipe.execute()
+        return len(items)
+    
+    async def delete_many(self, keys: Sequence[str]) -> int:
+        deleted = 0
+        for batch in key_batches(dict.fromkeys(keys), self.BATCH_MAX_KEYS, self.BATCH_MAX_BYTES):
+            # UNLINK frees the memory in the background instead of blocking Redis
+            deleted += await self.client.unlink(*batch)
+        return deleted
+    
+    async def delete_pattern(self, pattern: str) -> int:
+        # SCAN walks the keyspace in steps; KEYS would block Redis for the whole walk
+        deleted = 0
+        batch: List[str] = []
+        async for key in self.client.scan_iter(match=pattern, count=self.SCAN_COUNT):
+            batch.append(key)
+            if len(batch) >= self.BATCH_MAX_KEYS:
+                deleted += await self.client.unlink(*batch)
+                batch = []
+        if batch:
+            deleted += await self.client.unlink(*batch)
+        return deleted
+    
+    async def _mget(self, keys: List[str]) -> List[Optional[str]]:
+        # In a cluster the keys may live on different nodes
+        if isinstance(self.client, RedisCluster):
+            return await self.client.mget_nonatomic(keys)
+        return await self.client.mget(keys)
+    
+    async def _mset(self, mapping: Dict[str, str]) -> None:
+        if isinstance(self.client, RedisCluster):
+            await self.client.mset_nonatomic(mapping)
+        else:
+            await self.client.mset(mapping)
+    
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = False) -> AsyncIterator[RedisCacheBatch]:
+        async with self.client.pipeline(transaction=transaction) as pipe:
+            yield RedisCacheBatch(pipe)
+            await pipe.execute()
 {%- else %}
 """Cache adapter placeholder (Redis not enabled)."""
 {%- endif %}
@@ -1,18 +1,25 @@
 """DB adapters package."""
 from .connection import init_db, get_session
 from .models import *
+from .unit_of_work import UnitOfWork, get_unit_of_work
 {%- if cookiecutter.database == 'postgresql' %}
 from .user_repo import SQLAlchemyUserRepository
+from .audit_repo import SQLAlchemyAuditLogRepository
 {%- else %}
 from .user_repo import BeanieUserRepository
+from .audit_repo import BeanieAuditLogRepository
 {%- endif %}
 
 __all__ = [
     "init_db",
     "get_session",
+    "UnitOfWork",
+    "get_unit_of_work",
     {%- if cookiecutter.database == 'postgresql' %}
     "SQLAlchemyUserRepository",
+    "SQLAlchemyAuditLogRepository",
     {%- else %}
     "BeanieUserRepository",
+    "BeanieAuditLogRepository",
     {%- endif %}
 ]
@@ -0,0 +1,104 @@
+{%- if cookiecutter.database == 'postgresql' %}
+"""
+Audit Log Repository Implementation using SQLAlchemy.
+This is an ADAPTER - it implements the PORT (interface).
+"""
+from datetime import datetime
+from typing import List, Sequence
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from internal.ports.repositories import AuditLogRepository
+from .models import AuditLogModel
+
+
+COLUMNS = [
+    "timestamp", "method", "path", "query", "user_id",
+    "client_ip", "user_agent", "status_code", "duration_ms",
+]
+
+# Column -> max length, for clipping entries that did not come from AuditMiddleware
+WIDTHS = {
+    column.name: column.type.length
+    for column in AuditLogModel.__table__.columns
+    if getattr(column.type, "length", None)
+}
+
+
+def _parse_timestamp(value) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    # AuditMiddleware writes naive UTC ISO strings with a "Z" suffix
+    return datetime.fromisoformat(value.rstrip("Z"))
+
+
+class SQLAlchemyAuditLogRepository(AuditLogRepository):
+    """SQLAlchemy implementation of AuditLogRepository."""
+    
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    def _rows(self, entries: Sequence[dict]) -> List[dict]:
+        rows = []
+        for entry in entries:
+            row = {column: entry.get(column) for column in COLUMNS}
+            row["timestamp"] = _parse_timestamp(row["timestamp"])
+            for column, width in WIDTHS.items():
+                if isinstance(row[column], str):
+                    row[column] = row[column][:width]
+            rows.append(row)
+        return rows
+    
+    async def insert_many(self, entries: Sequence[dict]) -> int:
+        if not entries:
+            return 0
+        rows = self._rows(entries)
+        conn = await self.session.connection()
+        
+        if conn.dialect.driver == "asyncpg":
+            # COPY is the fastest bulk path PostgreSQL has; it runs inside
+            # the session's transaction like any other statement
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                AuditLogModel.__tablename__,
+                records=[tuple(row[column] for column in COLUMNS) for row in rows],
+                columns=COLUMNS,
+            )
+        else:
+            await conn.execute(insert(AuditLogModel.__table__), rows)
+        return len(rows)
+{%- else %}
+"""
+Audit Log Repository Implementation using Beanie (MongoDB).
+This is an ADAPTER - it implements the PORT (interface).
+"""
+from datetime import datetime
+from typing import Sequence
+
+from internal.ports.repositories import AuditLogRepository
+from .models import AuditLogDocument
+
+
+def _parse_timestamp(value) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    # AuditMiddleware writes naive UTC ISO strings with a "Z" suffix
+    return datetime.fromisoformat(value.rstrip("Z"))
+
+
+class BeanieAuditLogRepository(AuditLogRepository):
+    """Beanie implementation of AuditLogRepository."""
+    
+    async def insert_many(self, entries: Sequence[dict]) -> int:
+        if not entries:
+            return 0
+        docs = []
+        for entry in entries:
+            doc = dict(entry)
+            doc["timestamp"] = _parse_timestamp(doc["timestamp"])
+            docs.append(doc)
+        # Unordered: one bad document doesn't stop the rest of the batch
+        result = await AuditLogDocument.get_motor_collection().insert_many(docs, ordered=False)
+        return len(result.inserted_ids)
+{%- endif %}
@@ -2,26 +2,48 @@
 """
 Database connection setup using SQLAlchemy async.
 """
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Dict
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 
 from pkg.config.settings import settings
+from pkg.metrics import register_stats
+from .pool import POOL_COUNTERS, POOL_GAUGES, engine_options, engine_pool_stats
+from .query_stats import instrument_engine
+from .routing import ReplicaPool, RoutingSession
 
 
-# Create async engine
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+# Create async engine (pool sizing and PgBouncer mode come from settings)
+engine = create_async_engine(settings.database_url, **engine_options())
+
+# Read replicas (optional) - SELECTs are routed here by RoutingSession
+replicas = ReplicaPool(
+    [create_async_engine(url, **engine_options()) for url in settings.db_replica_urls],
+    policy=settings.db_replica_policy,
+    eject_seconds=settings.db_replica_eject_seconds,
+)
+
+# Slow-query log and per-request query counts (QueryStatsMiddleware)
+instrument_engine(engine)
+for replica in replicas.engines:
+    instrument_engine(replica)
+
+register_stats(
+    "db_pool", lambda: engine_pool_stats(engine),
+    gauges=POOL_GAUGES, counters=POOL_COUNTERS, labels={"pool": "primary"},
 )
+for index, replica in enumerate(replicas.engines):
+    register_stats(
+        "db_pool", lambda replica=replica: engine_pool_stats(replica),
+        gauges=POOL_GAUGES, counters=POOL_COUNTERS, labels={"pool": f"replica{index}"},
+    )
 
 # Session factory
 async_session_maker = async_sessionmaker(
     engine,
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    replicas=replicas if replicas.engines else None,
     expire_on_commit=False,
 )
 
@@ -33,6 +55,28 @@ async def init_db():
     """Initialize database - create tables."""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    replicas.start(settings.db_replica_health_interval_seconds)
+
+
+async def close_db():
+    """Stop replica health checks and close all pooled connections."""
+    await replicas.close()
+    await engine.dispose()
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Connection pool statistics for the primary and each replica."""
+    return {
+        "primary": engine_pool_stats(engine),
+        "replicas": [
+            {
+                "url": replica.url.render_as_string(),
+                "healthy": replicas.is_healthy(replica.sync_engine),
+                **engine_pool_stats(replica),
+            }
+            for replica in replicas.engines
+        ],
+    }
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
@@ -66,11 +110,11 @@ async def init_db():
     client = AsyncIOMotorClient(settings.mongodb_url)
     
     # Import document models
-    from .models import UserDocument
+    from .models import UserDocument, AuditLogDocument
     
     await init_beanie(
         database=client[settings.mongodb_db],
-        document_models=[UserDocument],
+        document_models=[UserDocument, AuditLogDocument],
     )
 
 
@@ -5,7 +5,9 @@ These are database-specific - NOT domain entities.
 """
 from datetime import datetime
 from uuid import uuid4
-from sqlalchemy import Column, String, Boolean, DateTime, Enum as SQLEnum
+from sqlalchemy import (
+    Column, String, Boolean, DateTime, Index, Integer, BigInteger, Float, Enum as SQLEnum,
+)
 from sqlalchemy.dialects.postgresql import UUID
 
 from .connection import Base
@@ -35,8 +37,36 @@ class UserModel(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, nullable=True, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # Keyset pagination order (see SQLAlchemyUserRepository.list_page)
+        Index("ix_users_created_at_id", "created_at", "id"),
+        # Prefix LIKE scans whatever the database collation
+        # (see SQLAlchemyUserRepository.list_numbered_usernames)
+        Index(
+            "ix_users_username_pattern", "username",
+            postgresql_ops={"username": "varchar_pattern_ops"},
+        ),
+    )
+    
     def __repr__(self):
         return f"<User {self.email}>"
+
+
+class AuditLogModel(Base):
+    """Audit log database model (written in batches by AuditSink)."""
+    
+    __tablename__ = "audit_logs"
+    
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    timestamp = Column(DateTime, nullable=False, index=True)
+    method = Column(String(10), nullable=False)
+    path = Column(String(500), nullable=False)
+    query = Column(String(1000), nullable=True)
+    user_id = Column(String(100), nullable=True, index=True)
+    client_ip = Column(String(50), nullable=True)
+    user_agent = Column(String(200), nullable=True)
+    status_code = Column(Integer, nullable=False)
+    duration_ms = Column(Float, nullable=False)
 {%- else %}
 """
 Beanie Document Models for MongoDB.
@@ -46,6 +76,7 @@ from typing import Optional
 from uuid import uuid4, UUID
 from beanie import Document
 from pydantic import Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 from internal.entities.user import UserRole, UserStatus
 
@@ -73,7 +104,35 @@ class UserDocument(Document):
     
     class Settings:
         name = "users"
+        indexes = [
+            # Keyset pagination order (see BeanieUserRepository.list_page)
+            IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+            # Uniqueness is enforced here, not checked before inserting
+            IndexModel([("email", ASCENDING)], unique=True),
+            IndexModel([("username", ASCENDING)], unique=True),
+        ]
         
     class Config:
         use_enum_values = True
+
+
+class AuditLogDocument(Document):
+    """Audit log MongoDB document (written in batches by AuditSink)."""
+    
+    timestamp: datetime
+    method: str
+    path: str
+    query: Optional[str] = None
+    user_id: Optional[str] = None
+    client_ip: Optional[str] = None
+    user_agent: Optional[str] = None
+    status_code: int
+    duration_ms: float
+    
+    class Settings:
+        name = "audit_logs"
+        indexes = [
+            IndexModel([("timestamp", DESCENDING)]),
+            "user_id",
+        ]
 {%- endif %}
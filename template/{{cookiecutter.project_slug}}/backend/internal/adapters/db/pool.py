@@ -0,0 +1,105 @@
+{%- if cookiecutter.database == 'postgresql' %}
+"""
+Connection pool configuration and instrumentation.
+
+engine_options() turns the db_pool_* / db_pgbouncer settings into
+create_async_engine() arguments; InstrumentedPool records how long
+requests wait to get a connection, which engine_pool_stats() reports
+next to the pool's own counters.
+"""
+import time
+from typing import Any, Dict
+from uuid import uuid4
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from pkg.config.settings import settings
+
+
+# stats() keys exported as Prometheus metrics
+POOL_GAUGES = ("size", "checked_in", "checked_out", "overflow")
+POOL_COUNTERS = ("checkouts", "timeouts", "wait_seconds_total")
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records checkout latency.
+
+    Checkout time covers waiting for a free connection, opening a new
+    one when the pool may grow, and the pre-ping round-trip if enabled.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            if waited > self.wait_seconds_max:
+                self.wait_seconds_max = waited
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool counters plus checkout wait statistics."""
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_seconds_avg": round(self.wait_seconds_total / self.checkouts, 6) if self.checkouts else 0.0,
+            "wait_seconds_max": round(self.wait_seconds_max, 6),
+        }
+
+
+def engine_options() -> Dict[str, Any]:
+    """create_async_engine() keyword arguments from settings."""
+    connect_args: Dict[str, Any] = {
+        "statement_cache_size": settings.db_statement_cache_size,
+    }
+    if settings.db_pgbouncer:
+        # PgBouncer in transaction mode hands each transaction a different
+        # server connection, so prepared statements must not outlive one:
+        # disable both asyncpg's and SQLAlchemy's statement caches and give
+        # every prepared statement a unique name.
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+
+    return {
+        "echo": settings.debug,
+        "poolclass": InstrumentedPool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "connect_args": connect_args,
+    }
+
+
+def engine_pool_stats(engine: AsyncEngine) -> Dict[str, Any]:
+    """Statistics for an engine's pool (counters only for non-instrumented pools)."""
+    pool = engine.sync_engine.pool
+    if isinstance(pool, InstrumentedPool):
+        return pool.stats()
+    return {"status": pool.status()}
+{%- else %}
+"""Connection pool configuration lives in the MongoDB URL (maxPoolSize, ...)."""
+{%- endif %}
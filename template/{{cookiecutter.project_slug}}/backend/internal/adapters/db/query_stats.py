@@ -0,0 +1,126 @@
+{%- if cookiecutter.database == 'postgresql' %}
+"""
+Per-request query statistics, slow-query log and N+1 detection.
+
+instrument_engine() hooks an engine's cursor events. Every statement
+slower than settings.db_slow_query_ms is logged with its parameters
+redacted. Inside track_queries() (QueryStatsMiddleware opens one per
+request) statements are also counted and timed, and a statement run
+settings.db_n_plus_one_threshold times or more is reported as a likely
+N+1 - typically a repository call inside a loop.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from prometheus_client import Counter
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from pkg.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+DB_SLOW_QUERIES = Counter(
+    "db_slow_queries_total",
+    "Statements slower than db_slow_query_ms",
+)
+
+
+class QueryStats:
+    """Statements executed in one request (or other tracked unit of work)."""
+
+    __slots__ = ("count", "duration", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        # statement text -> executions
+        self.statements: Dict[str, int] = {}
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.duration += elapsed
+        self.statements[statement] = self.statements.get(statement, 0) + 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements executed at least `threshold` times, most frequent first."""
+        found = [(statement, n) for statement, n in self.statements.items() if n >= threshold]
+        return sorted(found, key=lambda item: item[1], reverse=True)
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Statistics being collected for the current request, if any."""
+    return _current.get()
+
+
+@contextmanager
+def track_queries(label: str = "", warn_n_plus_one: bool = True) -> Iterator[QueryStats]:
+    """
+    Count statements executed inside the block and warn about N+1 patterns.
+
+    `label` (e.g. "GET /api/v1/users") identifies the block in the warning.
+    """
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+        if warn_n_plus_one:
+            for statement, n in stats.repeated(settings.db_n_plus_one_threshold):
+                logger.warning(
+                    "Possible N+1 in %s: statement ran %d times: %s",
+                    label or "tracked block", n, _one_line(statement),
+                )
+
+
+def redact(parameters: Any) -> Any:
+    """Replace bound values with their type names, keeping the shape."""
+    if isinstance(parameters, dict):
+        return {key: f"<{type(value).__name__}>" for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: describe the first row only
+            return [redact(parameters[0]), f"... {len(parameters)} rows"]
+        return [f"<{type(value).__name__}>" for value in parameters]
+    return parameters
+
+
+def _one_line(statement: str) -> str:
+    return " ".join(statement.split())
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_started
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+    slow_ms = settings.db_slow_query_ms
+    if slow_ms and elapsed * 1000 >= slow_ms:
+        DB_SLOW_QUERIES.inc()
+        logger.warning(
+            "Slow query (%.1fms): %s params=%s",
+            elapsed * 1000, _one_line(statement), redact(parameters),
+        )
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Record statement timings for an engine (idempotent)."""
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+{%- else %}
+"""Query statistics are only collected for the SQLAlchemy (PostgreSQL) adapter."""
+{%- endif %}
@@ -0,0 +1,211 @@
+{%- if cookiecutter.database == 'postgresql' %}
+"""
+Read-replica routing for SQLAlchemy sessions.
+
+RoutingSession sends plain SELECTs to a replica and everything else to
+the primary. Once a session has written, it stays on the primary so the
+rest of the request reads its own writes. ReplicaPool picks the replica
+(round-robin or least-connections) and ejects replicas that stop
+accepting connections until a health check brings them back; the read
+that hit the failing replica is retried on the next healthy one (or the
+primary) instead of failing the request.
+"""
+import asyncio
+import itertools
+import logging
+import time
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select, TextClause
+
+logger = logging.getLogger(__name__)
+
+POLICIES = ("round_robin", "least_connections")
+
+
+class ReplicaPool:
+    """
+    A set of read replicas with load balancing and health ejection.
+
+    A replica is ejected for eject_seconds when connecting to it fails or
+    its connection drops; it is retried afterwards (or re-admitted sooner
+    by check_health()). With every replica ejected, reads use the primary.
+    """
+
+    def __init__(
+        self,
+        engines: List[AsyncEngine],
+        policy: str = "round_robin",
+        eject_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown replica policy {policy!r}, expected one of {POLICIES}")
+
+        self.engines = engines
+        self.policy = policy
+        self.eject_seconds = eject_seconds
+        self._clock = clock
+        self._cycle = itertools.cycle(range(len(engines)))
+        # sync engine -> monotonic time the ejection ends
+        self._ejected_until: Dict[Engine, float] = {}
+        self._health_task: Optional[asyncio.Task] = None
+
+        for engine in engines:
+            event.listen(engine.sync_engine, "handle_error", self._on_error)
+
+    def _on_error(self, context) -> None:
+        # Query errors on a live replica are the caller's problem; only
+        # connection failures say something about the replica itself.
+        if context.connection is None or context.is_disconnect:
+            self.eject(context.engine)
+
+    def eject(self, engine: Engine) -> None:
+        """Stop routing reads to a replica for eject_seconds."""
+        if not self.is_healthy(engine):
+            return
+        self._ejected_until[engine] = self._clock() + self.eject_seconds
+        logger.warning("Read replica %s ejected for %ss", engine.url.render_as_string(), self.eject_seconds)
+
+    def readmit(self, engine: Engine) -> None:
+        """Route reads to a replica again."""
+        if self._ejected_until.pop(engine, None) is not None:
+            logger.info("Read replica %s re-admitted", engine.url.render_as_string())
+
+    def is_healthy(self, engine: Engine) -> bool:
+        until = self._ejected_until.get(engine)
+        if until is None:
+            return True
+        if self._clock() >= until:
+            # Ejection expired - let traffic probe it again
+            del self._ejected_until[engine]
+            return True
+        return False
+
+    def choose(self) -> Optional[Engine]:
+        """Pick a healthy replica, or None if there is none."""
+        if not self.engines:
+            return None
+
+        if self.policy == "least_connections":
+            healthy = [e.sync_engine for e in self.engines if self.is_healthy(e.sync_engine)]
+            if not healthy:
+                return None
+            return min(healthy, key=lambda e: getattr(e.pool, "checkedout", lambda: 0)())
+
+        for _ in range(len(self.engines)):
+            engine = self.engines[next(self._cycle)].sync_engine
+            if self.is_healthy(engine):
+                return engine
+        return None
+
+    async def check_health(self, timeout: float = 2.0) -> None:
+        """Ping every replica, ejecting dead ones and re-admitting live ones."""
+
+        async def ping(engine: AsyncEngine) -> None:
+            try:
+                async with asyncio.timeout(timeout):
+                    async with engine.connect() as conn:
+                        await conn.execute(text("SELECT 1"))
+            except Exception:
+                self.eject(engine.sync_engine)
+            else:
+                self.readmit(engine.sync_engine)
+
+        await asyncio.gather(*(ping(engine) for engine in self.engines))
+
+    def start(self, interval_seconds: float) -> None:
+        """Run check_health() every interval_seconds in the background."""
+        if self.engines and self._health_task is None:
+            self._health_task = asyncio.create_task(self._health_loop(interval_seconds))
+
+    async def _health_loop(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.check_health()
+            except Exception:
+                logger.exception("Read replica health check failed")
+
+    async def close(self) -> None:
+        """Stop the health checks and close every replica connection."""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+        for engine in self.engines:
+            await engine.dispose()
+
+
+def is_read(clause) -> bool:
+    """True for statements a replica can serve: SELECT without FOR UPDATE."""
+    if isinstance(clause, Select):
+        return clause._for_update_arg is None
+    if isinstance(clause, TextClause):
+        return clause.text.lstrip()[:6].lower() == "select"
+    return False
+
+
+class RoutingSession(Session):
+    """
+    Session that reads from replicas and writes to the primary.
+
+    The session is bound to the primary as usual. SELECTs go to one
+    replica chosen on first use and kept for the session (one replica
+    connection per request). After the first write - including ORM
+    flushes - every statement goes to the primary.
+    """
+
+    def __init__(self, *args, replicas: Optional[ReplicaPool] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self.wrote = False
+        self._replica: Optional[Engine] = None
+
+    def get_bind(self, mapper=None, *, clause=None, **kw):
+        if self.replicas is None or self.wrote:
+            return super().get_bind(mapper, clause=clause, **kw)
+
+        if self._flushing or not is_read(clause):
+            # Read-your-writes: stick to the primary from here on
+            self.wrote = True
+            return super().get_bind(mapper, clause=clause, **kw)
+
+        if self._replica is None or not self.replicas.is_healthy(self._replica):
+            self._replica = self.replicas.choose()
+        return self._replica or super().get_bind(mapper, clause=clause, **kw)
+
+    # Public entry points; AsyncSession.execute/scalar/scalars/get and
+    # Session.get all go through one of them
+    def execute(self, *args, **kwargs):
+        return self._read_with_retry(super().execute, *args, **kwargs)
+
+    def scalar(self, *args, **kwargs):
+        return self._read_with_retry(super().scalar, *args, **kwargs)
+
+    def scalars(self, *args, **kwargs):
+        return self._read_with_retry(super().scalars, *args, **kwargs)
+
+    def _read_with_retry(self, call, *args, **kwargs):
+        while True:
+            try:
+                return call(*args, **kwargs)
+            except DBAPIError:
+                replica = self._replica
+                # Only connection failures eject a replica; anything else
+                # (and any failure on the primary) is the caller's problem
+                if replica is None or self.replicas.is_healthy(replica):
+                    raise
+                logger.warning("Read on replica %s failed, retrying elsewhere", replica.url.render_as_string())
+                self._replica = None
+{%- else %}
+"""Read-replica routing is configured through the MongoDB URL (readPreference)."""
+{%- endif %}
@@ -0,0 +1,127 @@
+"""
+Request-scoped Unit of Work.
+
+One UnitOfWork per request: every repository used while handling the
+request shares a single session (and at most one pooled connection),
+the work is committed once at the end, and the connection goes back to
+the pool as soon as the request finishes - not when the GC gets to it.
+"""
+import logging
+from typing import AsyncGenerator, Awaitable, Callable, List, Optional
+{%- if cookiecutter.database == 'postgresql' %}
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from .audit_repo import SQLAlchemyAuditLogRepository
+from .connection import async_session_maker
+from .user_repo import SQLAlchemyUserRepository
+{%- else %}
+
+from .audit_repo import BeanieAuditLogRepository
+from .user_repo import BeanieUserRepository
+{%- endif %}
+
+
+logger = logging.getLogger(__name__)
+
+
+class UnitOfWork:
+    """
+    Transaction boundary shared by the repositories of one request.
+    
+    Usage:
+        async with UnitOfWork() as uow:
+            user = await uow.users.get_by_id(user_id)
+            ...
+        # committed on success, rolled back on error, connection released
+    
+    Work that must only happen once the changes are visible to other
+    requests (e.g. cache invalidation) is registered with after_commit().
+    """
+    
+    {%- if cookiecutter.database == 'postgresql' %}
+    def __init__(self, session_factory: Optional[async_sessionmaker] = None):
+        self._session_factory = session_factory or async_session_maker
+        self.session: Optional[AsyncSession] = None
+        self.users: Optional[SQLAlchemyUserRepository] = None
+        self.audit_logs: Optional[SQLAlchemyAuditLogRepository] = None
+        self._after_commit: List[Callable[[], Awaitable[None]]] = []
+    
+    async def __aenter__(self) -> "UnitOfWork":
+        self.session = self._session_factory()
+        self.users = SQLAlchemyUserRepository(self.session)
+        self.audit_logs = SQLAlchemyAuditLogRepository(self.session)
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                await self.commit()
+            else:
+                await self.rollback()
+        finally:
+            # Deterministically returns the connection to the pool
+            await self.session.close()
+    
+    async def commit(self) -> None:
+        """Commit the work done so far."""
+        await self.session.commit()
+        await self._run_after_commit()
+    
+    async def rollback(self) -> None:
+        """Discard the work done so far."""
+        self._after_commit.clear()
+        await self.session.rollback()
+    {%- else %}
+    def __init__(self):
+        self.users: Optional[BeanieUserRepository] = None
+        self.audit_logs: Optional[BeanieAuditLogRepository] = None
+        self._after_commit: List[Callable[[], Awaitable[None]]] = []
+    
+    async def __aenter__(self) -> "UnitOfWork":
+        # Beanie uses the process-wide Motor client; writes are not batched
+        self.users = BeanieUserRepository()
+        self.audit_logs = BeanieAuditLogRepository()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            await self.commit()
+        else:
+            await self.rollback()
+    
+    async def commit(self) -> None:
+        """Every MongoDB write is applied immediately; only runs the after_commit callbacks."""
+        await self._run_after_commit()
+    
+    async def rollback(self) -> None:
+        """Multi-document transactions are not used; drops the after_commit callbacks."""
+        self._after_commit.clear()
+    {%- endif %}
+    
+    def after_commit(self, callback: Callable[[], Awaitable[None]]) -> None:
+        """Run `callback` once the current work has been committed."""
+        self._after_commit.append(callback)
+    
+    async def _run_after_commit(self) -> None:
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            try:
+                await callback()
+            except Exception as e:
+                # The data is committed; a failed follow-up must not fail the request
+                logger.warning("after_commit callback failed: %s", e)
+
+
+async def get_unit_of_work() -> AsyncGenerator[UnitOfWork, None]:
+    """
+    FastAPI dependency providing the request's UnitOfWork.
+    
+    FastAPI caches dependencies per request, so every dependency that
+    asks for it (auth, services, routes) receives the same instance.
+    Depend on it with scope="function" so the commit runs before the
+    response is sent rather than after it:
+    
+        uow: UnitOfWork = Depends(get_unit_of_work, scope="function")
+    """
+    async with UnitOfWork() as uow:
+        yield uow
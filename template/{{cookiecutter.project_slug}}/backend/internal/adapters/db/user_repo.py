@@ -3,25 +3,44 @@
 User Repository Implementation using SQLAlchemy.
 This is an ADAPTER - it implements the PORT (interface).
 """
-from typing import List, Optional
+import re
+from datetime import datetime
+from typing import List, Optional, Tuple
 from uuid import UUID
-from sqlalchemy import select, func
+from sqlalchemy import select, func, text, tuple_, update, delete, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from internal.entities.user import User, UserRole, UserStatus
 from internal.ports.repositories import UserRepository
+from pkg.errors.exceptions import ConflictError
 from .models import UserModel
 
 
 class SQLAlchemyUserRepository(UserRepository):
     """SQLAlchemy implementation of UserRepository."""
     
+    # Below this many rows an exact COUNT(*) is cheap and more accurate
+    # than the planner statistics (which may be stale or missing).
+    EXACT_COUNT_THRESHOLD = 10_000
+    
+    # Never written by update()
+    IMMUTABLE_FIELDS = {"id", "created_at"}
+    
+    # Unique columns upsert_many() can resolve conflicts on
+    UPSERT_KEYS = {"id", "email", "username"}
+    
+    # Rows per executemany batch / IN (...) list - keeps parameter lists
+    # bounded and well under asyncpg's 32767 bind-parameter limit.
+    BULK_CHUNK_SIZE = 5000
+    
     def __init__(self, session: AsyncSession):
         self.session = session
     
     def _model_to_entity(self, model: UserModel) -> User:
         """Convert ORM model to domain entity."""
-        return User(
+        user = User(
             id=model.id,
             email=model.email,
             username=model.username,
@@ -40,6 +59,8 @@ class SQLAlchemyUserRepository(UserRepository):
             created_at=model.created_at,
             updated_at=model.updated_at,
         )
+        user.mark_clean()
+        return user
     
     def _entity_to_model(self, entity: User) -> UserModel:
         """Convert domain entity to ORM model."""
@@ -63,10 +84,35 @@ class SQLAlchemyUserRepository(UserRepository):
             updated_at=entity.updated_at,
         )
     
+    def _entity_to_row(self, entity: User) -> dict:
+        """Convert domain entity to a plain row for bulk (Core) statements."""
+        return {
+            column.name: getattr(entity, column.name)
+            for column in UserModel.__table__.columns
+        }
+    
+    def _chunks(self, items: list) -> List[list]:
+        size = self.BULK_CHUNK_SIZE
+        return [items[i:i + size] for i in range(0, len(items), size)]
+    
+    def _insert(self, target=UserModel):
+        """INSERT with ON CONFLICT support (SQLite stands in for Postgres in tests)."""
+        if self.session.bind.dialect.name == "sqlite":
+            return sqlite_insert(target)
+        return pg_insert(target)
+    
     async def create(self, user: User) -> User:
-        model = self._entity_to_model(user)
-        self.session.add(model)
-        await self.session.flush()
+        # ON CONFLICT DO NOTHING: a taken email or username returns no row
+        # instead of aborting the transaction, so the caller can retry
+        result = await self.session.execute(
+            self._insert()
+            .values(**self._entity_to_row(user))
+            .on_conflict_do_nothing()
+            .returning(UserModel)
+        )
+        model = result.scalar_one_or_none()
+        if model is None:
+            raise ConflictError("User with this email or username already exists")
         return self._model_to_entity(model)
     
     async def get_by_id(self, user_id: UUID) -> Optional[User]:
@@ -90,48 +136,124 @@ class SQLAlchemyUserRepository(UserRepository):
         model = result.scalar_one_or_none()
         return self._model_to_entity(model) if model else None
     
+    async def list_numbered_usernames(self, base: str) -> List[str]:
+        base = base.lower()
+        # LIKE 'base%' is an index range scan on ix_users_username_pattern;
+        # the regex keeps "johnny" & co. out of the result for base "john"
+        result = await self.session.execute(
+            select(UserModel.username).where(
+                UserModel.username.startswith(base, autoescape=True),
+                UserModel.username.regexp_match(f"^{re.escape(base)}[0-9]*$"),
+            )
+        )
+        return list(result.scalars().all())
+    
+    async def get_many(self, user_ids: List[UUID]) -> List[User]:
+        users = []
+        for chunk in self._chunks(list(user_ids)):
+            result = await self.session.execute(
+                select(UserModel).where(UserModel.id.in_(chunk))
+            )
+            users.extend(self._model_to_entity(m) for m in result.scalars().all())
+        return users
+    
+    async def create_many(self, users: List[User]) -> List[User]:
+        # Core executemany: one prepared INSERT, rows pipelined by asyncpg.
+        # (A literal multi-row VALUES is re-compiled per chunk and is ~10x slower.)
+        table = UserModel.__table__
+        for chunk in self._chunks(list(users)):
+            await self.session.execute(
+                insert(table),
+                [self._entity_to_row(u) for u in chunk],
+            )
+        for user in users:
+            user.mark_clean()
+        return users
+    
+    async def upsert_many(
+        self,
+        users: List[User],
+        conflict_on: str = "email",
+    ) -> int:
+        if conflict_on not in self.UPSERT_KEYS:
+            raise ValueError(f"Cannot upsert on '{conflict_on}'")
+        
+        # Duplicate keys in the input collapse to the last occurrence
+        rows = {}
+        for user in users:
+            row = self._entity_to_row(user)
+            rows[row[conflict_on]] = row
+        
+        if not rows:
+            return 0
+        
+        # Core (table) insert: rows go through executemany, not the ORM
+        stmt = self._insert(UserModel.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[conflict_on],
+            set_={
+                column.name: stmt.excluded[column.name]
+                for column in UserModel.__table__.columns
+                if column.name not in self.IMMUTABLE_FIELDS and column.name != conflict_on
+            },
+        )
+        for chunk in self._chunks(list(rows.values())):
+            await self.session.execute(stmt, chunk)
+        # DO UPDATE writes exactly one row per input row
+        return len(rows)
+    
     async def update(self, user: User) -> User:
+        changes = {
+            name: getattr(user, name)
+            for name in user.changed_fields - self.IMMUTABLE_FIELDS
+        }
+        if not changes:
+            return user
+        # One UPDATE ... RETURNING round-trip, writing only the changed columns
         result = await self.session.execute(
-            select(UserModel).where(UserModel.id == user.id)
+            update(UserModel)
+            .where(UserModel.id == user.id)
+            .values(**changes)
+            .returning(UserModel)
+            .execution_options(populate_existing=True)
         )
         model = result.scalar_one_or_none()
-        if model:
-            model.email = user.email
-            model.username = user.username
-            {%- if cookiecutter.auth_strategy == 'jwt_builtin' %}
-            model.hashed_password = user.hashed_password
-            {%- endif %}
-            model.first_name = user.first_name
-            model.last_name = user.last_name
-            model.role = user.role
-            model.status = user.status
-            model.is_verified = user.is_verified
-            model.avatar_url = user.avatar_url
-            {%- if cookiecutter.auth_strategy == 'keycloak' %}
-            model.keycloak_id = user.keycloak_id
-            {%- endif %}
-            model.updated_at = user.updated_at
-            await self.session.flush()
-            return self._model_to_entity(model)
-        return user
+        return self._model_to_entity(model) if model else user
     
     async def delete(self, user_id: UUID) -> bool:
         result = await self.session.execute(
-            select(UserModel).where(UserModel.id == user_id)
+            delete(UserModel).where(UserModel.id == user_id).returning(UserModel.id)
         )
-        model = result.scalar_one_or_none()
-        if model:
-            await self.session.delete(model)
-            return True
-        return False
+        return result.scalar_one_or_none() is not None
     
     async def list_all(self, skip: int = 0, limit: int = 100) -> List[User]:
         result = await self.session.execute(
             select(UserModel)
             .offset(skip)
             .limit(limit)
-            .order_by(UserModel.created_at.desc())
+            .order_by(UserModel.created_at.desc(), UserModel.id.desc())
+        )
+        models = result.scalars().all()
+        return [self._model_to_entity(m) for m in models]
+    
+    async def list_page(
+        self,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, UUID]] = None,
+    ) -> List[User]:
+        query = (
+            select(UserModel)
+            .order_by(UserModel.created_at.desc(), UserModel.id.desc())
+            .limit(limit)
         )
+        if after is not None:
+            # Row-value comparison lets Postgres seek straight into the
+            # (created_at, id) index instead of scanning OFFSET rows.
+            created_at, user_id = after
+            query = query.where(
+                tuple_(UserModel.created_at, UserModel.id) < tuple_(created_at, user_id)
+            )
+        result = await self.session.execute(query)
         models = result.scalars().all()
         return [self._model_to_entity(m) for m in models]
     
@@ -139,6 +261,18 @@ class SQLAlchemyUserRepository(UserRepository):
         result = await self.session.execute(select(func.count(UserModel.id)))
         return result.scalar() or 0
     
+    async def estimate_count(self) -> int:
+        # pg_class.reltuples is maintained by VACUUM/ANALYZE - O(1) lookup
+        result = await self.session.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+            {"table": UserModel.__tablename__},
+        )
+        estimate = result.scalar()
+        # -1 means "never analyzed" (PG14+); small tables are cheap to count exactly
+        if estimate is None or estimate < self.EXACT_COUNT_THRESHOLD:
+            return await self.count()
+        return int(estimate)
+    
     {%- if cookiecutter.auth_strategy == 'keycloak' %}
     async def get_by_keycloak_id(self, keycloak_id: str) -> Optional[User]:
         result = await self.session.execute(
@@ -152,21 +286,37 @@ class SQLAlchemyUserRepository(UserRepository):
 User Repository Implementation using Beanie (MongoDB).
 This is an ADAPTER - it implements the PORT (interface).
 """
-from typing import List, Optional
+import re
+from typing import List, Optional, Tuple
 from uuid import UUID
 from datetime import datetime
+from beanie import UpdateResponse
+from beanie.odm.utils.dump import get_dict
+from beanie.operators import And, Eq, In, LT, Or, Set
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
 
 from internal.entities.user import User
 from internal.ports.repositories import UserRepository
+from pkg.errors.exceptions import ConflictError
 from .models import UserDocument
 
 
 class BeanieUserRepository(UserRepository):
     """Beanie implementation of UserRepository for MongoDB."""
     
+    # Never written by update()
+    IMMUTABLE_FIELDS = {"id", "created_at"}
+    
+    # Unique fields upsert_many() can resolve conflicts on
+    UPSERT_KEYS = {"id", "email", "username"}
+    
+    # Documents per bulk_write / insert_many call
+    BULK_CHUNK_SIZE = 1000
+    
     def _document_to_entity(self, doc: UserDocument) -> User:
         """Convert MongoDB document to domain entity."""
-        return User(
+        user = User(
             id=doc.id,
             email=doc.email,
             username=doc.username,
@@ -185,9 +335,12 @@ class BeanieUserRepository(UserRepository):
             created_at=doc.created_at,
             updated_at=doc.updated_at,
         )
+        user.mark_clean()
+        return user
     
-    async def create(self, user: User) -> User:
-        doc = UserDocument(
+    def _entity_to_document(self, user: User) -> UserDocument:
+        """Convert domain entity to MongoDB document."""
+        return UserDocument(
             id=user.id,
             email=user.email,
             username=user.username,
@@ -205,7 +358,17 @@ class BeanieUserRepository(UserRepository):
             {%- endif %}
             created_at=user.created_at,
         )
-        await doc.insert()
+    
+    def _chunks(self, items: list) -> List[list]:
+        size = self.BULK_CHUNK_SIZE
+        return [items[i:i + size] for i in range(0, len(items), size)]
+    
+    async def create(self, user: User) -> User:
+        doc = self._entity_to_document(user)
+        try:
+            await doc.insert()
+        except DuplicateKeyError:
+            raise ConflictError("User with this email or username already exists")
         return self._document_to_entity(doc)
     
     async def get_by_id(self, user_id: UUID) -> Optional[User]:
@@ -220,42 +383,122 @@ class BeanieUserRepository(UserRepository):
         doc = await UserDocument.find_one(UserDocument.username == username.lower())
         return self._document_to_entity(doc) if doc else None
     
+    async def list_numbered_usernames(self, base: str) -> List[str]:
+        # An anchored, case-sensitive regex is a range scan on the username index
+        cursor = UserDocument.get_motor_collection().find(
+            {"username": {"$regex": f"^{re.escape(base.lower())}\\d*$"}},
+            {"username": 1, "_id": 0},
+        )
+        return [doc["username"] async for doc in cursor]
+    
+    async def get_many(self, user_ids: List[UUID]) -> List[User]:
+        users = []
+        for chunk in self._chunks(list(user_ids)):
+            docs = await UserDocument.find(In(UserDocument.id, chunk)).to_list()
+            users.extend(self._document_to_entity(d) for d in docs)
+        return users
+    
+    async def create_many(self, users: List[User]) -> List[User]:
+        collection = UserDocument.get_motor_collection()
+        for chunk in self._chunks(list(users)):
+            await collection.insert_many(
+                [get_dict(self._entity_to_document(u), to_db=True) for u in chunk],
+                ordered=False,
+            )
+        for user in users:
+            user.mark_clean()
+        return users
+    
+    async def upsert_many(
+        self,
+        users: List[User],
+        conflict_on: str = "email",
+    ) -> int:
+        if conflict_on not in self.UPSERT_KEYS:
+            raise ValueError(f"Cannot upsert on '{conflict_on}'")
+        key = "_id" if conflict_on == "id" else conflict_on
+        immutable = {"_id", "created_at", key}
+        
+        # Duplicate keys in the input collapse to the last occurrence
+        docs = {}
+        for user in users:
+            doc = get_dict(self._entity_to_document(user), to_db=True)
+            docs[doc[key]] = doc
+        
+        collection = UserDocument.get_motor_collection()
+        written = 0
+        for chunk in self._chunks(list(docs.values())):
+            operations = []
+            for doc in chunk:
+                operations.append(UpdateOne(
+                    {key: doc[key]},
+                    {
+                        "$set": {k: v for k, v in doc.items() if k not in immutable},
+                        "$setOnInsert": {k: doc[k] for k in immutable if k != key},
+                    },
+                    upsert=True,
+                ))
+            result = await collection.bulk_write(operations, ordered=False)
+            # Matched rather than modified: unchanged users count as written,
+            # like the SQL adapter's DO UPDATE
+            written += result.upserted_count + result.matched_count
+        return written
+    
     async def update(self, user: User) -> User:
-        doc = await UserDocument.find_one(UserDocument.id == user.id)
-        if doc:
-            doc.email = user.email
-            doc.username = user.username
-            {%- if cookiecutter.auth_strategy == 'jwt_builtin' %}
-            doc.hashed_password = user.hashed_password
-            {%- endif %}
-            doc.first_name = user.first_name
-            doc.last_name = user.last_name
-            doc.role = user.role
-            doc.status = user.status
-            doc.is_verified = user.is_verified
-            doc.avatar_url = user.avatar_url
-            {%- if cookiecutter.auth_strategy == 'keycloak' %}
-            doc.keycloak_id = user.keycloak_id
-            {%- endif %}
-            doc.updated_at = datetime.utcnow()
-            await doc.save()
-            return self._document_to_entity(doc)
-        return user
+        changes = {
+            name: getattr(user, name)
+            for name in user.changed_fields - self.IMMUTABLE_FIELDS
+        }
+        if not changes:
+            return user
+        changes.setdefault("updated_at", datetime.utcnow())
+        # Single find_one_and_update ($set of the changed fields only)
+        doc = await UserDocument.find_one(UserDocument.id == user.id).update(
+            Set(changes),
+            response_type=UpdateResponse.NEW_DOCUMENT,
+        )
+        return self._document_to_entity(doc) if doc else user
     
     async def delete(self, user_id: UUID) -> bool:
-        doc = await UserDocument.find_one(UserDocument.id == user_id)
-        if doc:
-            await doc.delete()
-            return True
-        return False
+        result = await UserDocument.find_one(UserDocument.id == user_id).delete()
+        return bool(result and result.deleted_count)
     
     async def list_all(self, skip: int = 0, limit: int = 100) -> List[User]:
         docs = await UserDocument.find_all().skip(skip).limit(limit).to_list()
         return [self._document_to_entity(d) for d in docs]
     
+    async def list_page(
+        self,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, UUID]] = None,
+    ) -> List[User]:
+        query = UserDocument.find()
+        if after is not None:
+            created_at, user_id = after
+            query = UserDocument.find(
+                Or(
+                    LT(UserDocument.created_at, created_at),
+                    And(
+                        Eq(UserDocument.created_at, created_at),
+                        LT(UserDocument.id, user_id),
+                    ),
+                )
+            )
+        docs = await (
+            query
+            .sort(-UserDocument.created_at, -UserDocument.id)
+            .limit(limit)
+            .to_list()
+        )
+        return [self._document_to_entity(d) for d in docs]
+    
     async def count(self) -> int:
         return await UserDocument.count()
     
+    async def estimate_count(self) -> int:
+        # Reads collection metadata instead of scanning documents
+        return await UserDocument.get_motor_collection().estimated_document_count()
+    
     {%- if cookiecutter.auth_strategy == 'keycloak' %}
     async def get_by_keycloak_id(self, keycloak_id: str) -> Optional[User]:
         doc = await UserDocument.find_one(UserDocument.keycloak_id == keycloak_id)
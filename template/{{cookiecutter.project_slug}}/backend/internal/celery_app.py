@@ -12,9 +12,12 @@
 #   CELERY_RESULT_BACKEND: Redis URL for result storage
 
 import os
-from celery import Celery
+from celery import Celery, signals
 from celery.schedules import crontab
 
+from pkg.config.settings import settings
+from pkg.metrics.celery import instrument_celery
+
 # Get configuration from environment
 BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/1")
 RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/2")
@@ -54,6 +57,18 @@ app.conf.update(
     task_max_retries=3,
 )
 
+# Prometheus task metrics (see pkg/metrics/celery.py for worker setup)
+instrument_celery()
+
+
+# OpenTelemetry: each worker process continues the trace of the request
+# that sent the task (the API injects the context into message headers)
+@signals.worker_process_init.connect(weak=False)
+def init_worker_tracing(**kwargs):
+    if settings.tracing_enabled:
+        from pkg.tracing import setup_tracing
+        setup_tracing()
+
 # Beat schedule for periodic tasks
 app.conf.beat_schedule = {
     # Daily cleanup at midnight
@@ -3,9 +3,11 @@ Pydantic response schemas.
 Never expose internal entities directly - use these DTOs.
 """
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, Dict, Iterable, Optional, List
 from uuid import UUID
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
+
+from internal.entities.user import User
 
 
 class UserResponse(BaseModel):
@@ -26,6 +28,37 @@ class UserResponse(BaseModel):
     
     class Config:
         from_attributes = True
+    
+    @staticmethod
+    def to_payload(user: User) -> Dict[str, Any]:
+        """Map a User entity to this schema's fields, without validation."""
+        return {
+            "id": user.id,
+            "email": user.email,
+            "username": user.username,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "full_name": user.full_name,
+            "role": user.role.value,
+            "status": user.status.value,
+            "is_verified": user.is_verified,
+            "avatar_url": user.avatar_url,
+            "created_at": user.created_at,
+            "updated_at": user.updated_at,
+        }
+    
+    @classmethod
+    def from_entity(cls, user: User) -> "UserResponse":
+        """Build a response from a User entity."""
+        return cls.model_validate(cls.to_payload(user))
+    
+    @classmethod
+    def from_entities(cls, users: Iterable[User]) -> List["UserResponse"]:
+        """Build responses for many users in a single validation pass."""
+        return _user_list_adapter.validate_python([cls.to_payload(u) for u in users])
+
+
+_user_list_adapter = TypeAdapter(List[UserResponse])
 
 
 class UserListResponse(BaseModel):
@@ -33,9 +66,11 @@ class UserListResponse(BaseModel):
     
     items: List[UserResponse]
     total: int
+    total_is_estimate: bool = False
     page: int
     page_size: int
     has_more: bool
+    next_cursor: Optional[str] = None
 
 
 {%- if cookiecutter.auth_strategy == 'jwt_builtin' %}
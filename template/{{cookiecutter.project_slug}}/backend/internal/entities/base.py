@@ -2,9 +2,9 @@
 Base Entity - Pure domain model.
 NO external dependencies (no SQLAlchemy, no Pydantic).
 """
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Set
 from uuid import UUID, uuid4
 
 
@@ -28,6 +28,19 @@ class BaseEntity:
     def __post_init__(self):
         """Validate invariants after initialization."""
         self._validate()
+        # None = never loaded from storage, so every field counts as changed
+        object.__setattr__(self, "_changed_fields", None)
+    
+    def __setattr__(self, name, value):
+        """Record which fields change after the entity was loaded."""
+        changed = self.__dict__.get("_changed_fields")
+        if (
+            changed is not None
+            and name in self.__dataclass_fields__
+            and self.__dict__.get(name) != value
+        ):
+            changed.add(name)
+        object.__setattr__(self, name, value)
     
     def _validate(self):
         """
@@ -39,3 +52,15 @@ class BaseEntity:
     def touch(self):
         """Update the updated_at timestamp."""
         self.updated_at = datetime.utcnow()
+    
+    @property
+    def changed_fields(self) -> Set[str]:
+        """Fields modified since the entity was loaded (all fields if it never was)."""
+        changed = self.__dict__.get("_changed_fields")
+        if changed is None:
+            return {f.name for f in fields(self)}
+        return set(changed)
+    
+    def mark_clean(self):
+        """Mark the entity as in sync with storage. Called by repository adapters."""
+        object.__setattr__(self, "_changed_fields", set())
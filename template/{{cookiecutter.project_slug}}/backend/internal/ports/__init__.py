@@ -1,12 +1,14 @@
 """Ports package - Interfaces for external dependencies."""
-from .repositories import UserRepository
+from .repositories import UserRepository, AuditLogRepository
 {%- if cookiecutter.use_redis == 'yes' %}
-from .repositories import CacheRepository
+from .repositories import CacheBatch, CacheRepository
 {%- endif %}
 
 __all__ = [
     "UserRepository",
+    "AuditLogRepository",
     {%- if cookiecutter.use_redis == 'yes' %}
+    "CacheBatch",
     "CacheRepository",
     {%- endif %}
 ]
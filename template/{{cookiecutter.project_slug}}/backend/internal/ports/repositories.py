@@ -4,7 +4,12 @@ These are abstract interfaces that define what the domain needs.
 Implementations (adapters) are injected at runtime.
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+{%- if cookiecutter.use_redis == 'yes' %}
+from typing import AsyncContextManager, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+{%- else %}
+from typing import List, Optional, Sequence, Tuple
+{%- endif %}
 from uuid import UUID
 
 from internal.entities.user import User
@@ -20,7 +25,11 @@ class UserRepository(ABC):
     
     @abstractmethod
     async def create(self, user: User) -> User:
-        """Create a new user."""
+        """
+        Create a new user.
+        
+        Raises ConflictError if the email or username is already taken.
+        """
         pass
     
     @abstractmethod
@@ -38,6 +47,35 @@ class UserRepository(ABC):
         """Get user by username."""
         pass
     
+    @abstractmethod
+    async def list_numbered_usernames(self, base: str) -> List[str]:
+        """Taken usernames among `base` and `base` + digits (lowercase), in one indexed query."""
+        pass
+    
+    @abstractmethod
+    async def get_many(self, user_ids: List[UUID]) -> List[User]:
+        """Get users by IDs in batched queries. Unknown IDs are skipped."""
+        pass
+    
+    @abstractmethod
+    async def create_many(self, users: List[User]) -> List[User]:
+        """Create many users with batched multi-row inserts."""
+        pass
+    
+    @abstractmethod
+    async def upsert_many(
+        self,
+        users: List[User],
+        conflict_on: str = "email",
+    ) -> int:
+        """
+        Insert users, updating existing rows that match on `conflict_on`
+        (one of "id", "email", "username"). Users with the same key collapse
+        to the last one. Returns the number of users inserted or updated,
+        counting updates that left a row unchanged.
+        """
+        pass
+    
     @abstractmethod
     async def update(self, user: User) -> User:
         """Update an existing user."""
@@ -57,11 +95,30 @@ class UserRepository(ABC):
         """List all users with pagination."""
         pass
     
+    @abstractmethod
+    async def list_page(
+        self,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, UUID]] = None,
+    ) -> List[User]:
+        """
+        List users with keyset (cursor) pagination.
+        
+        Users are ordered by (created_at, id) descending. `after` is the
+        (created_at, id) of the last user of the previous page.
+        """
+        pass
+    
     @abstractmethod
     async def count(self) -> int:
         """Count total users."""
         pass
     
+    @abstractmethod
+    async def estimate_count(self) -> int:
+        """Cheap, approximate count of users (no full scan)."""
+        pass
+    
     {%- if cookiecutter.auth_strategy == 'keycloak' %}
     @abstractmethod
     async def get_by_keycloak_id(self, keycloak_id: str) -> Optional[User]:
@@ -70,9 +127,38 @@ class UserRepository(ABC):
     {%- endif %}
 
 
+class AuditLogRepository(ABC):
+    """
+    Audit log repository interface.
+    Entries are the flat dicts built by AuditMiddleware.
+    """
+    
+    @abstractmethod
+    async def insert_many(self, entries: Sequence[dict]) -> int:
+        """Append entries in one batch. Returns the number written."""
+        pass
+
+
 {%- if cookiecutter.use_redis == 'yes' %}
 
 
+class CacheBatch(ABC):
+    """
+    Writes queued inside CacheRepository.pipeline() and sent together
+    when the block exits.
+    """
+    
+    @abstractmethod
+    def set(self, key: str, value: str, expire_seconds: Optional[int] = None) -> None:
+        """Queue a set with optional expiration."""
+        pass
+    
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Queue a delete."""
+        pass
+
+
 class CacheRepository(ABC):
     """
     Cache repository interface for Redis operations.
@@ -102,4 +188,44 @@ class CacheRepository(ABC):
     async def exists(self, key: str) -> bool:
         """Check if key exists."""
         pass
+    
+    @abstractmethod
+    async def get_many(self, keys: Sequence[str]) -> Dict[str, str]:
+        """Get values for many keys in batched round-trips. Missing keys are skipped."""
+        pass
+    
+    @abstractmethod
+    async def set_many(
+        self,
+        items: Mapping[str, str],
+        expire_seconds: Union[None, int, Mapping[str, int]] = None,
+    ) -> int:
+        """
+        Set many keys in batched round-trips. `expire_seconds` is one TTL for
+        every key or a per-key mapping (keys left out never expire).
+        Returns the number of keys written.
+        """
+        pass
+    
+    @abstractmethod
+    async def delete_many(self, keys: Sequence[str]) -> int:
+        """Delete many keys. Returns the number that existed."""
+        pass
+    
+    @abstractmethod
+    async def delete_pattern(self, pattern: str) -> int:
+        """
+        Delete every key matching a glob pattern (e.g. "user:42:*"),
+        scanning incrementally. Returns the number deleted.
+        """
+        pass
+    
+    @abstractmethod
+    def pipeline(self, transaction: bool = False) -> AsyncContextManager[CacheBatch]:
+        """
+        Queue writes and send them in one round-trip when the block exits,
+        atomically (MULTI/EXEC) if `transaction`. Nothing is sent if the
+        block raises.
+        """
+        pass
 {%- endif %}
@@ -1,5 +1,7 @@
 """Services package - Business logic."""
 from .user_service import UserService
+from .principal_cache import PrincipalCache, get_principal_cache
+from .cache import cached, get_typed_cache
 from .auth_deps import (
     get_user_service,
     get_current_user,
@@ -13,6 +15,10 @@ from .auth_deps import (
 
 __all__ = [
     "UserService",
+    "PrincipalCache",
+    "get_principal_cache",
+    "cached",
+    "get_typed_cache",
     "get_user_service",
     "get_current_user",
     "get_current_active_user",
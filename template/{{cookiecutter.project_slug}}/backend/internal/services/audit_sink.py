@@ -0,0 +1,210 @@
+"""
+Audit Sink - batched, off-request persistence of audit entries.
+
+AuditMiddleware hands entries to `submit()`, which only appends to a
+bounded in-memory queue. A background task drains the queue and writes
+batches through the AuditLogRepository port, so the request path never
+waits on the database.
+
+When the queue is full (the database is slower than the traffic) the
+overflow policy decides what happens to new entries:
+- "drop": discard them and count the loss
+- "spill": append them as JSON lines to `spill_path` for later replay
+
+Batches that fail to write are handled by the same policy.
+"""
+import asyncio
+import json
+import logging
+import time
+from typing import Callable, List, Optional
+
+from pkg.config.settings import settings
+from pkg.metrics import register_stats
+
+
+logger = logging.getLogger("audit")
+
+OVERFLOW_POLICIES = {"drop", "spill"}
+
+# Queue marker telling the writer to stop
+_STOP = object()
+
+
+class AuditSink:
+    """Bounded queue of audit entries drained by a background batch writer."""
+    
+    def __init__(
+        self,
+        uow_factory: Callable,
+        max_queue_size: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        overflow_policy: str = "drop",
+        spill_path: str = "audit_spill.jsonl",
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow_policy must be one of {sorted(OVERFLOW_POLICIES)}")
+        self.uow_factory = uow_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.spill_path = spill_path
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+        # Metrics
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.failed_batches = 0
+        self.flushes = 0
+        self.last_flush_ms = 0.0
+        self.total_flush_ms = 0.0
+    
+    def submit(self, entry: dict) -> None:
+        """Queue an entry without blocking; applies the overflow policy when full."""
+        if self._closed:
+            self._overflow([entry])
+            return
+        if self._task is None:
+            self.start()
+        try:
+            self.queue.put_nowait(entry)
+            self.enqueued += 1
+        except asyncio.QueueFull:
+            self._overflow([entry])
+    
+    def _overflow(self, entries: List[dict]) -> None:
+        if self.overflow_policy == "spill":
+            try:
+                with open(self.spill_path, "a", encoding="utf-8") as f:
+                    f.writelines(json.dumps(entry) + "\n" for entry in entries)
+                self.spilled += len(entries)
+                return
+            except OSError as e:
+                logger.error("Audit spill to %s failed: %s", self.spill_path, e)
+        self.dropped += len(entries)
+    
+    async def _write(self, batch: List[dict]) -> None:
+        started = time.perf_counter()
+        try:
+            async with self.uow_factory() as uow:
+                self.written += await uow.audit_logs.insert_many(batch)
+        except Exception as e:
+            # The database is down or rejected the batch; never lose the
+            # writer task over it
+            self.failed_batches += 1
+            logger.error("Audit batch of %d entries failed: %s", len(batch), e)
+            self._overflow(batch)
+        finally:
+            self.flushes += 1
+            self.last_flush_ms = (time.perf_counter() - started) * 1000
+            self.total_flush_ms += self.last_flush_ms
+    
+    async def _next_batch(self) -> Optional[List[dict]]:
+        """Wait for an entry, then give the batch up to flush_interval to fill."""
+        entry = await self.queue.get()
+        if entry is _STOP:
+            return None
+        batch = [entry]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                entry = self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            if entry is _STOP:
+                # Write what we have, then stop on the next call
+                self.queue.put_nowait(_STOP)
+                break
+            batch.append(entry)
+        return batch
+    
+    async def _run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            if batch is None:
+                return
+            await self._write(batch)
+    
+    def start(self) -> None:
+        """Start the background writer (done automatically on first submit)."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    async def close(self, timeout: float = 10.0) -> None:
+        """Stop accepting entries and flush everything still queued."""
+        self._closed = True
+        if self._task is None:
+            return
+        # Queued behind every pending entry, so they are all written first
+        await self.queue.put(_STOP)
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            logger.error("Audit sink did not flush within %.1fs", timeout)
+            leftover = []
+            while not self.queue.empty():
+                entry = self.queue.get_nowait()
+                if entry is not _STOP:
+                    leftover.append(entry)
+            self._overflow(leftover)
+        self._task = None
+    
+    def stats(self) -> dict:
+        """Queue depth, throughput and flush latency."""
+        return {
+            "queue_depth": self.queue.qsize(),
+            "queue_capacity": self.queue.maxsize,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "spilled": self.spilled,
+            "failed_batches": self.failed_batches,
+            "flushes": self.flushes,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+            "avg_flush_ms": round(self.total_flush_ms / self.flushes, 2) if self.flushes else 0.0,
+        }
+
+
+# Process-wide sink
+audit_sink: Optional[AuditSink] = None
+
+register_stats(
+    "audit_sink",
+    lambda: audit_sink.stats() if audit_sink is not None else None,
+    gauges=("queue_depth",),
+    counters=("enqueued", "written", "dropped", "spilled", "failed_batches", "flushes"),
+)
+
+
+def get_audit_sink() -> AuditSink:
+    """Get the process-wide audit sink, creating it on first use."""
+    global audit_sink
+    if audit_sink is None:
+        from internal.adapters.db.unit_of_work import UnitOfWork
+        audit_sink = AuditSink(
+            UnitOfWork,
+            max_queue_size=settings.audit_queue_size,
+            batch_size=settings.audit_batch_size,
+            flush_interval=settings.audit_flush_interval_seconds,
+            overflow_policy=settings.audit_overflow_policy,
+            spill_path=settings.audit_spill_path,
+        )
+    return audit_sink
+
+
+async def close_audit_sink() -> None:
+    """Flush pending entries; call on shutdown."""
+    global audit_sink
+    if audit_sink is not None:
+        await audit_sink.close()
+        audit_sink = None
@@ -7,7 +7,6 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 {%- if cookiecutter.auth_strategy == 'keycloak' %}
 from jose import jwt, JWTError
-import httpx
 {%- elif cookiecutter.auth_strategy == 'jwt_builtin' %}
 from jose import jwt, JWTError
 from datetime import datetime, timedelta
@@ -16,23 +15,53 @@ from datetime import datetime, timedelta
 from pkg.config.settings import settings
 from internal.entities.user import User, UserRole
 from internal.services.user_service import UserService
-from internal.adapters.db.user_repo import SQLAlchemyUserRepository
-from internal.adapters.db.connection import get_session
+from internal.adapters.db.unit_of_work import UnitOfWork, get_unit_of_work
+{%- if cookiecutter.auth_strategy == 'keycloak' %}
+from internal.adapters.auth.jwks import get_jwks_cache
+{%- elif cookiecutter.auth_strategy == 'jwt_builtin' %}
+from internal.services.principal_cache import get_principal_cache
+{%- endif %}
 
 
 security = HTTPBearer(auto_error=False)
 
 
-async def get_user_service() -> UserService:
-    """Dependency to get UserService instance."""
-    async for session in get_session():
-        repo = SQLAlchemyUserRepository(session)
-        return UserService(repo)
+async def get_user_service(
+    # Function scope: commit before the response is sent, so a failed
+    # commit is an error response and the next request sees the write
+    uow: UnitOfWork = Depends(get_unit_of_work, scope="function"),
+) -> UserService:
+    """Dependency to get UserService bound to the request's unit of work."""
+    {%- if cookiecutter.auth_strategy == 'jwt_builtin' %}
+    return UserService(
+        uow.users,
+        principal_cache=get_principal_cache(),
+        after_commit=uow.after_commit,
+    )
+    {%- else %}
+    return UserService(uow.users)
+    {%- endif %}
 
 
 {%- if cookiecutter.auth_strategy == 'keycloak' %}
 
 
+async def decode_access_token(token: str) -> dict:
+    """Verify a Keycloak token and return its claims (raises JWTError if invalid)."""
+    # Look up the signing key in the process-wide JWKS cache
+    kid = jwt.get_unverified_header(token).get("kid")
+    key = await get_jwks_cache().get_key(kid)
+    if key is None:
+        raise JWTError("Unknown signing key")
+    
+    return jwt.decode(
+        token,
+        key,
+        algorithms=["RS256"],
+        audience=settings.keycloak_client_id,
+    )
+
+
 async def get_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     user_service: UserService = Depends(get_user_service),
@@ -47,21 +76,7 @@ async def get_current_user(
         )
     
     try:
-        # Get Keycloak public key and verify token
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{settings.keycloak_url}/realms/{settings.keycloak_realm}/protocol/openid-connect/certs"
-            )
-            jwks = response.json()
-        
-        # Decode token
-        token = credentials.credentials
-        payload = jwt.decode(
-            token,
-            jwks,
-            algorithms=["RS256"],
-            audience=settings.keycloak_client_id,
-        )
+        payload = await decode_access_token(credentials.credentials)
         
         keycloak_id = payload.get("sub")
         if not keycloak_id:
@@ -115,6 +130,15 @@ def create_refresh_token(data: dict) -> str:
     return jwt.encode(to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
 
 
+async def decode_access_token(token: str) -> dict:
+    """Verify a JWT and return its claims (raises JWTError if invalid)."""
+    return jwt.decode(
+        token,
+        settings.jwt_secret_key,
+        algorithms=[settings.jwt_algorithm],
+    )
+
+
 async def get_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     user_service: UserService = Depends(get_user_service),
@@ -129,12 +153,7 @@ async def get_current_user(
         )
     
     try:
-        token = credentials.credentials
-        payload = jwt.decode(
-            token,
-            settings.jwt_secret_key,
-            algorithms=[settings.jwt_algorithm],
-        )
+        payload = await decode_access_token(credentials.credentials)
         
         if payload.get("type") != "access":
             raise HTTPException(
@@ -150,7 +169,7 @@ async def get_current_user(
             )
         
         from uuid import UUID
-        user = await user_service.get_user(UUID(user_id))
+        user = await user_service.get_principal(UUID(user_id))
         
         if not user.can_login:
             raise HTTPException(
@@ -178,6 +197,23 @@ async def get_current_user() -> Optional[User]:
 {%- endif %}
 
 
+async def token_subject(token: str) -> Optional[str]:
+    """Subject (`sub`) of a valid access token, None otherwise."""
+    {%- if cookiecutter.auth_strategy == 'none' %}
+    return None
+    {%- else %}
+    try:
+        payload = await decode_access_token(token)
+    except JWTError:
+        return None
+    {%- if cookiecutter.auth_strategy == 'jwt_builtin' %}
+    if payload.get("type") != "access":
+        return None
+    {%- endif %}
+    return payload.get("sub")
+    {%- endif %}
+
+
 async def get_current_active_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
@@ -0,0 +1,67 @@
+"""
+Service cache - typed cache-aside for use cases.
+
+    from internal.services.cache import cached
+
+    class ReportService:
+        @cached(key="reports:summary:{day}", ttl=300)
+        async def summary(self, day: date) -> Summary:
+            ...
+
+Results live in Redis when it is enabled (shared by every worker, with
+the cross-worker lock available via lock=True) behind the near cache's
+in-process tier, otherwise in an in-process LRU. See pkg/cache/typed.py
+for the stampede protection.
+Invalidate after writes that change a cached result:
+
+    await ReportService.summary.invalidate(self, day)
+"""
+from typing import Callable, Optional, Union
+
+from pkg.cache import MemoryCacheBackend, TypedCache
+from pkg.cache import cached as _cached
+from pkg.config.settings import settings
+from pkg.metrics import register_stats
+
+
+# Process-wide cache
+typed_cache: Optional[TypedCache] = None
+
+
+def get_typed_cache() -> TypedCache:
+    """Get the process-wide cache, creating it on first use."""
+    global typed_cache
+    if typed_cache is None:
+        backend = None
+        lock_client = None
+        {%- if cookiecutter.use_redis == 'yes' %}
+        if settings.cache_use_redis:
+            from internal.adapters.cache.near_cache import get_near_cache
+            from internal.adapters.cache.redis_cache import RedisCacheRepository
+            try:
+                backend = get_near_cache() if settings.near_cache_enabled else RedisCacheRepository()
+                lock_client = backend.client
+            except RuntimeError:
+                # Redis not initialized (scripts, tests): in-process only
+                backend = None
+        {%- endif %}
+        typed_cache = TypedCache(
+            backend or MemoryCacheBackend(max_size=settings.cache_local_max_size),
+            lock_client=lock_client,
+            beta=settings.cache_xfetch_beta,
+            lock_timeout_seconds=settings.cache_lock_timeout_seconds,
+            lock_wait_seconds=settings.cache_lock_wait_seconds,
+        )
+    return typed_cache
+
+
+def cached(key: Union[str, Callable[..., str]], ttl: int, lock: bool = False):
+    """@cached backed by the process-wide cache."""
+    return _cached(key, ttl, cache=get_typed_cache, lock=lock)
+
+
+register_stats(
+    "service_cache",
+    lambda: typed_cache.stats if typed_cache is not None else None,
+    counters=("hits", "misses", "early_refreshes", "coalesced", "loads", "errors"),
+)
@@ -0,0 +1,186 @@
+{%- if cookiecutter.auth_strategy == 'jwt_builtin' %}
+"""
+Password Hasher - keeps password hashing off the event loop.
+
+bcrypt/argon2 take 100+ ms of CPU per call. Running them inline in an
+`async def` stalls every other request on the worker, so hashes are
+computed in a small dedicated thread pool (both libraries release the
+GIL). The number of waiting calls is capped: past `max_pending`, callers
+get a RateLimitError instead of an ever-growing queue.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple, TypeVar
+
+from passlib.context import CryptContext
+
+from pkg.config.settings import settings
+from pkg.errors.exceptions import RateLimitError
+from pkg.metrics import register_stats
+
+
+T = TypeVar("T")
+
+
+def build_crypt_context(
+    scheme: str = "bcrypt",
+    bcrypt_rounds: int = 12,
+    argon2_time_cost: int = 3,
+    argon2_memory_cost: int = 65536,
+    argon2_parallelism: int = 4,
+) -> CryptContext:
+    """
+    Build the passlib context.
+    
+    `scheme` is used for new hashes; the other scheme is still accepted and
+    marked deprecated, as are bcrypt hashes below `bcrypt_rounds`, so
+    `verify_and_update` upgrades them on the next login.
+    """
+    schemes = [scheme] + [s for s in ("argon2", "bcrypt") if s != scheme]
+    return CryptContext(
+        schemes=schemes,
+        deprecated="auto",
+        bcrypt__rounds=bcrypt_rounds,
+        bcrypt__min_rounds=bcrypt_rounds,
+        argon2__type="ID",
+        argon2__time_cost=argon2_time_cost,
+        argon2__memory_cost=argon2_memory_cost,
+        argon2__parallelism=argon2_parallelism,
+    )
+
+
+class PasswordHasher:
+    """Runs a CryptContext in a bounded thread pool."""
+    
+    def __init__(
+        self,
+        context: CryptContext,
+        max_workers: int = 4,
+        max_pending: int = 64,
+    ):
+        self.context = context
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="password-hasher",
+        )
+        # Metrics; `running` and wait time are updated from worker threads
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.running = 0
+        self.peak_pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+    
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise RateLimitError("Too many password operations in progress, try again")
+        
+        self.pending += 1
+        self.peak_pending = max(self.peak_pending, self.pending)
+        queued_at = time.perf_counter()
+        
+        def job():
+            with self._lock:
+                self.total_wait_seconds += time.perf_counter() - queued_at
+                self.running += 1
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self.running -= 1
+        
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, job)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+    
+    async def hash(self, password: str) -> str:
+        """Hash a password with the configured scheme."""
+        return await self._run(self.context.hash, password)
+    
+    async def verify(self, password: str, hashed: str) -> bool:
+        """Check a password against a stored hash."""
+        if not hashed:
+            return False
+        return await self._run(self.context.verify, password, hashed)
+    
+    async def verify_and_update(
+        self,
+        password: str,
+        hashed: str,
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password and return a replacement hash if the stored one
+        uses an outdated scheme or cost; the new hash is None otherwise.
+        """
+        if not hashed:
+            return False, None
+        return await self._run(self.context.verify_and_update, password, hashed)
+    
+    def stats(self) -> dict:
+        """Queue depth and throughput counters."""
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "queued": max(self.pending - self.running, 0),
+            "running": self.running,
+            "peak_pending": self.peak_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": (
+                self.total_wait_seconds / self.completed * 1000 if self.completed else 0.0
+            ),
+        }
+    
+    def shutdown(self) -> None:
+        """Stop the worker threads."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Process-wide hasher
+password_hasher: Optional[PasswordHasher] = None
+
+register_stats(
+    "password_hasher",
+    lambda: password_hasher.stats() if password_hasher is not None else None,
+    gauges=("pending", "running", "queued"),
+    counters=("completed", "rejected"),
+)
+
+
+def get_password_hasher() -> PasswordHasher:
+    """Get the process-wide password hasher, creating it on first use."""
+    global password_hasher
+    if password_hasher is None:
+        password_hasher = PasswordHasher(
+            build_crypt_context(
+                scheme=settings.password_hash_scheme,
+                bcrypt_rounds=settings.password_bcrypt_rounds,
+                argon2_time_cost=settings.password_argon2_time_cost,
+                argon2_memory_cost=settings.password_argon2_memory_cost,
+                argon2_parallelism=settings.password_argon2_parallelism,
+            ),
+            max_workers=settings.password_hash_workers,
+            max_pending=settings.password_hash_max_pending,
+        )
+    return password_hasher
+
+
+def close_password_hasher() -> None:
+    """Release the hasher's threads."""
+    global password_hasher
+    if password_hasher is not None:
+        password_hasher.shutdown()
+        password_hasher = None
+{%- else %}
+"""Password hasher placeholder (built-in JWT auth not enabled)."""
+{%- endif %}
@@ -0,0 +1,162 @@
+"""
+Principal Cache - authenticated users without a DB hit per request.
+
+Two tiers:
+- an in-process LRU with a short TTL (bounds how stale a principal can be
+  in *other* processes after a change)
+- an optional shared tier behind the CacheRepository port (Redis)
+
+UserService invalidates both tiers whenever a user is updated, suspended,
+activated, deleted or changes password - immediately, and again once the
+unit of work commits, so a request that read the old row in between
+cannot keep it cached.
+"""
+import copy
+import json
+import logging
+from dataclasses import fields
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+from uuid import UUID
+
+from internal.entities.user import User, UserRole, UserStatus
+{%- if cookiecutter.use_redis == 'yes' %}
+from internal.ports.repositories import CacheRepository
+{%- endif %}
+from pkg.cache import TTLCache
+from pkg.config.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+# Never leaves the process: principals don't need it and Redis shouldn't hold it
+_PRIVATE_FIELDS = {"hashed_password"}
+
+
+def _dump(user: User) -> str:
+    data = {}
+    for f in fields(user):
+        if f.name in _PRIVATE_FIELDS:
+            continue
+        value = getattr(user, f.name)
+        if isinstance(value, UUID):
+            value = str(value)
+        elif isinstance(value, Enum):
+            value = value.value
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        data[f.name] = value
+    return json.dumps(data)
+
+
+def _load(raw: str) -> User:
+    data = json.loads(raw)
+    data["id"] = UUID(data["id"])
+    data["role"] = UserRole(data["role"])
+    data["status"] = UserStatus(data["status"])
+    for name in ("created_at", "updated_at"):
+        if data.get(name):
+            data[name] = datetime.fromisoformat(data[name])
+    user = User(**data)
+    user.mark_clean()
+    return user
+
+
+def _fresh_copy(user: User) -> User:
+    # Callers may mutate what they get back; never hand out the cached object
+    user = copy.copy(user)
+    user.mark_clean()
+    return user
+
+
+class PrincipalCache:
+    """Read-through cache of authenticated users, keyed by user id."""
+    
+    key_prefix = "principal:"
+    
+    def __init__(
+        self,
+        local_ttl_seconds: float = 30,
+        max_size: int = 10_000,
+        {%- if cookiecutter.use_redis == 'yes' %}
+        shared: Optional[CacheRepository] = None,
+        {%- else %}
+        shared: Optional[object] = None,
+        {%- endif %}
+        shared_ttl_seconds: int = 300,
+    ):
+        self.local = TTLCache(max_size=max_size, ttl_seconds=local_ttl_seconds)
+        self.shared = shared
+        self.shared_ttl_seconds = shared_ttl_seconds
+    
+    async def get(self, user_id: UUID) -> Optional[User]:
+        """Return a copy of the cached user, or None on a miss."""
+        user = self.local.get(user_id)
+        if user is not None:
+            return _fresh_copy(user)
+        
+        if self.shared is None:
+            return None
+        try:
+            raw = await self.shared.get(f"{self.key_prefix}{user_id}")
+        except Exception as e:
+            # A cache outage must not take authentication down with it
+            logger.warning("Principal cache read failed: %s", e)
+            return None
+        if raw is None:
+            return None
+        user = _load(raw)
+        self.local.set(user_id, user)
+        return _fresh_copy(user)
+    
+    async def set(self, user: User) -> None:
+        """Cache a user loaded from the repository."""
+        self.local.set(user.id, _fresh_copy(user))
+        if self.shared is None:
+            return
+        try:
+            await self.shared.set(
+                f"{self.key_prefix}{user.id}",
+                _dump(user),
+                expire_seconds=self.shared_ttl_seconds,
+            )
+        except Exception as e:
+            logger.warning("Principal cache write failed: %s", e)
+    
+    async def invalidate(self, user_id: UUID) -> None:
+        """Drop a user from both tiers."""
+        self.local.delete(user_id)
+        if self.shared is None:
+            return
+        try:
+            await self.shared.delete(f"{self.key_prefix}{user_id}")
+        except Exception as e:
+            logger.warning("Principal cache invalidation failed: %s", e)
+
+
+# Process-wide cache
+principal_cache: Optional[PrincipalCache] = None
+
+
+def get_principal_cache() -> PrincipalCache:
+    """Get the process-wide principal cache, creating it on first use."""
+    global principal_cache
+    if principal_cache is None:
+        shared = None
+        {%- if cookiecutter.use_redis == 'yes' %}
+        if settings.principal_cache_use_redis:
+            from internal.adapters.cache.redis_cache import RedisCacheRepository
+            try:
+                shared = RedisCacheRepository()
+            except RuntimeError:
+                # Redis not initialized (scripts, tests): local tier only
+                shared = None
+        {%- endif %}
+        principal_cache = PrincipalCache(
+            local_ttl_seconds=settings.principal_cache_ttl_seconds,
+            max_size=settings.principal_cache_max_size,
+            shared=shared,
+            shared_ttl_seconds=settings.principal_cache_redis_ttl_seconds,
+        )
+    return principal_cache
@@ -2,22 +2,47 @@
 User Service - Business logic and use cases.
 This layer orchestrates domain operations.
 """
-from typing import List, Optional
+import base64
+import json
+from datetime import datetime
+from typing import Awaitable, Callable, Iterable, List, Optional, Tuple
 from uuid import UUID
-{%- if cookiecutter.auth_strategy == 'jwt_builtin' %}
-from passlib.context import CryptContext
-{%- endif %}
 
 from internal.entities.user import User, UserStatus, UserRole
 from internal.ports.repositories import UserRepository
 from internal.dto.requests import CreateUserRequest, UpdateUserRequest
+from internal.services.principal_cache import PrincipalCache
+{%- if cookiecutter.auth_strategy == 'jwt_builtin' %}
+from internal.services.password_hasher import PasswordHasher, get_password_hasher
+{%- endif %}
 from pkg.errors.exceptions import NotFoundError, ConflictError, ValidationError
 
 
-{%- if cookiecutter.auth_strategy == 'jwt_builtin' %}
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-{%- endif %}
+def pick_username(base: str, taken: Iterable[str]) -> str:
+    """`base`, or `base` followed by the smallest number not in `taken`."""
+    taken = set(taken)
+    if base not in taken:
+        return base
+    counter = 1
+    while f"{base}{counter}" in taken:
+        counter += 1
+    return f"{base}{counter}"
+
+
+def encode_cursor(user: User) -> str:
+    """Build an opaque pagination cursor pointing just after `user`."""
+    raw = json.dumps([user.created_at.isoformat(), str(user.id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode a cursor produced by `encode_cursor`."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, user_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), UUID(user_id)
+    except (ValueError, TypeError):
+        raise ValidationError("Invalid pagination cursor")
 
 
 class UserService:
@@ -30,8 +55,34 @@ class UserService:
     - Never knows about HTTP or database details
     """
     
-    def __init__(self, user_repo: UserRepository):
+    # Usernames tried when concurrent signups keep taking the chosen one
+    USERNAME_ATTEMPTS = 5
+    
+    def __init__(
+        self,
+        user_repo: UserRepository,
+        principal_cache: Optional[PrincipalCache] = None,
+        after_commit: Optional[Callable[[Callable[[], Awaitable[None]]], None]] = None,
+        {%- if cookiecutter.auth_strategy == 'jwt_builtin' %}
+        password_hasher: Optional[PasswordHasher] = None,
+        {%- endif %}
+    ):
         self.user_repo = user_repo
+        self.principal_cache = principal_cache
+        self.after_commit = after_commit
+        {%- if cookiecutter.auth_strategy == 'jwt_builtin' %}
+        self.password_hasher = password_hasher or get_password_hasher()
+        {%- endif %}
+    
+    async def _invalidate_principal(self, user_id: UUID) -> None:
+        if self.principal_cache is None:
+            return
+        await self.principal_cache.invalidate(user_id)
+        if self.after_commit is not None:
+            # A concurrent request may re-cache the old row until the change
+            # commits; drop it again once the change is visible
+            cache = self.principal_cache
+            self.after_commit(lambda: cache.invalidate(user_id))
     
     async def create_user(self, request: CreateUserRequest) -> User:
         """
@@ -39,17 +90,6 @@ class UserService:
         
         Use case: User registration
         """
-        # Check if email already exists
-        existing = await self.user_repo.get_by_email(request.email)
-        if existing:
-            raise ConflictError("User with this email already exists")
-        
-        # Check if username already exists
-        if request.username:
-            existing = await self.user_repo.get_by_username(request.username)
-            if existing:
-                raise ConflictError("Username already taken")
-        
         # Create domain entity
         user = User(
             email=request.email,
@@ -57,13 +97,21 @@ class UserService:
             first_name=request.first_name or "",
             last_name=request.last_name or "",
             {%- if cookiecutter.auth_strategy == 'jwt_builtin' %}
-            hashed_password=pwd_context.hash(request.password),
+            hashed_password=await self.password_hasher.hash(request.password),
             {%- endif %}
             role=UserRole.USER,
             status=UserStatus.PENDING,
         )
         
-        return await self.user_repo.create(user)
+        # No availability pre-checks: the unique constraints decide, in the
+        # insert itself, which also settles concurrent registrations
+        try:
+            return await self.user_repo.create(user)
+        except ConflictError:
+            # Conflicts are rare; only then find out which field clashed
+            if await self.user_repo.get_by_email(request.email):
+                raise ConflictError("User with this email already exists")
+            raise ConflictError("Username already taken")
     
     {%- if cookiecutter.auth_strategy == 'jwt_builtin' %}
     async def create_user_from_google(
@@ -81,29 +129,35 @@ class UserService:
         """
         import secrets
         
-        # Generate unique username from email
-        base_username = email.split("@")[0]
-        username = base_username
-        counter = 1
+        base_username = email.split("@")[0].lower()
+        # Random password (they'll use OAuth to login); only the username
+        # changes between attempts, so hash it once
+        hashed_password = await self.password_hasher.hash(secrets.token_urlsafe(32))
         
-        while await self.user_repo.get_by_username(username):
-            username = f"{base_username}{counter}"
-            counter += 1
+        for _ in range(self.USERNAME_ATTEMPTS):
+            # One query for every taken "<base>[digits]" name; pick a free one in memory
+            taken = await self.user_repo.list_numbered_usernames(base_username)
+            user = User(
+                email=email,
+                username=pick_username(base_username, taken),
+                first_name=first_name,
+                last_name=last_name,
+                hashed_password=hashed_password,
+                role=UserRole.USER,
+                status=UserStatus.ACTIVE,  # Auto-active for OAuth users
+                is_verified=True,  # Google already verified email
+                avatar_url=avatar_url,
+            )
+            try:
+                return await self.user_repo.create(user)
+            except ConflictError:
+                # Lost a race: either the same account signed up concurrently
+                # or another signup took the username - then try the next one
+                existing = await self.user_repo.get_by_email(email)
+                if existing:
+                    return existing
         
-        # Create user with random password (they'll use OAuth to login)
-        user = User(
-            email=email,
-            username=username,
-            first_name=first_name,
-            last_name=last_name,
-            hashed_password=pwd_context.hash(secrets.token_urlsafe(32)),
-            role=UserRole.USER,
-            status=UserStatus.ACTIVE,  # Auto-active for OAuth users
-            is_verified=True,  # Google already verified email
-            avatar_url=avatar_url,
-        )
-        
-        return await self.user_repo.create(user)
+        raise ConflictError("Could not allocate a username, please retry")
     {%- endif %}
     
     async def get_user(self, user_id: UUID) -> User:
@@ -117,6 +171,22 @@ class UserService:
             raise NotFoundError("User", user_id)
         return user
     
+    async def get_principal(self, user_id: UUID) -> User:
+        """
+        Get the user behind an access token.
+        
+        Use case: Authenticating a request
+        Served from the principal cache when one is configured.
+        """
+        if self.principal_cache is None:
+            return await self.get_user(user_id)
+        
+        user = await self.principal_cache.get(user_id)
+        if user is None:
+            user = await self.get_user(user_id)
+            await self.principal_cache.set(user)
+        return user
+    
     async def get_user_by_email(self, email: str) -> Optional[User]:
         """
         Get a user by email.
@@ -152,7 +222,9 @@ class UserService:
             user.avatar_url = request.avatar_url
         
         user.touch()
-        return await self.user_repo.update(user)
+        user = await self.user_repo.update(user)
+        await self._invalidate_principal(user_id)
+        return user
     
     async def delete_user(self, user_id: UUID) -> bool:
         """
@@ -163,7 +235,9 @@ class UserService:
         user = await self.get_user(user_id)
         if user.role == UserRole.SUPER_ADMIN:
             raise ValidationError("Cannot delete super admin")
-        return await self.user_repo.delete(user_id)
+        deleted = await self.user_repo.delete(user_id)
+        await self._invalidate_principal(user_id)
+        return deleted
     
     async def list_users(
         self,
@@ -177,6 +251,35 @@ class UserService:
         """
         return await self.user_repo.list_all(skip=skip, limit=limit)
     
+    async def list_users_page(
+        self,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[User], Optional[str]]:
+        """
+        List users with keyset pagination.
+        
+        Use case: Admin user management on large tables
+        Returns the page and the cursor of the next page (None on the last page).
+        """
+        after = decode_cursor(cursor) if cursor else None
+        users = await self.user_repo.list_page(limit=limit + 1, after=after)
+        
+        if len(users) <= limit:
+            return users, None
+        users = users[:limit]
+        return users, encode_cursor(users[-1])
+    
+    async def count_users(self, exact: bool = False) -> int:
+        """
+        Count users.
+        
+        The exact count scans the whole table; the default estimate is O(1).
+        """
+        if exact:
+            return await self.user_repo.count()
+        return await self.user_repo.estimate_count()
+    
     async def activate_user(self, user_id: UUID) -> User:
         """
         Activate a user account.
@@ -185,7 +288,9 @@ class UserService:
         """
         user = await self.get_user(user_id)
         user.activate()
-        return await self.user_repo.update(user)
+        user = await self.user_repo.update(user)
+        await self._invalidate_principal(user_id)
+        return user
     
     async def suspend_user(self, user_id: UUID) -> User:
         """
@@ -197,12 +302,24 @@ class UserService:
         if user.role == UserRole.SUPER_ADMIN:
             raise ValidationError("Cannot suspend super admin")
         user.suspend()
-        return await self.user_repo.update(user)
+        user = await self.user_repo.update(user)
+        await self._invalidate_principal(user_id)
+        return user
     
     {%- if cookiecutter.auth_strategy == 'jwt_builtin' %}
     async def verify_password(self, user: User, password: str) -> bool:
-        """Verify user's password."""
-        return pwd_context.verify(password, user.hashed_password)
+        """
+        Verify user's password.
+        
+        Hashes made with an outdated scheme or cost are upgraded in place.
+        """
+        valid, new_hash = await self.password_hasher.verify_and_update(
+            password, user.hashed_password
+        )
+        if valid and new_hash:
+            user.hashed_password = new_hash
+            await self.user_repo.update(user)
+        return valid
     
     async def change_password(
         self,
@@ -217,13 +334,15 @@ class UserService:
         """
         user = await self.get_user(user_id)
         
-        if not await self.verify_password(user, current_password):
+        if not await self.password_hasher.verify(current_password, user.hashed_password):
             raise ValidationError("Current password is incorrect")
         
         if len(new_password) < 8:
             raise ValidationError("Password must be at least 8 characters")
         
-        user.hashed_password = pwd_context.hash(new_password)
+        user.hashed_password = await self.password_hasher.hash(new_password)
         user.touch()
-        return await self.user_repo.update(user)
+        user = await self.user_repo.update(user)
+        await self._invalidate_principal(user_id)
+        return user
     {%- endif %}
@@ -10,15 +10,20 @@
 from internal.workers.workflows import (
     EmailNotificationWorkflow,
     DataProcessingWorkflow,
+    DataProcessingOptions,
     ScheduledReportWorkflow,
 )
 from internal.workers.activities import (
     send_email_activity,
     process_data_activity,
+    process_batch_activity,
+    fetch_items_activity,
     generate_report_activity,
     upload_to_s3_activity,
     SendEmailInput,
     ProcessDataInput,
+    ProcessBatchInput,
+    FetchItemsInput,
     GenerateReportInput,
     UploadToS3Input,
 )
@@ -27,15 +32,20 @@ __all__ = [
     # Workflows
     "EmailNotificationWorkflow",
     "DataProcessingWorkflow",
+    "DataProcessingOptions",
     "ScheduledReportWorkflow",
     # Activities
     "send_email_activity",
     "process_data_activity",
+    "process_batch_activity",
+    "fetch_items_activity",
     "generate_report_activity",
     "upload_to_s3_activity",
     # Input types
     "SendEmailInput",
     "ProcessDataInput",
+    "ProcessBatchInput",
+    "FetchItemsInput",
     "GenerateReportInput",
     "UploadToS3Input",
 ]
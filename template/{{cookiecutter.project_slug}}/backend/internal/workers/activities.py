@@ -12,7 +12,7 @@
 import logging
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from temporalio import activity
 
@@ -39,6 +39,21 @@ class ProcessDataInput:
     options: Optional[dict] = None
 
 
+@dataclass
+class ProcessBatchInput:
+    """Input for process_batch_activity."""
+    items: List[str]
+    options: Optional[dict] = None
+
+
+@dataclass
+class FetchItemsInput:
+    """Input for fetch_items_activity."""
+    source: str
+    offset: int
+    limit: int
+
+
 @dataclass
 class GenerateReportInput:
     """Input for generate_report_activity."""
@@ -81,6 +96,23 @@ async def send_email_activity(input: SendEmailInput) -> bool:
     return True
 
 
+def _process_item(data: str, options: Optional[dict] = None) -> dict:
+    """Processing logic shared by the single-item and batch activities."""
+    logger.info(f"Processing data: {data[:50]}...")
+    
+    # TODO: Implement actual processing logic
+    # - Parse data
+    # - Transform
+    # - Validate
+    # - Store results
+    
+    return {
+        "input": data,
+        "processed_at": datetime.utcnow().isoformat(),
+        "status": "completed",
+    }
+
+
 @activity.defn
 async def process_data_activity(input: ProcessDataInput) -> dict:
     """
@@ -89,27 +121,58 @@ async def process_data_activity(input: ProcessDataInput) -> dict:
     This is an example of a generic data processing activity.
     For long-running operations, use heartbeats.
     """
-    logger.info(f"Processing data: {input.data[:50]}...")
-    
     # Report heartbeat for long operations
     activity.heartbeat(f"Processing: {input.data[:20]}")
     
-    # TODO: Implement actual processing logic
-    # - Parse data
-    # - Transform
-    # - Validate
-    # - Store results
-    
-    result = {
-        "input": input.data,
-        "processed_at": datetime.utcnow().isoformat(),
-        "status": "completed",
-    }
+    result = _process_item(input.data, input.options)
     
     logger.info(f"Data processed successfully")
     return result
 
 
+@activity.defn
+async def process_batch_activity(input: ProcessBatchInput) -> List[dict]:
+    """
+    Process a group of data items in one activity.
+    
+    One activity per batch instead of per item cuts the scheduling
+    round-trips and workflow history by the batch size. Progress is
+    heartbeated after every item, so a retry resumes where the last
+    attempt stopped instead of reprocessing the whole batch.
+    """
+    results: List[dict] = []
+    details = activity.info().heartbeat_details
+    if details:
+        results = list(details[0])
+        logger.info(f"Resuming batch at item {len(results)}/{len(input.items)}")
+    
+    for data in input.items[len(results):]:
+        results.append(_process_item(data, input.options))
+        activity.heartbeat(results)
+    
+    logger.info(f"Batch of {len(input.items)} items processed successfully")
+    return results
+
+
+@activity.defn
+async def fetch_items_activity(input: FetchItemsInput) -> List[str]:
+    """
+    Read one page of items for DataProcessingWorkflow.
+    
+    Lets very large jobs keep the items out of workflow history: the
+    workflow only carries `source` and an offset. Return fewer than
+    `limit` items once the source is exhausted.
+    """
+    logger.info(f"Fetching items {input.offset}..{input.offset + input.limit} from {input.source}")
+    
+    # TODO: Read from the actual source
+    # - Database: SELECT id FROM ... ORDER BY id OFFSET :offset LIMIT :limit
+    #   (or keyset on the last id for big tables)
+    # - Object storage: one line per item in s3://bucket/key
+    
+    return []
+
+
 @activity.defn
 async def generate_report_activity(input: GenerateReportInput) -> dict:
     """
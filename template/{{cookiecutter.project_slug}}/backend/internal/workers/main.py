@@ -21,6 +21,8 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from temporalio.client import Client
 from temporalio.worker import Worker
 
+from pkg.config.settings import settings
+
 from internal.workers.workflows import (
     EmailNotificationWorkflow,
     DataProcessingWorkflow,
@@ -29,6 +31,8 @@ from internal.workers.workflows import (
 from internal.workers.activities import (
     send_email_activity,
     process_data_activity,
+    process_batch_activity,
+    fetch_items_activity,
     generate_report_activity,
     upload_to_s3_activity,
 )
@@ -46,8 +50,16 @@ async def main():
     
     logger.info(f"Connecting to Temporal at {host}")
     
+    # Trace workflows and activities, continuing the caller's trace
+    interceptors = []
+    if settings.tracing_enabled:
+        from temporalio.contrib.opentelemetry import TracingInterceptor
+        from pkg.tracing import setup_tracing
+        setup_tracing()
+        interceptors.append(TracingInterceptor())
+    
     # Connect to Temporal
-    client = await Client.connect(host, namespace=namespace)
+    client = await Client.connect(host, namespace=namespace, interceptors=interceptors)
     
     logger.info(f"Starting worker on task queue: {task_queue}")
     
@@ -63,6 +75,8 @@ async def main():
         activities=[
             send_email_activity,
             process_data_activity,
+            process_batch_activity,
+            fetch_items_activity,
             generate_report_activity,
             upload_to_s3_activity,
         ],
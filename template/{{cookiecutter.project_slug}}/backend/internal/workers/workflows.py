@@ -9,6 +9,8 @@
 # - Use workflow.execute_activity() to call activities
 # - Workflows should be deterministic (no random, no datetime.now())
 
+import asyncio
+from dataclasses import dataclass
 from datetime import timedelta
 from typing import List, Optional
 
@@ -18,7 +20,8 @@ from temporalio import workflow
 with workflow.unsafe.imports_passed_through():
     from internal.workers.activities import (
         SendEmailInput,
-        ProcessDataInput,
+        ProcessBatchInput,
+        FetchItemsInput,
         GenerateReportInput,
         UploadToS3Input,
     )
@@ -53,15 +56,52 @@ class EmailNotificationWorkflow:
         )
 
 
+@dataclass
+class DataProcessingOptions:
+    """Tuning for DataProcessingWorkflow."""
+    # Batch activities in flight at once
+    max_concurrency: int = 10
+    # Items per process_batch_activity call
+    batch_size: int = 50
+    # Continue-as-new after this many items to keep history bounded
+    items_per_run: int = 5000
+    # Passed through to every item
+    item_options: Optional[dict] = None
+    # Read items a page at a time from here (see fetch_items_activity)
+    # instead of passing them in; required for very large inputs
+    source: Optional[str] = None
+
+
 @workflow.defn
 class DataProcessingWorkflow:
     """
     Process data in batches with progress tracking.
     
     This workflow demonstrates:
-    - Batch processing
+    - Batch processing (several items per activity)
+    - Bounded fan-out (a sliding window of activities in flight)
+    - continue_as_new so very large inputs keep a bounded history
     - Progress updates via queries
-    - Child activities
+    
+    Usage:
+        result = await client.execute_workflow(
+            DataProcessingWorkflow.run,
+            args=[items, DataProcessingOptions(max_concurrency=20)],
+            id="process-123",
+            task_queue="tasks",
+        )
+    
+    Items passed in travel in the workflow's input, and each continued
+    run receives the ones still left, so inline inputs are capped by
+    Temporal's payload limit (2 MB per payload by default) - a few tens
+    of thousands of short strings. For anything larger pass
+    DataProcessingOptions(source=...) and an empty list: each run then
+    fetches its page with fetch_items_activity and continues as new with
+    just the offset.
+    
+    Per-item results are returned when the input fits in one run
+    (items_per_run); larger jobs return an empty results list, so store
+    per-item output from the activity rather than in workflow history.
     """
     
     def __init__(self):
@@ -70,7 +110,7 @@ class DataProcessingWorkflow:
     
     @workflow.query
     def get_progress(self) -> dict:
-        """Return current progress."""
+        """Return current progress (across continued runs)."""
         return {
             "progress": self._progress,
             "total": self._total,
@@ -78,24 +118,53 @@ class DataProcessingWorkflow:
         }
     
     @workflow.run
-    async def run(self, items: List[str]) -> dict:
-        """Process items in batches."""
-        self._total = len(items)
-        results = []
+    async def run(
+        self,
+        items: List[str],
+        options: Optional[DataProcessingOptions] = None,
+        processed: int = 0,
+    ) -> dict:
+        """Process items in batches; `processed` is carried over by continue_as_new."""
+        options = options or DataProcessingOptions()
+        self._progress = processed
         
-        for i, item in enumerate(items):
-            # Process each item
-            result = await workflow.execute_activity(
-                "process_data_activity",
-                ProcessDataInput(data=item),
+        if options.source is not None:
+            # Total is unknown up front; it grows a page at a time
+            chunk = await workflow.execute_activity(
+                "fetch_items_activity",
+                FetchItemsInput(source=options.source, offset=processed, limit=options.items_per_run),
                 start_to_close_timeout=timedelta(minutes=5),
             )
-            results.append(result)
-            self._progress = i + 1
+            remaining: Optional[List[str]] = [] if len(chunk) == options.items_per_run else None
+            self._total = processed + len(chunk)
+        else:
+            chunk = items[:options.items_per_run]
+            remaining = items[len(chunk):] or None
+            self._total = processed + len(items)
+        
+        size = max(options.batch_size, 1)
+        batches = [chunk[i:i + size] for i in range(0, len(chunk), size)]
+        results: List[Optional[List[dict]]] = [None] * len(batches)
+        window = asyncio.Semaphore(max(options.max_concurrency, 1))
+        
+        async def process(index: int, batch: List[str]) -> None:
+            async with window:
+                results[index] = await workflow.execute_activity(
+                    "process_batch_activity",
+                    ProcessBatchInput(items=batch, options=options.item_options),
+                    start_to_close_timeout=timedelta(minutes=5) * len(batch),
+                    heartbeat_timeout=timedelta(minutes=5),
+                )
+            self._progress += len(batch)
+        
+        await asyncio.gather(*(process(i, batch) for i, batch in enumerate(batches)))
+        
+        if remaining is not None:
+            workflow.continue_as_new(args=[remaining, options, self._progress])
         
         return {
-            "processed": len(results),
-            "results": results,
+            "processed": self._progress,
+            "results": [r for batch in results for r in batch] if processed == 0 else [],
         }
 
 
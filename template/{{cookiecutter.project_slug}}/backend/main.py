@@ -4,13 +4,17 @@ FastAPI application with Lich Architecture
 """
 import uvicorn
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 {%- if cookiecutter.use_structured_logging == 'yes' %}
 from pkg.logger.setup import setup_logging, get_logger
 {%- endif %}
 from pkg.config.settings import settings
+from pkg.errors.exceptions import AppException
+from pkg.metrics import close_metrics, init_metrics, render_metrics
 from api.http import router as api_router
+from api.http.responses import ORJSONResponse
 
 
 @asynccontextmanager
@@ -30,13 +34,50 @@ async def lifespan(app: FastAPI):
     
     {%- if cookiecutter.use_redis == 'yes' %}
     # Initialize Redis connection
-    from internal.adapters.cache.redis_cache import init_redis
+    from internal.adapters.cache.redis_cache import init_redis, close_redis
     await init_redis()
+    if settings.near_cache_enabled:
+        from internal.adapters.cache.near_cache import init_near_cache, close_near_cache
+        await init_near_cache()
     {%- endif %}
     
+    {%- if cookiecutter.auth_strategy == 'keycloak' %}
+    # Load Keycloak signing keys and keep them refreshed
+    from internal.adapters.auth.jwks import init_jwks, close_jwks
+    await init_jwks()
+    {%- endif %}
+    
+    if settings.metrics_enabled:
+        init_metrics(settings.metrics_sample_interval_seconds)
+    
+    if settings.tracing_enabled:
+        from pkg.tracing import setup_tracing
+        setup_tracing()
+    
     yield
     
     # Cleanup
+    await close_metrics()
+    # Flush audit entries still queued (no-op unless AuditMiddleware persists)
+    from internal.services.audit_sink import close_audit_sink
+    await close_audit_sink()
+    {%- if cookiecutter.use_redis == 'yes' %}
+    if settings.near_cache_enabled:
+        await close_near_cache()
+    await close_redis()
+    {%- endif %}
+    from internal.adapters.db.connection import close_db
+    await close_db()
+    {%- if cookiecutter.auth_strategy == 'jwt_builtin' %}
+    from internal.services.password_hasher import close_password_hasher
+    close_password_hasher()
+    {%- endif %}
+    {%- if cookiecutter.auth_strategy == 'keycloak' %}
+    await close_jwks()
+    {%- endif %}
+    if settings.tracing_enabled:
+        from pkg.tracing import shutdown_tracing
+        shutdown_tracing()
     {%- if cookiecutter.use_structured_logging == 'yes' %}
     logger.info("Shutting down {{ cookiecutter.project_name }} API")
     {%- else %}
@@ -52,6 +93,7 @@ app = FastAPI(
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS Middleware
@@ -63,6 +105,34 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Prometheus request metrics, served at /metrics
+if settings.metrics_enabled:
+    from api.middleware.metrics import MetricsMiddleware
+    app.add_middleware(MetricsMiddleware, exclude_paths=("/metrics", "/health"))
+{%- if cookiecutter.database == 'postgresql' %}
+
+# Per-request query counts (Server-Timing + metrics) and N+1 warnings
+if settings.db_query_stats_enabled:
+    from api.middleware.query_stats import QueryStatsMiddleware
+    app.add_middleware(QueryStatsMiddleware, exclude_paths=("/metrics", "/health"))
+{%- endif %}
+
+# Sampling profiler for signed (`lich profile`) or sampled requests
+if settings.profiling_secret or settings.profiling_sample_rate:
+    from api.middleware.profiling import ProfilingMiddleware
+    app.add_middleware(
+        ProfilingMiddleware,
+        secret=settings.profiling_secret,
+        sample_rate=settings.profiling_sample_rate,
+        output_dir=settings.profiling_output_dir,
+        max_reports=settings.profiling_max_reports,
+    )
+
+# OpenTelemetry request spans (exported once the lifespan calls setup_tracing)
+if settings.tracing_enabled:
+    from pkg.tracing import instrument_app
+    instrument_app(app)
+
 # ============================================================
 # OPTIONAL MIDDLEWARES - Uncomment to enable
 # ============================================================
@@ -101,6 +171,12 @@ app.add_middleware(
 app.include_router(api_router, prefix="/api")
 
 
+@app.exception_handler(AppException)
+async def app_exception_handler(request: Request, exc: AppException):
+    """Render domain errors with their own status code."""
+    return JSONResponse(status_code=exc.status_code, content=exc.to_dict())
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -113,6 +189,15 @@ async def api_health_check():
     return {"status": "healthy", "service": "{{ cookiecutter.project_slug }}-api"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics (all workers when PROMETHEUS_MULTIPROC_DIR is set)."""
+    if not settings.metrics_enabled:
+        return Response(status_code=404)
+    content, media_type = render_metrics()
+    return Response(content=content, media_type=media_type)
+
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
@@ -0,0 +1,5 @@
+"""Cache package - in-process caching primitives and typed cache-aside."""
+from .lru import TTLCache
+from .typed import MemoryCacheBackend, TypedCache, cached
+
+__all__ = ["TTLCache", "MemoryCacheBackend", "TypedCache", "cached"]
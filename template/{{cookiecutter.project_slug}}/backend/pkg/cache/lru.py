@@ -0,0 +1,67 @@
+"""
+In-process LRU cache with per-entry TTL.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, List, Optional
+
+
+class TTLCache:
+    """
+    Bounded LRU mapping whose entries expire after `ttl_seconds`.
+    
+    Not thread-safe; meant for use from a single event loop.
+    """
+    
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl_seconds: float = 60,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._data[key] = (self._clock() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+    
+    def delete(self, key: Hashable) -> bool:
+        """Remove a key; returns whether it was present."""
+        return self._data.pop(key, None) is not None
+    
+    def clear(self) -> None:
+        self._data.clear()
+    
+    def keys(self) -> List[Hashable]:
+        """Keys currently stored, including expired entries not yet evicted."""
+        return list(self._data)
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not None
@@ -0,0 +1,328 @@
+"""
+Typed cache-aside with stampede protection.
+
+    @cached(key="users:count:{exact}", ttl=60, cache=get_typed_cache)
+    async def count_users(self, exact: bool = False) -> int:
+        ...
+
+Values are stored as orjson envelopes - {"v": value, "d": load seconds,
+"e": expiry timestamp} - in any string store with the CacheRepository
+interface (get/set/delete), and validated back into the function's return
+annotation with pydantic, so callers get a User, not a dict.
+
+When a hot key expires, three things keep the loader from running once
+per waiting request:
+- single-flight: concurrent misses for one key in this process share a
+  single load
+- XFetch (probabilistic early expiration): a read recomputes early with a
+  probability that grows as expiry nears and with how slow the load is,
+  so usually one request refreshes the key before it expires at all
+- an optional Redis lock (lock=True): one load across all workers; the
+  others serve the stale value or wait briefly for the new one
+"""
+import asyncio
+import functools
+import inspect
+import logging
+import math
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar, Union, get_type_hints
+from uuid import uuid4
+
+import orjson
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from .lru import TTLCache
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Distinguishes "not cached" from a cached None
+_MISSING: Any = object()
+
+# Delete the lock only if we still hold it (it may have timed out and been
+# taken by another worker)
+_RELEASE_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def _default(value: Any) -> Any:
+    # orjson handles dataclasses, UUID, datetime and Enum itself
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not cacheable: {type(value).__name__}")
+
+
+@functools.lru_cache(maxsize=None)
+def _adapter(type_: Any) -> TypeAdapter:
+    return TypeAdapter(type_)
+
+
+class MemoryCacheBackend:
+    """In-process store with the CacheRepository interface, for projects without Redis."""
+
+    def __init__(self, max_size: int = 10_000):
+        self._cache = TTLCache(max_size=max_size)
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: str, expire_seconds: Optional[int] = None) -> bool:
+        self._cache.set(key, value, ttl_seconds=expire_seconds or math.inf)
+        return True
+
+    async def delete(self, key: str) -> bool:
+        return self._cache.delete(key)
+
+    async def exists(self, key: str) -> bool:
+        return key in self._cache
+
+
+class TypedCache:
+    """
+    Cache-aside over a string store.
+
+    `lock_client` is a redis.asyncio client used for the cross-worker lock;
+    without it lock=True only coalesces within the process. `beta` scales
+    XFetch: 0 disables early refresh, above 1 refreshes earlier.
+    """
+
+    def __init__(
+        self,
+        backend,
+        lock_client=None,
+        beta: float = 1.0,
+        lock_timeout_seconds: float = 10.0,
+        lock_wait_seconds: float = 2.0,
+        prefix: str = "cache:",
+        clock: Callable[[], float] = time.time,
+    ):
+        self.backend = backend
+        self.lock_client = lock_client
+        self.beta = beta
+        self.lock_timeout_seconds = lock_timeout_seconds
+        self.lock_wait_seconds = lock_wait_seconds
+        self.prefix = prefix
+        self._clock = clock
+        self._release = lock_client.register_script(_RELEASE_LUA) if lock_client is not None else None
+        # key -> load shared by every caller that missed while it runs
+        self._inflight: Dict[str, "asyncio.Future[Any]"] = {}
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "early_refreshes": 0,
+            "coalesced": 0,
+            "loads": 0,
+            "errors": 0,
+        }
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[T]],
+        ttl: int,
+        type_: Any = Any,
+        lock: bool = False,
+    ) -> T:
+        """Return the cached value for `key`, calling `loader` on a miss."""
+        key = f"{self.prefix}{key}"
+        envelope = await self._read(key)
+        if envelope is not None:
+            value = self._decode(type_, envelope)
+            if value is not _MISSING and not self._refresh_early(envelope):
+                self.stats["hits"] += 1
+                return value
+        else:
+            value = _MISSING
+
+        load = self._inflight.get(key)
+        if load is not None:
+            if value is not _MISSING:
+                # Someone is already refreshing; the current value is still valid
+                self.stats["hits"] += 1
+                return value
+            self.stats["coalesced"] += 1
+        else:
+            self.stats["early_refreshes" if value is not _MISSING else "misses"] += 1
+            load = asyncio.ensure_future(self._load(key, loader, ttl, type_, lock, value))
+            self._inflight[key] = load
+            load.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # A cancelled caller must not cancel the load the others are waiting on
+        return await asyncio.shield(load)
+
+    async def invalidate(self, key: str) -> bool:
+        """Delete a key; the next read loads it again."""
+        try:
+            return await self.backend.delete(f"{self.prefix}{key}")
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning("Cache invalidation failed for %s: %s", key, e)
+            return False
+
+    def _refresh_early(self, envelope: dict) -> bool:
+        # XFetch: now - delta * beta * ln(rand) >= expiry, with rand in (0, 1]
+        jitter = envelope["d"] * self.beta * math.log(1.0 - random.random())
+        return self._clock() - jitter >= envelope["e"]
+
+    async def _load(self, key, loader, ttl, type_, lock, stale):
+        token = None
+        if lock and self.lock_client is not None:
+            token = await self._acquire(key)
+            if token is None:
+                # Another worker is loading this key
+                if stale is not _MISSING:
+                    return stale
+                value = await self._wait_for(key, type_)
+                if value is not _MISSING:
+                    return value
+                # It is taking too long; load it ourselves rather than fail
+        try:
+            started = self._clock()
+            try:
+                value = await loader()
+            except Exception as e:
+                if stale is _MISSING:
+                    raise
+                # An early refresh must not turn a hit into an error; the
+                # current value stays valid until it expires
+                self.stats["errors"] += 1
+                logger.warning("Early refresh failed for %s: %s", key, e)
+                return stale
+            self.stats["loads"] += 1
+            await self._write(key, value, self._clock() - started, ttl)
+            return value
+        finally:
+            if token:
+                await self._unlock(key, token)
+
+    async def _read(self, key: str) -> Optional[dict]:
+        try:
+            raw = await self.backend.get(key)
+        except Exception as e:
+            # A cache outage degrades to calling the loader
+            self.stats["errors"] += 1
+            logger.warning("Cache read failed for %s: %s", key, e)
+            return None
+        if raw is None:
+            return None
+        try:
+            envelope = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            return None
+        if not isinstance(envelope, dict) or not {"v", "d", "e"} <= envelope.keys():
+            return None
+        return envelope
+
+    def _decode(self, type_: Any, envelope: dict) -> Any:
+        if type_ is Any:
+            return envelope["v"]
+        try:
+            return _adapter(type_).validate_python(envelope["v"])
+        except ValidationError:
+            # Written by a deploy with a different return type
+            return _MISSING
+
+    async def _write(self, key: str, value: Any, delta: float, ttl: int) -> None:
+        envelope = {"v": value, "d": round(delta, 4), "e": self._clock() + ttl}
+        try:
+            raw = orjson.dumps(envelope, default=_default).decode()
+            await self.backend.set(key, raw, expire_seconds=ttl)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning("Cache write failed for %s: %s", key, e)
+
+    async def _acquire(self, key: str) -> Optional[str]:
+        """Take the load lock; returns its token, "" if Redis failed, None if held."""
+        token = uuid4().hex
+        try:
+            acquired = await self.lock_client.set(
+                f"{key}:lock", token, nx=True, px=int(self.lock_timeout_seconds * 1000),
+            )
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning("Cache lock failed for %s: %s", key, e)
+            return ""
+        return token if acquired else None
+
+    async def _unlock(self, key: str, token: str) -> None:
+        try:
+            await self._release(keys=[f"{key}:lock"], args=[token])
+        except Exception as e:
+            # The lock expires on its own after lock_timeout_seconds
+            logger.warning("Cache unlock failed for %s: %s", key, e)
+
+    async def _wait_for(self, key: str, type_: Any) -> Any:
+        deadline = self._clock() + self.lock_wait_seconds
+        while self._clock() < deadline:
+            await asyncio.sleep(0.05)
+            envelope = await self._read(key)
+            if envelope is not None:
+                value = self._decode(type_, envelope)
+                if value is not _MISSING:
+                    return value
+        return _MISSING
+
+
+def cached(
+    key: Union[str, Callable[..., str]],
+    ttl: int,
+    cache: Union[TypedCache, Callable[[], TypedCache]],
+    lock: bool = False,
+):
+    """
+    Cache an async function's result.
+
+    `key` is a format string over the function's arguments (defaults
+    included), or a callable taking the same arguments. `cache` may be a
+    callable so the store is resolved on first use, after startup.
+
+    The decorated function gains `key_for(*args, **kwargs)` and
+    `invalidate(*args, **kwargs)`; for methods pass `self` explicitly:
+
+        await UserService.count_users.invalidate(self, exact=True)
+
+    Callers coalesced onto one load receive the same object.
+    """
+    def decorate(func):
+        signature = inspect.signature(func)
+        return_type = None
+
+        def key_for(*args, **kwargs) -> str:
+            if callable(key):
+                return key(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return key.format(**bound.arguments)
+
+        def store() -> TypedCache:
+            return cache if isinstance(cache, TypedCache) else cache()
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            nonlocal return_type
+            if return_type is None:
+                # Resolved lazily: annotations may name classes defined later
+                return_type = get_type_hints(func).get("return", Any)
+            return await store().get_or_load(
+                key_for(*args, **kwargs),
+                lambda: func(*args, **kwargs),
+                ttl,
+                type_=return_type,
+                lock=lock,
+            )
+
+        async def invalidate(*args, **kwargs) -> bool:
+            return await store().invalidate(key_for(*args, **kwargs))
+
+        wrapper.key_for = key_for
+        wrapper.invalidate = invalidate
+        return wrapper
+
+    return decorate
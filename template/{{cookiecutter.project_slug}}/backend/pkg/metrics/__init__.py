@@ -0,0 +1,22 @@
+"""Metrics package - Prometheus metrics and component stats export."""
+from .registry import (
+    HTTP_REQUESTS,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS_IN_FLIGHT,
+    register_stats,
+    sample_stats,
+    init_metrics,
+    close_metrics,
+    render_metrics,
+)
+
+__all__ = [
+    "HTTP_REQUESTS",
+    "HTTP_REQUEST_DURATION",
+    "HTTP_REQUESTS_IN_FLIGHT",
+    "register_stats",
+    "sample_stats",
+    "init_metrics",
+    "close_metrics",
+    "render_metrics",
+]
@@ -0,0 +1,73 @@
+"""
+Celery task metrics.
+
+instrument_celery() connects Celery signals to Prometheus metrics:
+tasks published (in the process that sends them) and tasks finished by
+state plus run time (in the worker).
+
+Workers are separate processes. Either give them the same
+PROMETHEUS_MULTIPROC_DIR as the API, so the API's /metrics includes
+them, or set CELERY_METRICS_PORT to serve them from the worker.
+"""
+import os
+import time
+from typing import Dict
+
+from celery import signals
+from prometheus_client import Counter, Histogram, start_http_server
+
+from .registry import LATENCY_BUCKETS
+
+CELERY_TASKS_PUBLISHED = Counter(
+    "celery_tasks_published_total",
+    "Celery tasks sent to the broker",
+    ["task"],
+)
+CELERY_TASKS = Counter(
+    "celery_tasks_total",
+    "Celery tasks finished, by state",
+    ["task", "state"],
+)
+CELERY_TASK_DURATION = Histogram(
+    "celery_task_duration_seconds",
+    "Celery task run time",
+    ["task"],
+    buckets=LATENCY_BUCKETS + (30.0, 60.0, 300.0),
+)
+
+# task id -> start time, for tasks running in this process
+_started: Dict[str, float] = {}
+
+
+def _on_publish(sender=None, **kwargs) -> None:
+    CELERY_TASKS_PUBLISHED.labels(sender).inc()
+
+
+def _on_prerun(task_id=None, **kwargs) -> None:
+    _started[task_id] = time.perf_counter()
+
+
+def _on_postrun(task_id=None, task=None, state=None, **kwargs) -> None:
+    started = _started.pop(task_id, None)
+    if started is not None:
+        CELERY_TASK_DURATION.labels(task.name).observe(time.perf_counter() - started)
+    CELERY_TASKS.labels(task.name, state or "UNKNOWN").inc()
+
+
+def _on_retry(sender=None, **kwargs) -> None:
+    CELERY_TASKS.labels(sender.name, "RETRY").inc()
+
+
+def _on_worker_ready(**kwargs) -> None:
+    port = os.environ.get("CELERY_METRICS_PORT")
+    if port:
+        start_http_server(int(port))
+
+
+def instrument_celery() -> None:
+    """Record metrics for every Celery task sent or run in this process."""
+    signals.before_task_publish.connect(_on_publish, weak=False)
+    signals.task_prerun.connect(_on_prerun, weak=False)
+    signals.task_postrun.connect(_on_postrun, weak=False)
+    signals.task_retry.connect(_on_retry, weak=False)
+    signals.worker_ready.connect(_on_worker_ready, weak=False)
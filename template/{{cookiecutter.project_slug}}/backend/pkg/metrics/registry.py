@@ -0,0 +1,170 @@
+"""
+Prometheus metrics.
+
+HTTP metrics are recorded per request by MetricsMiddleware. Component
+statistics (connection pools, audit sink, password hasher, Redis) are
+registered with register_stats() and copied into metrics when /metrics
+is scraped - or, with several workers, by a sampler task in each one -
+so the request path never computes them.
+
+Multi-process servers (gunicorn, uvicorn --workers): point the
+PROMETHEUS_MULTIPROC_DIR environment variable at an empty directory
+shared by all workers *before* they start. /metrics then aggregates
+every worker. With gunicorn, also clean up after dead workers:
+
+    # gunicorn.conf.py
+    from prometheus_client import multiprocess
+
+    def child_exit(server, worker):
+        multiprocess.mark_process_dead(worker.pid)
+"""
+import asyncio
+import logging
+import os
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets (seconds) - dense below 1s where API requests live
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route template and status code",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being handled",
+    multiprocess_mode="livesum",
+)
+
+StatsSource = Callable[[], Optional[Dict[str, float]]]
+
+# (prefix, labels) -> (source, gauge keys, counter keys)
+_sources: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Tuple[StatsSource, frozenset, frozenset]] = {}
+# metric name -> Gauge/Counter
+_metrics: Dict[str, object] = {}
+# (metric name, labels) -> last value seen for a counter key
+_last_totals: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+_sampler: Optional[asyncio.Task] = None
+
+
+def register_stats(
+    prefix: str,
+    source: StatsSource,
+    gauges: Iterable[str] = (),
+    counters: Iterable[str] = (),
+    labels: Optional[Dict[str, str]] = None,
+) -> None:
+    """
+    Export keys of a component's stats() dict as metrics.
+
+    Keys in `gauges` become `{prefix}_{key}` gauges (summed across
+    workers). Keys in `counters` are running totals and become
+    `{prefix}_{key}_total` counters. Other keys are ignored. `source` may
+    return None while the component does not exist; registering the same
+    prefix and labels again replaces the source.
+    """
+    key = (prefix, tuple(sorted((labels or {}).items())))
+    _sources[key] = (source, frozenset(gauges), frozenset(counters))
+
+
+def _metric(kind: type, name: str, labelnames: Tuple[str, ...]):
+    metric = _metrics.get(name)
+    if metric is None:
+        description = name.replace("_", " ")
+        if kind is Gauge:
+            metric = Gauge(name, description, labelnames, multiprocess_mode="livesum")
+        else:
+            metric = Counter(name, description, labelnames)
+        _metrics[name] = metric
+    return metric
+
+
+def sample_stats() -> None:
+    """Copy every registered source into its metrics."""
+    for (prefix, labels), (source, gauges, counters) in list(_sources.items()):
+        try:
+            stats = source()
+        except Exception:
+            logger.exception("Stats source %s failed", prefix)
+            continue
+        if not stats:
+            continue
+
+        labelnames = tuple(name for name, _ in labels)
+        labelvalues = dict(labels)
+        for key, value in stats.items():
+            if key not in gauges and key not in counters:
+                continue
+            value = float(value)
+
+            if key in counters:
+                name = f"{prefix}_{key}"
+                counter = _metric(Counter, name, labelnames)
+                last = _last_totals.get((name, labels), 0.0)
+                # A smaller total means the component was recreated
+                delta = value - last if value >= last else value
+                _last_totals[(name, labels)] = value
+                if delta:
+                    (counter.labels(**labelvalues) if labelnames else counter).inc(delta)
+            else:
+                gauge = _metric(Gauge, f"{prefix}_{key}", labelnames)
+                (gauge.labels(**labelvalues) if labelnames else gauge).set(value)
+
+
+async def _sample_loop(interval_seconds: float) -> None:
+    while True:
+        sample_stats()
+        await asyncio.sleep(interval_seconds)
+
+
+def init_metrics(interval_seconds: float = 5.0) -> None:
+    """Start sampling registered stats in the background (multi-process mode only)."""
+    global _sampler
+    # A single process samples when /metrics is scraped instead
+    if _sampler is None and os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        _sampler = asyncio.create_task(_sample_loop(interval_seconds))
+
+
+async def close_metrics() -> None:
+    """Stop the stats sampler."""
+    global _sampler
+    if _sampler is not None:
+        _sampler.cancel()
+        try:
+            await _sampler
+        except asyncio.CancelledError:
+            pass
+        _sampler = None
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Metrics in Prometheus text format, aggregated across workers if configured."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+        # Single process: serve current values rather than the last sample
+        sample_stats()
+    return generate_latest(registry), CONTENT_TYPE_LATEST
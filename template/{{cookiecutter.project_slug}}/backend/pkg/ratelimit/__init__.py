@@ -0,0 +1,14 @@
+"""Rate limiting package - sliding-window counters with local and Redis backends."""
+from .limiter import (
+    Decision,
+    RateLimitBackend,
+    LocalRateLimitBackend,
+    RedisRateLimitBackend,
+)
+
+__all__ = [
+    "Decision",
+    "RateLimitBackend",
+    "LocalRateLimitBackend",
+    "RedisRateLimitBackend",
+]
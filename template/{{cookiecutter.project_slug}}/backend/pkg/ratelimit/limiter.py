@@ -0,0 +1,181 @@
+"""
+Sliding-window counter rate limiting.
+
+Each key keeps three numbers - the current window index, the count in the
+current window and the count in the previous one - and estimates the
+requests in the trailing window as
+
+    previous * (1 - elapsed_fraction) + current
+
+which is O(1) memory per key, unlike a log of timestamps.
+
+A single `hit` may check several (key, limit) pairs, e.g. a per-route
+quota and a per-user quota. It is all-or-nothing: a request is counted
+against every key only if all of them allow it.
+"""
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, List, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class Decision:
+    """Outcome of a rate limit check, for the most restrictive key."""
+    
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: int  # seconds until the current window rolls over
+
+
+class RateLimitBackend(ABC):
+    """Storage for sliding-window counters."""
+    
+    @abstractmethod
+    async def hit(
+        self,
+        checks: Sequence[Tuple[str, int]],
+        window_seconds: int,
+    ) -> Decision:
+        """Count one request against every (key, limit) pair if all allow it."""
+        pass
+
+
+class LocalRateLimitBackend(RateLimitBackend):
+    """
+    In-process backend with LRU eviction.
+    
+    Limits are per process: with N workers the effective limit is N times
+    higher. Use RedisRateLimitBackend when running more than one worker.
+    """
+    
+    def __init__(
+        self,
+        max_keys: int = 100_000,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_keys = max_keys
+        self._clock = clock
+        # key -> [window index, current count, previous count]
+        self._counters: "OrderedDict[str, List[int]]" = OrderedDict()
+    
+    def _state(self, key: str, index: int) -> List[int]:
+        state = self._counters.get(key)
+        if state is None:
+            state = [index, 0, 0]
+            self._counters[key] = state
+            if len(self._counters) > self.max_keys:
+                self._counters.popitem(last=False)
+        else:
+            self._counters.move_to_end(key)
+            if state[0] != index:
+                # Roll the window forward; anything older than one window is dropped
+                state[2] = state[1] if state[0] == index - 1 else 0
+                state[1] = 0
+                state[0] = index
+        return state
+    
+    async def hit(
+        self,
+        checks: Sequence[Tuple[str, int]],
+        window_seconds: int,
+    ) -> Decision:
+        now = self._clock()
+        index = int(now // window_seconds)
+        elapsed = (now - index * window_seconds) / window_seconds
+        reset_after = max(math.ceil((index + 1) * window_seconds - now), 1)
+        
+        states = [self._state(key, index) for key, _ in checks]
+        estimates = [
+            state[2] * (1 - elapsed) + state[1] for state in states
+        ]
+        allowed = all(est < limit for est, (_, limit) in zip(estimates, checks))
+        if allowed:
+            for state in states:
+                state[1] += 1
+        
+        # Report on the key closest to its limit
+        remaining, limit = min(
+            (limit - est - (1 if allowed else 0), limit)
+            for est, (_, limit) in zip(estimates, checks)
+        )
+        return Decision(allowed, limit, max(int(remaining), 0), reset_after)
+    
+    def __len__(self) -> int:
+        return len(self._counters)
+
+
+# KEYS: one hash per limited key. ARGV: window seconds, then one limit per key.
+# Uses the Redis clock so every app node agrees on window boundaries.
+_SLIDING_WINDOW_LUA = """
+-- Effects replication is the default from Redis 5; older servers need this for TIME
+if redis.replicate_commands then redis.replicate_commands() end
+local window = tonumber(ARGV[1])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local index = math.floor(now / window)
+local elapsed = (now - index * window) / window
+
+local states = {}
+local allowed = 1
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[i + 1])
+    local s = redis.call('HMGET', key, 'w', 'c', 'p')
+    local w = tonumber(s[1]) or index
+    local c = tonumber(s[2]) or 0
+    local p = tonumber(s[3]) or 0
+    if w ~= index then
+        if w == index - 1 then p = c else p = 0 end
+        c = 0
+    end
+    local est = p * (1 - elapsed) + c
+    if est >= limit then allowed = 0 end
+    states[i] = {c, p, est, limit}
+end
+
+local remaining = nil
+local best_limit = 0
+for i, key in ipairs(KEYS) do
+    local st = states[i]
+    local c = st[1] + allowed
+    redis.call('HSET', key, 'w', index, 'c', c, 'p', st[2])
+    redis.call('EXPIRE', key, window * 2)
+    local left = st[4] - st[3] - allowed
+    if remaining == nil or left < remaining then
+        remaining = left
+        best_limit = st[4]
+    end
+end
+
+local reset_after = math.ceil((index + 1) * window - now)
+return {allowed, best_limit, math.floor(math.max(remaining, 0)), math.max(reset_after, 1)}
+"""
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """
+    Shared backend: one atomic Lua call per request, whatever the number
+    of keys, so limits hold across workers and nodes.
+    
+    On Redis Cluster every key of one `hit` must hash to the same slot;
+    give them a common hash tag, e.g. "{ip:1.2.3.4}" and
+    "{ip:1.2.3.4}:route:/api/auth/login".
+    """
+    
+    def __init__(self, client, prefix: str = "ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(_SLIDING_WINDOW_LUA)
+    
+    async def hit(
+        self,
+        checks: Sequence[Tuple[str, int]],
+        window_seconds: int,
+    ) -> Decision:
+        keys = [f"{self.prefix}{key}" for key, _ in checks]
+        args = [window_seconds] + [limit for _, limit in checks]
+        allowed, limit, remaining, reset_after = await self._script(keys=keys, args=args)
+        return Decision(bool(allowed), int(limit), int(remaining), int(reset_after))
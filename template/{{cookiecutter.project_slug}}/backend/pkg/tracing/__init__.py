@@ -0,0 +1,16 @@
+"""Tracing package - OpenTelemetry setup and instrumentation."""
+from .setup import (
+    setup_tracing,
+    shutdown_tracing,
+    instrument_app,
+    trace_class,
+    untrace_class,
+)
+
+__all__ = [
+    "setup_tracing",
+    "shutdown_tracing",
+    "instrument_app",
+    "trace_class",
+    "untrace_class",
+]
@@ -0,0 +1,173 @@
+"""
+OpenTelemetry tracing (opt-in: settings.tracing_enabled).
+
+setup_tracing() installs a sampled TracerProvider and instruments the
+libraries and adapters requests pass through:
+
+- HTTP requests (instrument_app(), called where the app is created)
+{%- if cookiecutter.database == 'postgresql' %}
+- SQL statements on the primary and replica engines
+- SQLAlchemyUserRepository methods
+{%- else %}
+- BeanieUserRepository methods
+{%- endif %}
+{%- if cookiecutter.use_redis == 'yes' %}
+- Redis commands and RedisCacheRepository methods
+{%- endif %}
+{%- if cookiecutter.auth_strategy == 'jwt_builtin' %}
+- password hashing
+{%- endif %}
+- Celery tasks, with the trace context carried in the message headers
+
+Temporal activities are traced by the worker (internal/workers/main.py),
+which propagates context through Temporal's own headers.
+
+Spans go to an OTLP/HTTP collector at settings.tracing_otlp_endpoint.
+Tests pass an in-memory exporter instead, so no collector is needed.
+"""
+import functools
+import inspect
+import logging
+from typing import Callable, Dict, Optional
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    SimpleSpanProcessor,
+    SpanExporter,
+)
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+from pkg.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_provider: Optional[TracerProvider] = None
+# class -> original methods replaced by trace_class()
+_traced: Dict[type, Dict[str, Callable]] = {}
+
+
+def _tracer() -> trace.Tracer:
+    return trace.get_tracer("{{ cookiecutter.project_slug }}")
+
+
+def _span_wrapper(name: str, method: Callable) -> Callable:
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        with _tracer().start_as_current_span(name):
+            return await method(*args, **kwargs)
+
+    return wrapper
+
+
+def trace_class(cls: type) -> type:
+    """
+    Record a span named "Class.method" for every public async method of
+    cls. Calling it again for the same class does nothing.
+    """
+    if cls in _traced:
+        return cls
+    originals = {}
+    for name, method in vars(cls).items():
+        if name.startswith("_") or not inspect.iscoroutinefunction(method):
+            continue
+        originals[name] = method
+        setattr(cls, name, _span_wrapper(f"{cls.__name__}.{name}", method))
+    _traced[cls] = originals
+    return cls
+
+
+def untrace_class(cls: type) -> None:
+    """Restore the methods replaced by trace_class()."""
+    for name, method in _traced.pop(cls, {}).items():
+        setattr(cls, name, method)
+
+
+def instrument_app(app) -> None:
+    """
+    Record a span per HTTP request.
+
+    Must run before the app serves its first request (Starlette builds the
+    middleware stack then), so main.py calls it right after creating the
+    app. Spans are only recorded once setup_tracing() has run.
+    """
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+
+    FastAPIInstrumentor.instrument_app(app, excluded_urls="/health,/metrics")
+
+
+def setup_tracing(exporter: Optional[SpanExporter] = None) -> TracerProvider:
+    """
+    Install the tracer provider and instrument the adapters.
+
+    `exporter` replaces the OTLP exporter; it is called synchronously so
+    spans are visible as soon as they end (meant for tests).
+    """
+    global _provider
+    if _provider is None:
+        _provider = TracerProvider(
+            resource=Resource.create({"service.name": settings.tracing_service_name}),
+            # Follow the caller's decision when a request carries a trace
+            sampler=ParentBased(TraceIdRatioBased(settings.tracing_sample_ratio)),
+        )
+        trace.set_tracer_provider(_provider)
+        if exporter is None:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+            _provider.add_span_processor(
+                BatchSpanProcessor(OTLPSpanExporter(endpoint=settings.tracing_otlp_endpoint))
+            )
+    if exporter is not None:
+        _provider.add_span_processor(SimpleSpanProcessor(exporter))
+
+    {%- if cookiecutter.database == 'postgresql' %}
+
+    from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+    from internal.adapters.db.connection import engine, replicas
+    from internal.adapters.db.user_repo import SQLAlchemyUserRepository
+
+    # Only engine events are used, which SQLAlchemy 2.1 still provides;
+    # the instrumentation's version pin would otherwise refuse to load
+    SQLAlchemyInstrumentor().instrument(
+        engines=[engine.sync_engine] + [replica.sync_engine for replica in replicas.engines],
+        skip_dep_check=True,
+    )
+    trace_class(SQLAlchemyUserRepository)
+    {%- else %}
+
+    from internal.adapters.db.user_repo import BeanieUserRepository
+
+    trace_class(BeanieUserRepository)
+    {%- endif %}
+    {%- if cookiecutter.use_redis == 'yes' %}
+
+    from opentelemetry.instrumentation.redis import RedisInstrumentor
+    from internal.adapters.cache.redis_cache import RedisCacheRepository
+
+    RedisInstrumentor().instrument()
+    trace_class(RedisCacheRepository)
+    {%- endif %}
+    {%- if cookiecutter.auth_strategy == 'jwt_builtin' %}
+
+    from internal.services.password_hasher import PasswordHasher
+
+    trace_class(PasswordHasher)
+    {%- endif %}
+
+    try:
+        from opentelemetry.instrumentation.celery import CeleryInstrumentor
+    except ImportError:  # Celery not installed
+        pass
+    else:
+        CeleryInstrumentor().instrument()
+
+    logger.info("Tracing enabled (sample ratio %s)", settings.tracing_sample_ratio)
+    return _provider
+
+
+def shutdown_tracing() -> None:
+    """Flush pending spans and stop exporting (once per process)."""
+    if _provider is not None:
+        _provider.shutdown()
@@ -0,0 +1,93 @@
+"""
+Benchmark: bulk vs single-row user writes.
+
+Measures rows/sec of UserRepository.create_many / upsert_many / get_many
+against the configured database, with a per-row create() baseline.
+
+Run from backend/ (database must be up):
+    python scripts/benchmarks/bench_bulk_users.py --rows 100000
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from internal.adapters.db.connection import init_db
+{%- if cookiecutter.database == 'postgresql' %}
+from internal.adapters.db.connection import async_session_maker
+from internal.adapters.db.user_repo import SQLAlchemyUserRepository
+{%- else %}
+from internal.adapters.db.models import UserDocument
+from internal.adapters.db.user_repo import BeanieUserRepository
+{%- endif %}
+from internal.entities.user import User
+
+
+def make_users(count: int, run_id: str) -> list:
+    return [
+        User(
+            email=f"bench-{run_id}-{i}@bench.invalid",
+            username=f"bench_{run_id}_{i}",
+            first_name="Bench",
+        )
+        for i in range(count)
+    ]
+
+
+async def timed(label: str, rows: int, coro) -> None:
+    start = time.perf_counter()
+    await coro
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {rows:>8} rows  {elapsed:8.2f}s  {rows / elapsed:>12,.0f} rows/s")
+
+
+async def run(repo, rows: int, baseline_rows: int) -> None:
+    run_id = uuid4().hex[:8]
+    
+    baseline = make_users(baseline_rows, f"{run_id}b")
+    
+    async def create_one_by_one():
+        for user in baseline:
+            await repo.create(user)
+    
+    await timed("create() x N (baseline)", baseline_rows, create_one_by_one())
+    
+    users = make_users(rows, run_id)
+    await timed("create_many()", rows, repo.create_many(users))
+    
+    for user in users:
+        user.first_name = "Updated"
+    await timed("upsert_many() (all conflicts)", rows, repo.upsert_many(users))
+    
+    await timed("get_many()", rows, repo.get_many([u.id for u in users]))
+
+
+async def main(rows: int, baseline_rows: int) -> None:
+    await init_db()
+    {%- if cookiecutter.database == 'postgresql' %}
+    async with async_session_maker() as session:
+        try:
+            await run(SQLAlchemyUserRepository(session), rows, baseline_rows)
+        finally:
+            # Never keep benchmark rows
+            await session.rollback()
+    {%- else %}
+    try:
+        await run(BeanieUserRepository(), rows, baseline_rows)
+    finally:
+        # Never keep benchmark documents
+        await UserDocument.find({"email": {"$regex": r"@bench\.invalid$"}}).delete()
+    {%- endif %}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--baseline-rows", type=int, default=2_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.baseline_rows))
@@ -0,0 +1,162 @@
+"""
+Benchmark: database load when a hot cache key expires.
+
+Simulates --workers processes, each serving --concurrency requests in a
+loop for --seconds, all reading one key with a short --ttl. The value is
+an exact user count plus --load-delay seconds standing in for an
+expensive query. Reports how many loads reached the database and the
+most that ran at once, for:
+
+- hand-rolled cache-aside (get, on a miss query and set)
+- TypedCache with single-flight only (beta=0)
+- single-flight + XFetch early refresh
+{%- if cookiecutter.use_redis == 'yes' %}
+- single-flight + XFetch + the cross-worker Redis lock
+
+Workers share Redis, as real processes would.
+{%- else %}
+
+Workers share one in-process store (Redis is not enabled).
+{%- endif %}
+
+Run from backend/ (database{% if cookiecutter.use_redis == 'yes' %} and Redis{% endif %} must be up):
+    python scripts/benchmarks/bench_cache_stampede.py --workers 4 --concurrency 50
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from internal.adapters.db.connection import init_db
+{%- if cookiecutter.database == 'postgresql' %}
+from internal.adapters.db.connection import async_session_maker
+from internal.adapters.db.unit_of_work import UnitOfWork
+{%- else %}
+from internal.adapters.db.user_repo import BeanieUserRepository
+{%- endif %}
+{%- if cookiecutter.use_redis == 'yes' %}
+from internal.adapters.cache.redis_cache import RedisCacheRepository, close_redis, get_redis, init_redis
+from pkg.cache import TypedCache
+{%- else %}
+from pkg.cache import MemoryCacheBackend, TypedCache
+{%- endif %}
+
+
+class Database:
+    """The expensive query, instrumented."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.loads = 0
+        self.running = 0
+        self.peak = 0
+
+    async def count_users(self) -> int:
+        self.loads += 1
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            {%- if cookiecutter.database == 'postgresql' %}
+            async with UnitOfWork(async_session_maker) as uow:
+                total = await uow.users.count()
+            {%- else %}
+            total = await BeanieUserRepository().count()
+            {%- endif %}
+            await asyncio.sleep(self.delay)
+            return total
+        finally:
+            self.running -= 1
+
+
+def make_store():
+    {%- if cookiecutter.use_redis == 'yes' %}
+    return RedisCacheRepository(get_redis())
+    {%- else %}
+    return MemoryCacheBackend()
+    {%- endif %}
+
+
+async def naive_get(store, key: str, db: Database, ttl: int) -> int:
+    raw = await store.get(key)
+    if raw is not None:
+        return int(raw)
+    total = await db.count_users()
+    await store.set(key, str(total), expire_seconds=ttl)
+    return total
+
+
+async def run(label: str, args, strategy: str) -> None:
+    db = Database(args.load_delay)
+    store = make_store()
+    key = f"bench:stampede:{uuid4().hex[:8]}"
+    lock_client = None
+    {%- if cookiecutter.use_redis == 'yes' %}
+    lock_client = get_redis() if strategy == "lock" else None
+    {%- endif %}
+    # One TypedCache per simulated worker process
+    caches = [
+        TypedCache(store, lock_client=lock_client, beta=0 if strategy == "single-flight" else 1.0)
+        for _ in range(args.workers)
+    ]
+    latencies = []
+    deadline = time.perf_counter() + args.seconds
+
+    async def serve(cache: TypedCache) -> None:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            if strategy == "naive":
+                await naive_get(store, key, db, args.ttl)
+            else:
+                await cache.get_or_load(key, db.count_users, args.ttl, type_=int, lock=strategy == "lock")
+            latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(args.interval)
+
+    await asyncio.gather(*(
+        serve(cache) for cache in caches for _ in range(args.concurrency)
+    ))
+    await store.delete(f"{caches[0].prefix}{key}" if strategy != "naive" else key)
+
+    p99 = statistics.quantiles(latencies, n=100)[98] * 1000
+    print(
+        f"{label:<32} {len(latencies):>8} requests  {db.loads:>6} DB loads  "
+        f"peak {db.peak:>4} at once  p99 {p99:7.1f}ms"
+    )
+
+
+async def main(args) -> None:
+    await init_db()
+    {%- if cookiecutter.use_redis == 'yes' %}
+    await init_redis()
+    {%- endif %}
+    expiries = int(args.seconds // args.ttl)
+    print(f"{args.workers} workers x {args.concurrency} requests in flight, key expires ~{expiries} times\n")
+    strategies = [
+        ("hand-rolled cache-aside", "naive"),
+        ("single-flight", "single-flight"),
+        ("single-flight + XFetch", "xfetch"),
+        {%- if cookiecutter.use_redis == 'yes' %}
+        ("single-flight + XFetch + lock", "lock"),
+        {%- endif %}
+    ]
+    for label, strategy in strategies:
+        await run(label, args, strategy)
+    {%- if cookiecutter.use_redis == 'yes' %}
+    await close_redis()
+    {%- endif %}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--ttl", type=int, default=2)
+    parser.add_argument("--load-delay", type=float, default=0.2)
+    parser.add_argument("--interval", type=float, default=0.01)
+    asyncio.run(main(parser.parse_args()))
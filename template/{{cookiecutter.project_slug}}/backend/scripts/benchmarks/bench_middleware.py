@@ -0,0 +1,121 @@
+"""
+Benchmark: middleware stack overhead.
+
+Measures requests/sec through a minimal FastAPI app with 0, 3 and 7 of
+the api/middleware layers enabled, plus the 7-layer stack with the
+header-only middlewares folded into one HeaderPipeline layer.
+Requests go in-process through httpx.ASGITransport, so only framework
+and middleware cost is measured - no sockets, no database.
+
+Run from backend/:
+    python scripts/benchmarks/bench_middleware.py --requests 5000
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import logging
+
+from fastapi import FastAPI
+from httpx import AsyncClient, ASGITransport
+
+from api.middleware.audit import AuditMiddleware
+from api.middleware.csrf import CSRFMiddleware
+from api.middleware.logging import RequestLoggingMiddleware
+from api.middleware.rate_limit import RateLimitMiddleware
+from api.middleware.sanitize import SanitizeMiddleware
+from api.middleware.security import SecurityHeadersMiddleware
+from api.middleware.timing import TimingMiddleware
+from pkg.logger.setup import setup_logging
+
+SECRET = "bench-secret"
+HEADER_ONLY = [TimingMiddleware, SecurityHeadersMiddleware, RequestLoggingMiddleware]
+
+
+def make_app(layers: int, pipeline: bool = False) -> FastAPI:
+    app = FastAPI()
+    
+    @app.post("/api/items")
+    async def create_item(item: dict):
+        return item
+    
+    if layers >= 7:
+        app.add_middleware(SanitizeMiddleware)
+        app.add_middleware(AuditMiddleware)
+        app.add_middleware(CSRFMiddleware, secret_key=SECRET)
+        app.add_middleware(RateLimitMiddleware, requests_per_minute=10**9)
+    if layers >= 3:
+        if pipeline:
+            from api.middleware.pipeline import HeaderPipeline
+            app.add_middleware(
+                HeaderPipeline,
+                middlewares=[cls() for cls in reversed(HEADER_ONLY)],
+            )
+        else:
+            for cls in HEADER_ONLY:
+                app.add_middleware(cls)
+    return app
+
+
+async def run(label: str, app: FastAPI, requests: int, concurrency: int) -> float:
+    token = CSRFMiddleware(None, SECRET)._generate_token()
+    headers = {"X-CSRF-Token": token}
+    body = {"name": "<b>widget</b>", "tags": ["a", "b"], "price": 10}
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        # Warm up
+        for _ in range(50):
+            await client.post("/api/items", json=body, headers=headers)
+        
+        latencies = []
+        remaining = requests
+        
+        async def worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                started = time.perf_counter()
+                response = await client.post("/api/items", json=body, headers=headers)
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == 200, response.text
+        
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    rps = requests / elapsed
+    print(f"{label:<24} {rps:>10,.0f} req/s   p50 {p50:6.2f}ms   p99 {p99:6.2f}ms")
+    return rps
+
+
+async def main(requests: int, concurrency: int) -> None:
+    # Keep log I/O out of the measurement
+    setup_logging()
+    logging.disable(logging.CRITICAL)
+    
+    print(f"{requests} requests, concurrency {concurrency}\n")
+    await run("0 middlewares", make_app(0), requests, concurrency)
+    await run("3 middlewares", make_app(3), requests, concurrency)
+    await run("7 middlewares", make_app(7), requests, concurrency)
+    try:
+        await run("7 (3 in pipeline)", make_app(7, pipeline=True), requests, concurrency)
+    except ImportError:
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the middleware stack")
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per configuration")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent clients")
+    args = parser.parse_args()
+    
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,183 @@
+"""
+Benchmark: GET /api/v1/users?page_size=100 response path.
+
+Compares the old hand-built UserResponse list (validated again through
+response_model, default JSONResponse) with the DTO mapper + orjson
+default response class, and with settings.trusted_responses enabled.
+The user service is an in-memory fake, so only mapping, validation and
+serialization cost is measured - no database.
+
+Run from backend/:
+    python scripts/benchmarks/bench_responses.py --requests 3000
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from fastapi import APIRouter, Depends, FastAPI, Query
+from httpx import AsyncClient, ASGITransport
+
+from api.http import users as users_api
+from api.http.responses import ORJSONResponse
+from internal.dto.responses import UserListResponse, UserResponse
+from internal.entities.user import User, UserRole
+from internal.services.auth_deps import get_admin_user, get_user_service
+from pkg.config.settings import settings
+
+PAGE_SIZE = 100
+
+
+class FakeUserService:
+    """Serves the same page of users for every request."""
+    
+    def __init__(self, count: int):
+        now = datetime.now(timezone.utc)
+        self.users = [
+            User(
+                email=f"user{i}@example.com",
+                username=f"user{i}",
+                first_name="Bench",
+                last_name=f"User{i}",
+                is_verified=i % 2 == 0,
+                avatar_url=f"https://cdn.example.com/a/{i}.png" if i % 3 else None,
+                created_at=now,
+                updated_at=now,
+            )
+            for i in range(count)
+        ]
+    
+    async def list_users_page(self, limit: int, cursor: Optional[str] = None):
+        return self.users[:limit], None
+    
+    async def count_users(self, exact: bool = False) -> int:
+        return len(self.users)
+
+
+def legacy_router() -> APIRouter:
+    """The list endpoint as it was before the DTO mapper."""
+    router = APIRouter()
+    
+    @router.get("", response_model=UserListResponse)
+    async def list_users(
+        page: int = Query(1, ge=1),
+        page_size: int = Query(20, ge=1, le=100),
+        admin_user: User = Depends(get_admin_user),
+        user_service=Depends(get_user_service),
+    ):
+        users, next_cursor = await user_service.list_users_page(limit=page_size)
+        total = await user_service.count_users()
+        return UserListResponse(
+            items=[
+                UserResponse(
+                    id=u.id,
+                    email=u.email,
+                    username=u.username,
+                    first_name=u.first_name,
+                    last_name=u.last_name,
+                    full_name=u.full_name,
+                    role=u.role.value,
+                    status=u.status.value,
+                    is_verified=u.is_verified,
+                    avatar_url=u.avatar_url,
+                    created_at=u.created_at,
+                    updated_at=u.updated_at,
+                )
+                for u in users
+            ],
+            total=total,
+            total_is_estimate=True,
+            page=page,
+            page_size=page_size,
+            has_more=next_cursor is not None,
+            next_cursor=next_cursor,
+        )
+    
+    return router
+
+
+def make_app(legacy: bool) -> FastAPI:
+    if legacy:
+        app = FastAPI()
+        app.include_router(legacy_router(), prefix="/api/v1/users")
+    else:
+        app = FastAPI(default_response_class=ORJSONResponse)
+        app.include_router(users_api.router, prefix="/api/v1/users")
+    
+    service = FakeUserService(PAGE_SIZE)
+    admin = User(email="admin@example.com", username="admin", role=UserRole.ADMIN)
+    app.dependency_overrides[get_user_service] = lambda: service
+    app.dependency_overrides[get_admin_user] = lambda: admin
+    return app
+
+
+async def run(label: str, app: FastAPI, requests: int, concurrency: int) -> float:
+    url = f"/api/v1/users?page_size={PAGE_SIZE}"
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        # Warm up
+        for _ in range(50):
+            response = await client.get(url)
+            assert len(response.json()["items"]) == PAGE_SIZE, response.text
+        
+        latencies = []
+        remaining = requests
+        
+        async def worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                started = time.perf_counter()
+                response = await client.get(url)
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == 200, response.text
+        
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    rps = requests / elapsed
+    print(f"{label:<28} {rps:>8,.0f} req/s   p50 {p50:6.2f}ms   p99 {p99:6.2f}ms")
+    return rps
+
+
+async def main(requests: int, concurrency: int, rounds: int) -> None:
+    print(f"{requests} requests, concurrency {concurrency}, page_size {PAGE_SIZE}\n")
+    configs = [
+        ("hand-built + JSONResponse", True, False),
+        ("from_entities + orjson", False, False),
+        ("trusted_responses", False, True),
+    ]
+    best = {}
+    
+    # Interleave the configurations so machine noise hits all of them
+    for _ in range(rounds):
+        for label, legacy, trusted in configs:
+            settings.trusted_responses = trusted
+            rps = await run(label, make_app(legacy), requests, concurrency)
+            best[label] = max(best.get(label, 0.0), rps)
+        print()
+    
+    baseline = best[configs[0][0]]
+    for label, _, _ in configs[1:]:
+        print(f"{label:<28} best {best[label]:>8,.0f} req/s   {best[label] / baseline:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the user list response path")
+    parser.add_argument("--requests", type=int, default=3000, help="Requests per configuration")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent clients")
+    parser.add_argument("--rounds", type=int, default=3, help="Rounds per configuration (best is reported)")
+    args = parser.parse_args()
+    
+    asyncio.run(main(args.requests, args.concurrency, args.rounds))
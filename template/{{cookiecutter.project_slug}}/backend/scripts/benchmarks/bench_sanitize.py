@@ -0,0 +1,136 @@
+"""
+Benchmark: JSON body sanitization.
+
+Measures MB/s of SanitizeMiddleware's Sanitizer on a ~1 MB JSON payload,
+against the previous per-pattern implementation (13 regex passes, chained
+replace() calls and stdlib json) kept here as a baseline. Also reports
+how many strings the two disagree on.
+
+Run from backend/:
+    python scripts/benchmarks/bench_sanitize.py --size-mb 1
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from api.middleware.sanitize import XSS_PATTERNS, Sanitizer
+
+
+class LegacySanitizer:
+    """The pre-engine implementation, for comparison."""
+    
+    def __init__(self):
+        self.patterns = [
+            re.compile(p, re.IGNORECASE | (re.DOTALL if ".*?" in p else 0))
+            for p in XSS_PATTERNS
+        ]
+        self.exclude_fields = ["password", "token", "secret"]
+    
+    def _sanitize_string(self, value):
+        if not value:
+            return value
+        result = value
+        for pattern in self.patterns:
+            result = pattern.sub("", result)
+        result = (result
+            .replace("&", "&amp;")
+            .replace("<", "&lt;")
+            .replace(">", "&gt;")
+            .replace('"', "&quot;"))
+        return result.strip()
+    
+    def _sanitize_value(self, value, key=None):
+        if key and key.lower() in [f.lower() for f in self.exclude_fields]:
+            return value
+        if isinstance(value, str):
+            return self._sanitize_string(value)
+        elif isinstance(value, dict):
+            return {k: self._sanitize_value(v, k) for k, v in value.items()}
+        elif isinstance(value, list):
+            return [self._sanitize_value(item) for item in value]
+        return value
+    
+    def sanitize_json(self, body):
+        return json.dumps(self._sanitize_value(json.loads(body))).encode()
+
+
+WORDS = "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod".split()
+NASTY = [
+    "<script>alert(1)</script>",
+    '<img src=x onerror="alert(1)">',
+    "javascript:alert(1)",
+    "width: expression(alert(1))",
+    "Tom & Jerry <3",
+    'say "hi"',
+]
+
+
+def make_payload(size_bytes: int, nasty_ratio: float, seed: int = 42) -> bytes:
+    rng = random.Random(seed)
+    records = []
+    size = 2
+    while size < size_bytes:
+        text = " ".join(rng.choices(WORDS, k=rng.randint(3, 20)))
+        if rng.random() < nasty_ratio:
+            text += " " + rng.choice(NASTY)
+        record = {
+            "id": len(records),
+            "name": " ".join(rng.choices(WORDS, k=2)),
+            "description": text,
+            "tags": rng.choices(WORDS, k=3),
+            "price": round(rng.random() * 100, 2),
+            "password": "hunter2",
+            "meta": {"note": rng.choice(WORDS), "active": True},
+        }
+        records.append(record)
+        size += len(json.dumps(record)) + 2
+    return json.dumps({"items": records}).encode()
+
+
+def measure(label: str, func, body: bytes, repeat: int) -> float:
+    func(body)  # warm up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func(body)
+    elapsed = (time.perf_counter() - started) / repeat
+    mb_per_s = len(body) / elapsed / 1e6
+    print(f"{label:<26} {elapsed * 1000:8.1f} ms/payload  {mb_per_s:8.1f} MB/s")
+    return elapsed
+
+
+def main(size_mb: float, repeat: int) -> None:
+    legacy = LegacySanitizer()
+    engine = Sanitizer()
+    
+    for nasty_ratio in (0.0, 0.05, 0.5):
+        body = make_payload(int(size_mb * 1e6), nasty_ratio)
+        print(f"\n{len(body) / 1e6:.2f} MB payload, {nasty_ratio:.0%} of strings malicious")
+        base = measure("legacy", legacy.sanitize_json, body, repeat)
+        new = measure("Sanitizer", engine.sanitize_json, body, repeat)
+        print(f"{'speedup':<26} {base / new:8.1f}x")
+        
+        # Same sanitized content, whatever the JSON formatting
+        mismatches = sum(
+            a != b
+            for a, b in zip(
+                json.loads(legacy.sanitize_json(body))["items"],
+                json.loads(engine.sanitize_json(body))["items"],
+            )
+        )
+        print(f"{'records that differ':<26} {mismatches:8d}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark JSON sanitization")
+    parser.add_argument("--size-mb", type=float, default=1.0, help="Payload size in MB")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per measurement")
+    args = parser.parse_args()
+    
+    main(args.size_mb, args.repeat)
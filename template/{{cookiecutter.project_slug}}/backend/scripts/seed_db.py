@@ -7,8 +7,7 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from internal.services.user_service import UserService
-from internal.adapters.db.user_repo import UserRepository
-from internal.adapters.db.connection import get_session
+from internal.adapters.db.unit_of_work import UnitOfWork
 from internal.entities.user import UserRole, UserStatus
 from internal.dto.requests import CreateUserRequest
 from pkg.logger.setup import get_logger
@@ -24,8 +23,8 @@ async def seed_admin():
         logger.warning("Admin email or password not configured in cookiecutter.")
         return
 
-    async for session in get_session():
-        user_repo = UserRepository(session)
+    async with UnitOfWork() as uow:
+        user_repo = uow.users
         user_service = UserService(user_repo)
         
         # Check if admin already exists
@@ -55,7 +54,7 @@ async def seed_admin():
             user.is_verified = True
             
             await user_repo.update(user)
-            await session.commit()
+            await uow.commit()
             
             logger.info(f"Successfully created admin user: {admin_email}")
             
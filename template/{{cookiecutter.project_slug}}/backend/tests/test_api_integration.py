@@ -5,6 +5,9 @@ Tests actual HTTP requests to FastAPI app.
 import pytest
 from httpx import AsyncClient, ASGITransport
 from main import app
+from internal.entities.user import User, UserRole
+from internal.services.auth_deps import get_admin_user, get_user_service
+from pkg.config.settings import settings
 
 
 class TestHealthEndpoints:
@@ -79,3 +82,32 @@ class TestUserEndpoints:
             response = await client.get("/api/v1/users")
         
         assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_list_users_trusted_matches_validated(self, monkeypatch):
+        """Trusted responses should serialize exactly like the validated path."""
+        users = [User(email=f"u{i}@example.com", username=f"user{i}") for i in range(3)]
+
+        class FakeUserService:
+            async def list_users_page(self, limit, cursor=None):
+                return users, None
+
+            async def count_users(self, exact=False):
+                return len(users)
+
+        app.dependency_overrides[get_user_service] = FakeUserService
+        app.dependency_overrides[get_admin_user] = lambda: User(
+            email="admin@example.com", username="admin", role=UserRole.ADMIN
+        )
+        try:
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                validated = await client.get("/api/v1/users?page_size=100")
+                monkeypatch.setattr(settings, "trusted_responses", True)
+                trusted = await client.get("/api/v1/users?page_size=100")
+        finally:
+            app.dependency_overrides.clear()
+
+        assert validated.status_code == trusted.status_code == 200
+        assert len(trusted.json()["items"]) == 3
+        assert trusted.json() == validated.json()
@@ -0,0 +1,171 @@
+"""
+Tests for the batched audit sink.
+"""
+import asyncio
+import json
+
+import pytest
+
+from internal.services.audit_sink import AuditSink
+
+
+def make_entry(i=0):
+    return {
+        "timestamp": "2024-01-01T00:00:00Z",
+        "method": "POST",
+        "path": f"/api/items/{i}",
+        "query": None,
+        "user_id": "anonymous",
+        "client_ip": "127.0.0.1",
+        "user_agent": "test",
+        "status_code": 201,
+        "duration_ms": 1.5,
+    }
+
+
+class FakeAuditLogs:
+    def __init__(self, fail=False, delay=0.0):
+        self.batches = []
+        self.fail = fail
+        self.delay = delay
+
+    async def insert_many(self, entries):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("database down")
+        self.batches.append(list(entries))
+        return len(entries)
+
+
+class FakeUnitOfWork:
+    def __init__(self, audit_logs):
+        self.audit_logs = audit_logs
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+
+def make_sink(repo, **kwargs):
+    return AuditSink(lambda: FakeUnitOfWork(repo), **kwargs)
+
+
+class TestAuditSink:
+    """Tests for AuditSink."""
+
+    @pytest.mark.asyncio
+    async def test_entries_are_written_in_batches(self):
+        repo = FakeAuditLogs()
+        sink = make_sink(repo, batch_size=100, flush_interval=0.05)
+
+        for i in range(250):
+            sink.submit(make_entry(i))
+        await asyncio.sleep(0.2)
+
+        assert [len(b) for b in repo.batches] == [100, 100, 50]
+        assert sink.stats()["written"] == 250
+        assert sink.stats()["queue_depth"] == 0
+        await sink.close()
+
+    @pytest.mark.asyncio
+    async def test_close_flushes_pending_entries(self):
+        repo = FakeAuditLogs()
+        sink = make_sink(repo, batch_size=1000, flush_interval=60)
+
+        for i in range(10):
+            sink.submit(make_entry(i))
+        await sink.close()
+
+        assert sum(len(b) for b in repo.batches) == 10
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops(self):
+        repo = FakeAuditLogs(delay=0.05)
+        sink = make_sink(repo, max_queue_size=5, overflow_policy="drop")
+
+        for i in range(20):
+            sink.submit(make_entry(i))
+
+        assert sink.stats()["dropped"] == 15
+        await sink.close()
+        assert sink.stats()["written"] == 5
+
+    @pytest.mark.asyncio
+    async def test_full_queue_spills_to_file(self, tmp_path):
+        spill = tmp_path / "spill.jsonl"
+        sink = make_sink(
+            FakeAuditLogs(),
+            max_queue_size=2,
+            overflow_policy="spill",
+            spill_path=str(spill),
+        )
+
+        for i in range(5):
+            sink.submit(make_entry(i))
+        await sink.close()
+
+        lines = spill.read_text().splitlines()
+        assert len(lines) == 3
+        assert json.loads(lines[0])["path"] == "/api/items/2"
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_spilled(self, tmp_path):
+        spill = tmp_path / "spill.jsonl"
+        sink = make_sink(
+            FakeAuditLogs(fail=True),
+            overflow_policy="spill",
+            spill_path=str(spill),
+        )
+
+        sink.submit(make_entry())
+        await sink.close()
+
+        assert sink.stats()["failed_batches"] == 1
+        assert len(spill.read_text().splitlines()) == 1
+
+    def test_rejects_unknown_policy(self):
+        with pytest.raises(ValueError):
+            make_sink(FakeAuditLogs(), overflow_policy="block")
+{%- if cookiecutter.database == 'postgresql' %}
+
+
+class TestSQLAlchemyAuditLogRepository:
+    """The adapter writes entries to audit_logs (SQLite stand-in; COPY on asyncpg)."""
+
+    @pytest.mark.asyncio
+    async def test_insert_many(self, tmp_path):
+        from sqlalchemy import func, select
+        from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+        from internal.adapters.db.connection import Base
+        from internal.adapters.db.models import AuditLogModel
+        from internal.adapters.db.unit_of_work import UnitOfWork
+
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'audit.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        sink = AuditSink(lambda: UnitOfWork(factory), batch_size=50, flush_interval=0.01)
+        for i in range(120):
+            sink.submit(make_entry(i))
+        await sink.close()
+
+        async with factory() as session:
+            count = await session.scalar(select(func.count()).select_from(AuditLogModel))
+        await engine.dispose()
+        assert count == 120
+
+    def test_values_are_clipped_to_column_widths(self):
+        from internal.adapters.db.audit_repo import SQLAlchemyAuditLogRepository
+
+        entry = {**make_entry(), "path": "/" + "p" * 2000, "query": "q" * 5000}
+
+        [row] = SQLAlchemyAuditLogRepository(session=None)._rows([entry])
+
+        assert len(row["path"]) == 500
+        assert len(row["query"]) == 1000
+        assert row["method"] == "POST"
+{%- endif %}
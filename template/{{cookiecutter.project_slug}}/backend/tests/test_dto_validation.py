@@ -6,6 +6,7 @@ import pytest
 from pydantic import ValidationError
 from internal.dto.requests import CreateUserRequest, LoginRequest
 from internal.dto.responses import UserResponse
+from internal.entities.user import User, UserRole
 
 
 class TestCreateUserRequest:
@@ -81,3 +82,22 @@ class TestUserResponse:
         )
         assert response.id == "123"
         assert response.full_name == "Test User"
+
+    def test_from_entity(self):
+        """Should map every field from the entity."""
+        user = User(email="test@example.com", username="testuser", first_name="Test", last_name="User", role=UserRole.ADMIN)
+
+        response = UserResponse.from_entity(user)
+
+        assert response.id == user.id
+        assert response.full_name == "Test User"
+        assert response.role == "admin"
+        assert response.status == user.status.value
+
+    def test_from_entities(self):
+        """Batch mapping should match per-entity mapping."""
+        users = [User(email=f"u{i}@example.com", username=f"user{i}") for i in range(3)]
+
+        responses = UserResponse.from_entities(users)
+
+        assert responses == [UserResponse.from_entity(u) for u in users]
@@ -0,0 +1,164 @@
+{%- if cookiecutter.auth_strategy == 'keycloak' %}
+"""
+Tests for the Keycloak JWKS cache, run against a local stub JWKS server.
+"""
+import asyncio
+
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from jose import jwk, jwt
+
+from internal.adapters.auth.jwks import JWKSCache
+
+JWKS_URL = "http://keycloak.test/realms/test/protocol/openid-connect/certs"
+
+
+def make_key(kid: str):
+    """Generate an RSA key pair; returns (private PEM, public JWK)."""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode()
+    public_jwk = jwk.construct(public_pem, "RS256").to_dict()
+    public_jwk.update({"kid": kid, "use": "sig", "alg": "RS256"})
+    return private_pem, public_jwk
+
+
+class StubKeycloak:
+    """Minimal JWKS endpoint that counts how often it is hit."""
+
+    def __init__(self):
+        self.keys = []
+        self.hits = 0
+        self.down = False
+        self.app = FastAPI()
+
+        @self.app.get("/realms/test/protocol/openid-connect/certs")
+        async def certs():
+            self.hits += 1
+            if self.down:
+                return JSONResponse({"error": "unavailable"}, status_code=503)
+            await asyncio.sleep(0.01)
+            return {"keys": self.keys}
+
+
+@pytest.fixture(scope="module")
+def signing_key():
+    return make_key("key-1")
+
+
+@pytest.fixture
+def keycloak(signing_key):
+    stub = StubKeycloak()
+    stub.keys.append(signing_key[1])
+    return stub
+
+
+@pytest.fixture
+async def client(keycloak):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=keycloak.app)) as client:
+        yield client
+
+
+class TestJWKSCache:
+    """Tests for JWKSCache."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_fetch_once(self, keycloak, client):
+        """A burst of requests shares a single JWKS fetch."""
+        cache = JWKSCache(JWKS_URL, client=client)
+
+        keys = await asyncio.gather(*(cache.get_key("key-1") for _ in range(100)))
+
+        assert all(key["kid"] == "key-1" for key in keys)
+        assert keycloak.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_token_verifies_with_cached_key(self, signing_key, client):
+        """The cached JWK verifies a token signed by the realm."""
+        private_pem, _ = signing_key
+        token = jwt.encode(
+            {"sub": "abc", "aud": "web"}, private_pem, algorithm="RS256", headers={"kid": "key-1"}
+        )
+        cache = JWKSCache(JWKS_URL, client=client)
+
+        key = await cache.get_key(jwt.get_unverified_header(token)["kid"])
+        payload = jwt.decode(token, key, algorithms=["RS256"], audience="web")
+
+        assert payload["sub"] == "abc"
+
+    @pytest.mark.asyncio
+    async def test_unknown_kid_forces_rate_limited_refresh(self, keycloak, client):
+        """An unknown kid refetches once, then is rate-limited."""
+        cache = JWKSCache(JWKS_URL, client=client, min_refresh_interval=60)
+        await cache.get_key("key-1")
+
+        for _ in range(10):
+            assert await cache.get_key("bogus") is None
+
+        assert keycloak.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_key_rotation_picks_up_new_kid(self, keycloak, client):
+        """A rotated key is fetched on first sight of its kid."""
+        cache = JWKSCache(JWKS_URL, client=client, min_refresh_interval=0)
+        await cache.get_key("key-1")
+        keycloak.keys.append(make_key("key-2")[1])
+
+        key = await cache.get_key("key-2")
+
+        assert key["kid"] == "key-2"
+        assert keycloak.hits == 2
+
+    @pytest.mark.asyncio
+    async def test_expired_keys_are_refetched(self, keycloak, client):
+        """Keys are refetched after the TTL."""
+        cache = JWKSCache(JWKS_URL, client=client, ttl_seconds=0, min_refresh_interval=0)
+        await cache.get_key("key-1")
+        await cache.get_key("key-1")
+
+        assert keycloak.hits == 2
+
+    @pytest.mark.asyncio
+    async def test_outage_keeps_serving_known_keys(self, keycloak, client):
+        """A failed refresh leaves the previous keys in place."""
+        cache = JWKSCache(JWKS_URL, client=client, ttl_seconds=0, min_refresh_interval=0)
+        await cache.get_key("key-1")
+        keycloak.down = True
+
+        key = await cache.get_key("key-1")
+
+        assert key["kid"] == "key-1"
+
+    @pytest.mark.asyncio
+    async def test_outage_before_first_load_is_rate_limited(self, keycloak, client):
+        """Requests during a startup outage do not each refetch."""
+        keycloak.down = True
+        cache = JWKSCache(JWKS_URL, client=client, min_refresh_interval=60)
+
+        for _ in range(10):
+            assert await cache.get_key("key-1") is None
+
+        assert keycloak.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_background_refresh(self, keycloak, client):
+        """start() loads keys and the background task keeps them fresh."""
+        cache = JWKSCache(JWKS_URL, client=client, ttl_seconds=0.05, min_refresh_interval=0.01)
+        await cache.start()
+        try:
+            await asyncio.sleep(0.2)
+            assert keycloak.hits >= 2
+        finally:
+            await cache.close()
+{%- endif %}
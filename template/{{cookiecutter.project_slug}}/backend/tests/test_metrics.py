@@ -0,0 +1,146 @@
+"""
+Tests for Prometheus metrics.
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import APIRouter, FastAPI, HTTPException
+from httpx import AsyncClient, ASGITransport
+from prometheus_client import REGISTRY
+
+from api.middleware.metrics import MetricsMiddleware
+from pkg.metrics import register_stats, render_metrics, sample_stats
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+def app():
+    app = FastAPI()
+    router = APIRouter()
+
+    @router.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        if item_id == 0:
+            raise HTTPException(status_code=404)
+        return {"id": item_id}
+
+    app.include_router(router, prefix="/metrics-test")
+
+    @app.get("/metrics-test/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    app.add_middleware(MetricsMiddleware)
+    return app
+
+
+class TestMetricsMiddleware:
+    """Tests for MetricsMiddleware."""
+
+    @pytest.mark.asyncio
+    async def test_labels_by_route_template(self, app):
+        route = "/metrics-test/items/{item_id}"
+        before_ok = sample("http_requests_total", method="GET", route=route, status="200")
+        before_404 = sample("http_requests_total", method="GET", route=route, status="404")
+        before_count = sample("http_request_duration_seconds_count", method="GET", route=route)
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            for item_id in (1, 2, 3, 0):
+                await client.get(f"/metrics-test/items/{item_id}")
+
+        assert sample("http_requests_total", method="GET", route=route, status="200") == before_ok + 3
+        assert sample("http_requests_total", method="GET", route=route, status="404") == before_404 + 1
+        assert sample("http_request_duration_seconds_count", method="GET", route=route) == before_count + 4
+        assert sample("http_requests_total", method="GET", route="/metrics-test/items/1", status="200") == 0
+
+    @pytest.mark.asyncio
+    async def test_unmatched_and_errors(self, app):
+        before_unmatched = sample("http_requests_total", method="GET", route="unmatched", status="404")
+        before_error = sample("http_requests_total", method="GET", route="/metrics-test/boom", status="500")
+
+        transport = ASGITransport(app=app, raise_app_exceptions=False)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            await client.get("/metrics-test/no/such/path")
+            await client.get("/metrics-test/boom")
+
+        assert sample("http_requests_total", method="GET", route="unmatched", status="404") == before_unmatched + 1
+        assert sample("http_requests_total", method="GET", route="/metrics-test/boom", status="500") == before_error + 1
+        assert sample("http_requests_in_flight") == 0
+
+    @pytest.mark.asyncio
+    async def test_unknown_methods_share_one_label(self, app):
+        before = sample("http_requests_total", method="OTHER", route="unmatched", status="404")
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            for i in range(5):
+                await client.request(f"X{i}ZZ", "/metrics-test/no/such/path")
+
+        assert sample("http_requests_total", method="OTHER", route="unmatched", status="404") == before + 5
+        assert sample("http_requests_total", method="X0ZZ", route="unmatched", status="404") == 0
+
+
+class TestStatsExport:
+    """Tests for register_stats()/sample_stats()."""
+
+    def test_gauges_and_counters(self):
+        stats = {"depth": 3, "done": 10, "ignored": 99}
+        register_stats("metrics_test", lambda: stats, gauges=("depth",), counters=("done",), labels={"pool": "a"})
+
+        sample_stats()
+        stats.update(depth=1, done=15)
+        sample_stats()
+
+        assert sample("metrics_test_depth", pool="a") == 1
+        assert sample("metrics_test_done_total", pool="a") == 15
+        assert REGISTRY.get_sample_value("metrics_test_ignored", {"pool": "a"}) is None
+
+        # Component recreated: its totals restart from zero
+        stats.update(done=4)
+        sample_stats()
+        assert sample("metrics_test_done_total", pool="a") == 19
+
+    def test_missing_component_is_skipped(self):
+        register_stats("metrics_test_absent", lambda: None, gauges=("depth",))
+
+        sample_stats()
+
+        assert REGISTRY.get_sample_value("metrics_test_absent_depth") is None
+
+    def test_render(self):
+        content, media_type = render_metrics()
+
+        assert media_type.startswith("text/plain")
+        assert b"http_requests_in_flight" in content
+
+
+class TestMultiprocess:
+    """Metrics from several worker processes are aggregated."""
+
+    def test_workers_are_summed(self, tmp_path):
+        env = {"PROMETHEUS_MULTIPROC_DIR": str(tmp_path), "PYTHONPATH": str(BACKEND_DIR)}
+        worker = (
+            "from pkg.metrics import HTTP_REQUESTS, HTTP_REQUESTS_IN_FLIGHT\n"
+            "HTTP_REQUESTS.labels('GET', '/items/{id}', '200').inc(5)\n"
+            "HTTP_REQUESTS_IN_FLIGHT.inc(2)\n"
+        )
+        for _ in range(2):
+            subprocess.run([sys.executable, "-c", worker], env=env, check=True, cwd=BACKEND_DIR)
+
+        scrape = "from pkg.metrics import render_metrics\nprint(render_metrics()[0].decode())"
+        output = subprocess.run(
+            [sys.executable, "-c", scrape], env=env, check=True, cwd=BACKEND_DIR,
+            capture_output=True, text=True,
+        ).stdout
+
+        assert 'http_requests_total{method="GET",route="/items/{id}",status="200"} 10.0' in output
+        # Gauges are summed too, until mark_process_dead() drops a worker
+        assert "http_requests_in_flight 4.0" in output
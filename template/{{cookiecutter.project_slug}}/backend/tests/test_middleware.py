@@ -0,0 +1,193 @@
+"""
+Tests for the pure ASGI middlewares and the header pipeline.
+"""
+import pytest
+from unittest.mock import MagicMock
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from httpx import AsyncClient, ASGITransport
+
+from api.middleware.audit import AuditMiddleware
+from api.middleware.csrf import CSRFMiddleware
+from api.middleware.logging import RequestLoggingMiddleware
+from api.middleware.pipeline import HeaderMiddleware, HeaderPipeline
+from api.middleware.sanitize import SanitizeMiddleware
+from api.middleware.security import SecurityHeadersMiddleware
+from api.middleware.timing import TimingMiddleware
+
+SECRET = "test-secret"
+
+
+def make_app():
+    app = FastAPI()
+
+    @app.get("/api/items")
+    async def items():
+        return {"ok": True}
+
+    @app.post("/api/echo")
+    async def echo(request: Request):
+        body = await request.body()
+        return {
+            "body": body.decode(),
+            "content_length": request.headers.get("content-length"),
+        }
+
+    @app.post("/api/form")
+    async def form(request: Request):
+        form = await request.form()
+        return {"name": form.get("name")}
+
+    @app.get("/api/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"chunk{i};".encode()
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/api/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    return app
+
+
+async def request(app, method, url, **kwargs):
+    transport = ASGITransport(app=app, raise_app_exceptions=False)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.request(method, url, **kwargs)
+
+
+class Recorder(HeaderMiddleware):
+    """Records hook order into a shared list."""
+
+    def __init__(self, name, calls):
+        super().__init__()
+        self.name = name
+        self.calls = calls
+
+    def on_request(self, scope):
+        self.calls.append(f"{self.name}:request")
+
+    def on_response(self, scope, state, status, headers):
+        self.calls.append(f"{self.name}:response")
+        headers["X-Last"] = self.name
+
+
+class TestHeaderPipeline:
+    """Tests for HeaderPipeline and the header-only middlewares."""
+
+    @pytest.mark.asyncio
+    async def test_hooks_run_like_nested_middlewares(self):
+        calls = []
+        app = make_app()
+        app.add_middleware(
+            HeaderPipeline,
+            middlewares=[Recorder("outer", calls), Recorder("inner", calls)],
+        )
+
+        response = await request(app, "GET", "/api/items")
+
+        assert calls == ["outer:request", "inner:request", "inner:response", "outer:response"]
+        assert response.headers["X-Last"] == "outer"
+
+    @pytest.mark.asyncio
+    async def test_pipeline_matches_separate_layers(self):
+        separate = make_app()
+        for cls in (TimingMiddleware, SecurityHeadersMiddleware, RequestLoggingMiddleware):
+            separate.add_middleware(cls)
+        pipelined = make_app()
+        pipelined.add_middleware(
+            HeaderPipeline,
+            middlewares=[RequestLoggingMiddleware(), SecurityHeadersMiddleware(), TimingMiddleware()],
+        )
+
+        for app in (separate, pipelined):
+            response = await request(app, "GET", "/api/items")
+            assert response.status_code == 200
+            assert response.headers["X-Frame-Options"] == "DENY"
+            assert response.headers["X-Response-Time"].endswith("ms")
+            assert len(response.headers["X-Request-ID"]) == 8
+            assert "Strict-Transport-Security" not in response.headers
+
+    @pytest.mark.asyncio
+    async def test_streaming_passes_through(self):
+        app = make_app()
+        app.add_middleware(SecurityHeadersMiddleware)
+        app.add_middleware(TimingMiddleware)
+        app.add_middleware(AuditMiddleware)
+
+        response = await request(app, "GET", "/api/stream")
+
+        assert response.text == "chunk0;chunk1;chunk2;"
+        assert response.headers["X-Content-Type-Options"] == "nosniff"
+
+    @pytest.mark.asyncio
+    async def test_audit_entry_fits_the_audit_table(self):
+        entries = []
+
+        class CapturingAudit(AuditMiddleware):
+            def _persist_audit_log(self, entry):
+                entries.append(entry)
+
+        app = make_app()
+        app.add_middleware(CapturingAudit, persist_to_db=True)
+
+        await request(
+            app, "POST", "/api/echo?q=" + "x" * 5000,
+            headers={"X-Forwarded-For": "1" * 500},
+        )
+
+        assert len(entries[0]["query"]) == 1000
+        assert len(entries[0]["client_ip"]) == 50
+
+    @pytest.mark.asyncio
+    async def test_logging_records_errors(self, monkeypatch):
+        logger = MagicMock()
+        monkeypatch.setattr("api.middleware.logging.logger", logger)
+        app = make_app()
+        app.add_middleware(RequestLoggingMiddleware)
+
+        response = await request(app, "GET", "/api/boom")
+
+        assert response.status_code == 500
+        assert "ERROR after" in logger.error.call_args[0][0]
+
+
+class TestBodyMiddlewares:
+    """Tests for middlewares that read the request body."""
+
+    @pytest.mark.asyncio
+    async def test_sanitize_rewrites_body_and_length(self):
+        app = make_app()
+        app.add_middleware(SanitizeMiddleware)
+
+        response = await request(app, "POST", "/api/echo", json={"name": "<script>x</script>Bob"})
+
+        data = response.json()
+        assert data["body"] == '{"name":"Bob"}'
+        assert data["content_length"] == str(len(data["body"]))
+
+    @pytest.mark.asyncio
+    async def test_csrf_form_token_is_replayed_to_app(self):
+        app = make_app()
+        app.add_middleware(CSRFMiddleware, secret_key=SECRET)
+        token = CSRFMiddleware(None, SECRET)._generate_token()
+
+        accepted = await request(app, "POST", "/api/form", data={"name": "bob", "_csrf_token": token})
+        rejected = await request(app, "POST", "/api/form", data={"name": "bob"})
+
+        assert accepted.status_code == 200
+        assert accepted.json() == {"name": "bob"}
+        assert rejected.status_code == 403
+
+    @pytest.mark.asyncio
+    async def test_csrf_header_token(self):
+        app = make_app()
+        app.add_middleware(CSRFMiddleware, secret_key=SECRET)
+        token = CSRFMiddleware(None, SECRET)._generate_token()
+
+        response = await request(app, "POST", "/api/echo", json={}, headers={"X-CSRF-Token": token})
+
+        assert response.status_code == 200
+        assert (await request(app, "GET", "/api/items")).status_code == 200
@@ -0,0 +1,194 @@
+{%- if cookiecutter.use_redis == 'yes' %}
+"""
+Tests for the near cache (in-process tier + Redis pub/sub invalidation).
+"""
+import asyncio
+
+import fakeredis
+import pytest
+
+from internal.adapters.cache.near_cache import NearCache
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def make_node(server, **kwargs):
+    """One process: its own client and local tier, shared Redis."""
+    return NearCache(fakeredis.FakeAsyncRedis(server=server, decode_responses=True), **kwargs)
+
+
+async def eventually(condition, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+async def subscribed(node):
+    node.start()
+    # The listener bumps the generation once subscribed
+    await eventually(lambda: node._generation > 0)
+
+
+class TestNearCache:
+    """Tests for NearCache."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_reads_are_served_locally(self, server):
+        node = make_node(server)
+        await node.set("flag", "on")
+
+        values = [await node.get("flag") for _ in range(5)]
+
+        assert values == ["on"] * 5
+        assert node.stats["local_hits"] == 5
+        assert node.stats["remote_hits"] == 0
+
+    @pytest.mark.asyncio
+    async def test_remote_value_is_kept_locally(self, server):
+        writer, reader = make_node(server), make_node(server)
+        await writer.set("flag", "on")
+
+        await reader.get("flag")
+        await reader.get("flag")
+
+        assert reader.stats["remote_hits"] == 1
+        assert reader.stats["local_hits"] == 1
+        assert reader.hit_ratios() == {"local": 0.5, "remote": 1.0, "overall": 1.0}
+
+    @pytest.mark.asyncio
+    async def test_write_invalidates_other_processes(self, server):
+        writer, reader = make_node(server), make_node(server)
+        await subscribed(reader)
+        try:
+            await writer.set("flag", "off")
+            await reader.get("flag")
+
+            await writer.set("flag", "on")
+            await eventually(lambda: reader.stats["invalidations_received"] == 1)
+
+            assert await reader.get("flag") == "on"
+        finally:
+            await reader.close()
+
+    @pytest.mark.asyncio
+    async def test_delete_invalidates_other_processes(self, server):
+        writer, reader = make_node(server), make_node(server)
+        await subscribed(reader)
+        try:
+            await writer.set("flag", "on")
+            await reader.get("flag")
+
+            assert await writer.delete("flag") is True
+            await eventually(lambda: reader.stats["invalidations_received"] == 1)
+
+            assert await reader.get("flag") is None
+        finally:
+            await reader.close()
+
+    @pytest.mark.asyncio
+    async def test_own_announcements_keep_local_value(self, server):
+        node = make_node(server)
+        await subscribed(node)
+        try:
+            await node.set("flag", "on")
+            await asyncio.sleep(0.05)
+
+            assert node.stats["invalidations_received"] == 0
+            assert await node.get("flag") == "on"
+            assert node.stats["local_hits"] == 1
+        finally:
+            await node.close()
+
+    @pytest.mark.asyncio
+    async def test_read_racing_an_invalidation_is_not_kept(self, server):
+        node = make_node(server)
+        await node.remote.set("flag", "old")
+        read = node._read
+
+        async def slow_read(keys):
+            found = await read(keys)
+            # Another process changes the key while this read is in flight
+            node._invalidate_local("other-node:k:flag")
+            return found
+
+        node._read = slow_read
+
+        assert await node.get("flag") == "old"
+        assert "flag" not in node.local
+
+    @pytest.mark.asyncio
+    async def test_get_many_reads_remote_only_for_local_misses(self, server):
+        node = make_node(server)
+        await node.set("a", "1")
+        await node.remote.set_many({"b": "2", "c": "3"})
+
+        assert await node.get_many(["a", "b", "c", "d"]) == {"a": "1", "b": "2", "c": "3"}
+        assert await node.get_many(["b", "c"]) == {"b": "2", "c": "3"}
+
+        assert node.stats["local_hits"] == 3
+        assert node.stats["remote_hits"] == 2
+        assert node.stats["remote_misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_writes_invalidate_other_processes(self, server):
+        writer, reader = make_node(server), make_node(server)
+        await subscribed(reader)
+        try:
+            await writer.set_many({"a": "1", "b": "1", "user:1:x": "1", "user:1:y": "1"})
+            await reader.get_many(["a", "b", "user:1:x", "user:1:y"])
+
+            await writer.set_many({"a": "2"}, expire_seconds={"a": 60})
+            await writer.delete_many(["b"])
+            await writer.delete_pattern("user:1:*")
+            await eventually(lambda: reader.stats["invalidations_received"] == 3)
+
+            assert reader.local.keys() == []
+            assert await reader.get_many(["a", "b", "user:1:x"]) == {"a": "2"}
+        finally:
+            await reader.close()
+
+    @pytest.mark.asyncio
+    async def test_pipeline_invalidates_written_keys(self, server):
+        writer, reader = make_node(server), make_node(server)
+        await subscribed(reader)
+        try:
+            await writer.set("a", "1")
+            await reader.get("a")
+
+            async with writer.pipeline() as batch:
+                batch.set("a", "2")
+                batch.set("b", "2")
+            await eventually(lambda: reader.stats["invalidations_received"] == 1)
+
+            assert await reader.get_many(["a", "b"]) == {"a": "2", "b": "2"}
+            assert await writer.get("a") == "2"
+        finally:
+            await reader.close()
+
+    @pytest.mark.asyncio
+    async def test_local_copy_never_outlives_redis_ttl(self, server):
+        node = make_node(server, local_ttl_seconds=60)
+
+        await node.set("flag", "on", expire_seconds=1)
+
+        expires_at, _ = node.local._data["flag"]
+        assert expires_at - node.local._clock() <= 1
+
+    @pytest.mark.asyncio
+    async def test_remote_read_keeps_local_copy_only_for_remaining_ttl(self, server):
+        writer, reader = make_node(server), make_node(server, local_ttl_seconds=60)
+        await writer.set("short", "1", expire_seconds=2)
+        await writer.set("long", "1")
+
+        await reader.get("short")
+        await reader.get_many(["long"])
+
+        short_expires_at, _ = reader.local._data["short"]
+        long_expires_at, _ = reader.local._data["long"]
+        assert short_expires_at - reader.local._clock() <= 2
+        assert long_expires_at - reader.local._clock() > 50
+{%- endif %}
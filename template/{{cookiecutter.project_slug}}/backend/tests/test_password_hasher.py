@@ -0,0 +1,97 @@
+{%- if cookiecutter.auth_strategy == 'jwt_builtin' %}
+"""
+Tests for the off-loop password hasher.
+"""
+import asyncio
+import time
+
+import pytest
+from unittest.mock import AsyncMock
+
+from internal.entities.user import User
+from internal.services.password_hasher import PasswordHasher, build_crypt_context
+from internal.services.user_service import UserService
+from pkg.errors.exceptions import RateLimitError
+
+
+@pytest.fixture(scope="module")
+def context():
+    # Minimum cost keeps the suite fast
+    return build_crypt_context(scheme="bcrypt", bcrypt_rounds=4)
+
+
+class TestPasswordHasher:
+    """Tests for PasswordHasher."""
+
+    @pytest.mark.asyncio
+    async def test_hash_and_verify(self, context):
+        hasher = PasswordHasher(context)
+
+        hashed = await hasher.hash("s3cret-pass")
+
+        assert await hasher.verify("s3cret-pass", hashed)
+        assert not await hasher.verify("wrong", hashed)
+        assert hasher.stats()["completed"] == 3
+
+    @pytest.mark.asyncio
+    async def test_event_loop_stays_responsive(self):
+        """Hashing runs off the loop, so other coroutines keep ticking."""
+        hasher = PasswordHasher(build_crypt_context(scheme="bcrypt", bcrypt_rounds=10), max_workers=2)
+        ticks = 0
+        done = False
+
+        async def ticker():
+            nonlocal ticks
+            while not done:
+                ticks += 1
+                await asyncio.sleep(0.001)
+
+        task = asyncio.create_task(ticker())
+        started = time.perf_counter()
+        await asyncio.gather(*(hasher.hash("password") for _ in range(4)))
+        elapsed = time.perf_counter() - started
+        done = True
+        await task
+
+        # A blocked loop would tick once; a free one ticks roughly every ms
+        assert ticks > elapsed * 1000 / 10
+
+    @pytest.mark.asyncio
+    async def test_sheds_load_past_max_pending(self, context):
+        hasher = PasswordHasher(context, max_workers=1, max_pending=2)
+
+        results = await asyncio.gather(
+            *(hasher.hash("password") for _ in range(5)),
+            return_exceptions=True,
+        )
+
+        assert sum(isinstance(r, RateLimitError) for r in results) == 3
+        assert hasher.stats()["rejected"] == 3
+        assert hasher.stats()["peak_pending"] == 2
+
+    @pytest.mark.asyncio
+    async def test_login_rehashes_outdated_hash(self):
+        """Switching scheme upgrades stored hashes on the next login."""
+        old_hash = build_crypt_context(scheme="bcrypt", bcrypt_rounds=4).hash("password")
+        hasher = PasswordHasher(build_crypt_context(scheme="bcrypt", bcrypt_rounds=5))
+        repo = AsyncMock()
+        service = UserService(repo, password_hasher=hasher)
+        user = User(email="a@example.com", username="alice", hashed_password=old_hash)
+        user.mark_clean()
+
+        assert await service.verify_password(user, "password")
+
+        assert user.hashed_password != old_hash
+        assert user.hashed_password.startswith("$2b$05$")
+        repo.update.assert_called_once_with(user)
+        assert user.changed_fields == {"hashed_password"}
+
+    @pytest.mark.asyncio
+    async def test_wrong_password_does_not_rehash(self, context):
+        repo = AsyncMock()
+        service = UserService(repo, password_hasher=PasswordHasher(context))
+        user = User(email="a@example.com", username="alice", hashed_password=context.hash("password"))
+
+        assert not await service.verify_password(user, "nope")
+        repo.update.assert_not_called()
+{%- endif %}
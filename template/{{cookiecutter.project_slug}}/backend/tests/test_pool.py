@@ -0,0 +1,114 @@
+{%- if cookiecutter.database == 'postgresql' %}
+"""
+Tests for connection pool configuration and instrumentation.
+"""
+import asyncio
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from internal.adapters.db.pool import InstrumentedPool, engine_options, engine_pool_stats
+from pkg.config.settings import settings
+
+
+class TestEngineOptions:
+    """Tests for engine_options()."""
+
+    def test_pool_settings(self, monkeypatch):
+        monkeypatch.setattr(settings, "db_pool_size", 7)
+        monkeypatch.setattr(settings, "db_max_overflow", 3)
+        monkeypatch.setattr(settings, "db_pool_pre_ping", False)
+
+        options = engine_options()
+
+        assert options["poolclass"] is InstrumentedPool
+        assert options["pool_size"] == 7
+        assert options["max_overflow"] == 3
+        assert options["pool_pre_ping"] is False
+        assert options["connect_args"] == {"statement_cache_size": settings.db_statement_cache_size}
+
+    def test_pgbouncer_disables_statement_caches(self, monkeypatch):
+        monkeypatch.setattr(settings, "db_pgbouncer", True)
+
+        connect_args = engine_options()["connect_args"]
+
+        assert connect_args["statement_cache_size"] == 0
+        assert connect_args["prepared_statement_cache_size"] == 0
+        name_func = connect_args["prepared_statement_name_func"]
+        assert name_func() != name_func()
+
+
+class TestInstrumentedPool:
+    """Tests for InstrumentedPool."""
+
+    @pytest.fixture
+    async def engine(self, tmp_path):
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+            poolclass=InstrumentedPool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.2,
+        )
+        yield engine
+        await engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_records_checkouts(self, engine):
+        for _ in range(3):
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        stats = engine_pool_stats(engine)
+
+        assert stats["checkouts"] == 3
+        assert stats["checked_out"] == 0
+        assert stats["checked_in"] == 1
+        assert stats["timeouts"] == 0
+
+    @pytest.mark.asyncio
+    async def test_records_wait_and_timeouts(self, engine):
+        async with engine.connect() as held:
+            await held.execute(text("SELECT 1"))
+            assert engine_pool_stats(engine)["checked_out"] == 1
+
+            with pytest.raises(exc.TimeoutError):
+                async with engine.connect():
+                    pass
+
+        stats = engine_pool_stats(engine)
+        assert stats["timeouts"] == 1
+        assert stats["wait_seconds_max"] >= 0.2
+
+    @pytest.mark.asyncio
+    async def test_waiters_resume_when_connection_returns(self, engine):
+        async def use(delay):
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                await asyncio.sleep(delay)
+
+        await asyncio.gather(use(0.05), use(0))
+
+        stats = engine_pool_stats(engine)
+        assert stats["checkouts"] == 2
+        assert stats["wait_seconds_max"] >= 0.04
+
+
+class TestPoolMetricsEndpoint:
+    """Tests for GET /api/metrics/pool."""
+
+    @pytest.mark.asyncio
+    async def test_pool_metrics(self):
+        from main import app
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/api/metrics/pool")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["primary"]["size"] == settings.db_pool_size
+        assert data["replicas"] == []
+{%- endif %}
@@ -0,0 +1,187 @@
+"""
+Unit tests for the principal cache.
+"""
+import pytest
+from unittest.mock import AsyncMock
+
+from internal.entities.user import User, UserRole, UserStatus
+from internal.services.principal_cache import PrincipalCache
+from internal.services.user_service import UserService
+from pkg.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class InMemoryCache:
+    """Stand-in for the shared (Redis) tier."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, expire_seconds=None):
+        self.data[key] = value
+        return True
+
+    async def delete(self, key):
+        return self.data.pop(key, None) is not None
+
+    async def exists(self, key):
+        return key in self.data
+
+
+def make_user(**kwargs):
+    user = User(
+        email="alice@example.com",
+        username="alice",
+        status=UserStatus.ACTIVE,
+        is_verified=True,
+        **kwargs,
+    )
+    user.mark_clean()
+    return user
+
+
+class TestTTLCache:
+    """Tests for the in-process LRU."""
+
+    def test_entries_expire(self):
+        clock = FakeClock()
+        cache = TTLCache(ttl_seconds=10, clock=clock)
+        cache.set("a", 1)
+
+        clock.now = 9
+        assert cache.get("a") == 1
+        clock.now = 10
+        assert cache.get("a") is None
+
+    def test_least_recently_used_is_evicted(self):
+        cache = TTLCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert len(cache) == 2
+
+
+class TestPrincipalCache:
+    """Tests for PrincipalCache and its use in UserService."""
+
+    @pytest.fixture
+    def shared(self):
+        return InMemoryCache()
+
+    @pytest.fixture
+    def cache(self, shared):
+        return PrincipalCache(shared=shared)
+
+    @pytest.fixture
+    def mock_user_repo(self):
+        return AsyncMock()
+
+    @pytest.fixture
+    def user_service(self, mock_user_repo, cache):
+        return UserService(mock_user_repo, principal_cache=cache)
+
+    @pytest.mark.asyncio
+    async def test_get_principal_hits_repo_once(self, user_service, mock_user_repo):
+        """Repeated authentication is served from cache."""
+        user = make_user()
+        mock_user_repo.get_by_id.return_value = user
+
+        for _ in range(5):
+            principal = await user_service.get_principal(user.id)
+
+        assert principal.id == user.id
+        mock_user_repo.get_by_id.assert_called_once_with(user.id)
+
+    @pytest.mark.asyncio
+    async def test_returns_copies(self, cache):
+        """Mutating a returned principal does not alter the cache."""
+        user = make_user()
+        await cache.set(user)
+
+        first = await cache.get(user.id)
+        first.first_name = "Mallory"
+        second = await cache.get(user.id)
+
+        assert second.first_name == ""
+        assert first is not second
+        assert second.changed_fields == set()
+
+    @pytest.mark.asyncio
+    async def test_shared_tier_round_trip(self, shared):
+        """A principal cached by one process is readable by another."""
+        user = make_user(role=UserRole.ADMIN)
+        await PrincipalCache(shared=shared).set(user)
+
+        loaded = await PrincipalCache(shared=shared).get(user.id)
+
+        assert loaded.id == user.id
+        assert loaded.role == UserRole.ADMIN
+        assert loaded.status == UserStatus.ACTIVE
+        assert loaded.created_at == user.created_at
+        assert "hashed_password" not in next(iter(shared.data.values()))
+
+    @pytest.mark.asyncio
+    async def test_suspend_invalidates(self, user_service, mock_user_repo, cache, shared):
+        """A suspension is visible on the next authentication."""
+        user = make_user()
+        mock_user_repo.get_by_id.return_value = user
+        await user_service.get_principal(user.id)
+
+        suspended = make_user(id=user.id)
+        suspended.suspend()
+        mock_user_repo.update.return_value = suspended
+        await user_service.suspend_user(user.id)
+
+        assert await cache.get(user.id) is None
+        assert shared.data == {}
+        mock_user_repo.get_by_id.return_value = suspended
+        principal = await user_service.get_principal(user.id)
+        assert principal.status == UserStatus.SUSPENDED
+
+    @pytest.mark.asyncio
+    async def test_recached_old_row_is_dropped_after_commit(self, mock_user_repo, cache, shared):
+        """A concurrent read before the commit can't keep the old principal cached."""
+        pending = []
+        service = UserService(mock_user_repo, principal_cache=cache, after_commit=pending.append)
+        user = make_user()
+        suspended = make_user(id=user.id)
+        suspended.suspend()
+        mock_user_repo.get_by_id.return_value = user
+        mock_user_repo.update.return_value = suspended
+
+        await service.suspend_user(user.id)
+        # Another request reads the not-yet-committed (old) row
+        await cache.set(user)
+        for callback in pending:
+            await callback()
+
+        assert await cache.get(user.id) is None
+        assert shared.data == {}
+
+    @pytest.mark.asyncio
+    async def test_shared_tier_failure_falls_back(self, mock_user_repo):
+        """A broken shared tier degrades to the database."""
+        broken = AsyncMock()
+        broken.get.side_effect = ConnectionError("redis down")
+        broken.set.side_effect = ConnectionError("redis down")
+        service = UserService(mock_user_repo, principal_cache=PrincipalCache(shared=broken))
+        user = make_user()
+        mock_user_repo.get_by_id.return_value = user
+
+        principal = await service.get_principal(user.id)
+
+        assert principal.id == user.id
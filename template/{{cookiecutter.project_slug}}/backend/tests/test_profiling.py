@@ -0,0 +1,118 @@
+"""
+Tests for ProfilingMiddleware.
+"""
+import json
+import os
+import time
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient, ASGITransport
+
+from api.middleware.profiling import ProfilingMiddleware, sign_profile_request
+
+SECRET = "profiling-secret"
+
+
+def make_app(tmp_path, **options):
+    app = FastAPI()
+
+    @app.get("/work")
+    async def work():
+        return {"total": sum(i * i for i in range(20_000))}
+
+    app.add_middleware(ProfilingMiddleware, output_dir=str(tmp_path), **options)
+    return app
+
+
+def signed(method, path, **headers):
+    return {"X-Profile": sign_profile_request(SECRET, method, path), **headers}
+
+
+async def request(app, path, headers=None):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        return await client.get(path, headers=headers or {})
+
+
+class TestProfilingMiddleware:
+    """Tests for ProfilingMiddleware."""
+
+    @pytest.mark.asyncio
+    async def test_unsigned_request_is_not_profiled(self, tmp_path):
+        app = make_app(tmp_path, secret=SECRET)
+
+        response = await request(app, "/work")
+
+        assert response.status_code == 200
+        assert "x-profile-id" not in response.headers
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_signed_request_report_can_be_fetched(self, tmp_path):
+        app = make_app(tmp_path, secret=SECRET)
+
+        response = await request(app, "/work", signed("GET", "/work"))
+        report_id = response.headers["x-profile-id"]
+        report = await request(app, f"/_profiles/{report_id}", signed("GET", f"/_profiles/{report_id}"))
+
+        assert response.json()["total"] > 0
+        assert report.status_code == 200
+        assert report.headers["content-type"].startswith("text/html")
+        assert (tmp_path / f"{report_id}.html").exists()
+
+    @pytest.mark.asyncio
+    async def test_speedscope_format(self, tmp_path):
+        app = make_app(tmp_path, secret=SECRET)
+
+        response = await request(app, "/work", signed("GET", "/work", **{"X-Profile-Format": "speedscope"}))
+        report_path = tmp_path / f"{response.headers['x-profile-id']}.speedscope.json"
+
+        assert "speedscope" in json.loads(report_path.read_text())["$schema"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("header", [
+        sign_profile_request("wrong-secret", "GET", "/work"),
+        sign_profile_request(SECRET, "POST", "/work"),
+        sign_profile_request(SECRET, "GET", "/work", int(time.time()) - 3600),
+        "not-a-signature",
+    ])
+    async def test_invalid_signature_is_not_profiled(self, tmp_path, header):
+        app = make_app(tmp_path, secret=SECRET)
+
+        response = await request(app, "/work", {"X-Profile": header})
+
+        assert response.status_code == 200
+        assert "x-profile-id" not in response.headers
+
+    @pytest.mark.asyncio
+    async def test_reports_require_signature(self, tmp_path):
+        app = make_app(tmp_path, secret=SECRET)
+        report_id = (await request(app, "/work", signed("GET", "/work"))).headers["x-profile-id"]
+
+        assert (await request(app, f"/_profiles/{report_id}")).status_code == 403
+        missing = "0" * 32
+        assert (await request(app, f"/_profiles/{missing}", signed("GET", f"/_profiles/{missing}"))).status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_sample_rate(self, tmp_path):
+        app = make_app(tmp_path, sample_rate=1.0)
+
+        response = await request(app, "/work")
+
+        assert "x-profile-id" in response.headers
+        # Without a secret, reports cannot be fetched over HTTP
+        report_id = response.headers["x-profile-id"]
+        assert (await request(app, f"/_profiles/{report_id}")).status_code == 403
+
+    @pytest.mark.asyncio
+    async def test_oldest_reports_are_pruned(self, tmp_path):
+        app = make_app(tmp_path, secret=SECRET, max_reports=2)
+        old = [tmp_path / f"{i:032x}.html" for i in range(3)]
+        for age, path in enumerate(old):
+            path.write_text("old")
+            os.utime(path, (time.time() - 100 + age, time.time() - 100 + age))
+        (tmp_path / "notes.txt").write_text("not a report")
+
+        report_id = (await request(app, "/work", signed("GET", "/work"))).headers["x-profile-id"]
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == sorted([old[2].name, f"{report_id}.html", "notes.txt"])
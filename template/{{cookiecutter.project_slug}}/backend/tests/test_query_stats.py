@@ -0,0 +1,127 @@
+{%- if cookiecutter.database == 'postgresql' %}
+"""
+Tests for query statistics, the slow-query log and N+1 detection.
+"""
+import logging
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient, ASGITransport
+from prometheus_client import REGISTRY
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from api.middleware.query_stats import QueryStatsMiddleware
+from internal.adapters.db.connection import Base
+from internal.adapters.db.query_stats import instrument_engine, redact, track_queries
+from internal.adapters.db.unit_of_work import UnitOfWork
+from internal.entities.user import User
+from pkg.config.settings import settings
+
+
+@pytest.fixture
+async def factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'stats.db'}")
+    instrument_engine(engine)
+    instrument_engine(engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+class TestTrackQueries:
+    """Tests for track_queries()."""
+
+    @pytest.mark.asyncio
+    async def test_counts_statements(self, factory):
+        with track_queries() as stats:
+            async with UnitOfWork(factory) as uow:
+                await uow.users.create(User(email="a@example.com", username="alice"))
+                await uow.users.get_by_username("alice")
+
+        assert stats.count >= 2
+        assert stats.duration > 0
+
+    @pytest.mark.asyncio
+    async def test_untracked_statements_are_not_counted(self, factory):
+        with track_queries() as stats:
+            pass
+        async with UnitOfWork(factory) as uow:
+            await uow.users.get_by_username("alice")
+
+        assert stats.count == 0
+
+    @pytest.mark.asyncio
+    async def test_repeated_statement_is_flagged(self, factory, caplog):
+        with caplog.at_level(logging.WARNING, logger="internal.adapters.db.query_stats"):
+            with track_queries("GET /users") as stats:
+                async with UnitOfWork(factory) as uow:
+                    for i in range(settings.db_n_plus_one_threshold):
+                        await uow.users.get_by_username(f"user{i}")
+
+        assert stats.repeated(settings.db_n_plus_one_threshold)
+        assert "Possible N+1 in GET /users" in caplog.text
+
+
+class TestSlowQueryLog:
+    """Tests for the slow-query log."""
+
+    @pytest.mark.asyncio
+    async def test_slow_query_is_logged_redacted(self, factory, caplog, monkeypatch):
+        monkeypatch.setattr(settings, "db_slow_query_ms", 0.000001)
+
+        with caplog.at_level(logging.WARNING, logger="internal.adapters.db.query_stats"):
+            async with UnitOfWork(factory) as uow:
+                await uow.users.get_by_username("secret-name")
+
+        assert "Slow query" in caplog.text
+        assert "secret-name" not in caplog.text
+        assert "<str>" in caplog.text
+
+    def test_redact(self):
+        assert redact({"email": "a@b.c", "age": 3}) == {"email": "<str>", "age": "<int>"}
+        assert redact(("a@b.c", None)) == ["<str>", "<NoneType>"]
+        assert redact([("a",), ("b",)]) == [["<str>"], "... 2 rows"]
+
+
+class TestQueryStatsMiddleware:
+    """Tests for QueryStatsMiddleware."""
+
+    @pytest.mark.asyncio
+    async def test_server_timing_and_metrics(self, factory):
+        app = FastAPI()
+
+        @app.get("/stats-test/users/{count}")
+        async def lookup(count: int):
+            async with UnitOfWork(factory) as uow:
+                for i in range(count):
+                    await uow.users.get_by_username(f"user{i}")
+            return {}
+
+        app.add_middleware(QueryStatsMiddleware)
+        labels = {"method": "GET", "route": "/stats-test/users/{count}"}
+        before = REGISTRY.get_sample_value("db_n_plus_one_total", labels) or 0.0
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            few = await client.get("/stats-test/users/2")
+            many = await client.get(f"/stats-test/users/{settings.db_n_plus_one_threshold}")
+
+        assert 'desc="2 queries"' in few.headers["server-timing"]
+        assert f'desc="{settings.db_n_plus_one_threshold} queries"' in many.headers["server-timing"]
+        assert REGISTRY.get_sample_value("db_queries_per_request_count", labels) >= 2
+        assert REGISTRY.get_sample_value("db_n_plus_one_total", labels) == before + 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_methods_share_one_label(self):
+        app = FastAPI()
+        app.add_middleware(QueryStatsMiddleware)
+        labels = {"method": "OTHER", "route": "unmatched"}
+        before = REGISTRY.get_sample_value("db_queries_per_request_count", labels) or 0.0
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            for i in range(3):
+                await client.request(f"X{i}ZZ", "/stats-test/nowhere")
+
+        assert REGISTRY.get_sample_value("db_queries_per_request_count", labels) == before + 3
+        assert REGISTRY.get_sample_value("db_queries_per_request_count", {"method": "X0ZZ", "route": "unmatched"}) is None
+{%- endif %}
@@ -0,0 +1,267 @@
+"""
+Tests for the sliding-window rate limiter.
+"""
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient, ASGITransport
+
+from api.middleware.rate_limit import RateLimitMiddleware
+from pkg.ratelimit import LocalRateLimitBackend
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+async def fake_token_subject(token):
+    return {"alice-token": "alice", "bob-token": "bob"}.get(token)
+
+
+def make_app(backend, **kwargs):
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, backend=backend, **kwargs)
+
+    @app.get("/api/items")
+    async def items():
+        return {"ok": True}
+
+    @app.post("/api/auth/login")
+    async def login():
+        return {"ok": True}
+
+    return app
+
+
+class TestLocalBackend:
+    """Tests for the in-process sliding-window counter."""
+
+    @pytest.mark.asyncio
+    async def test_limit_within_window(self):
+        backend = LocalRateLimitBackend(clock=FakeClock(0))
+
+        decisions = [await backend.hit([("k", 3)], 60) for _ in range(4)]
+
+        assert [d.allowed for d in decisions] == [True, True, True, False]
+        assert decisions[2].remaining == 0
+        assert decisions[3].reset_after == 60
+
+    @pytest.mark.asyncio
+    async def test_previous_window_is_weighted(self):
+        clock = FakeClock(0)
+        backend = LocalRateLimitBackend(clock=clock)
+        for _ in range(10):
+            await backend.hit([("k", 10)], 60)
+
+        # Halfway into the next window, half of the previous 10 still count
+        clock.now = 90
+        allowed = [(await backend.hit([("k", 10)], 60)).allowed for _ in range(6)]
+
+        assert allowed == [True] * 5 + [False]
+
+    @pytest.mark.asyncio
+    async def test_all_or_nothing_across_keys(self):
+        backend = LocalRateLimitBackend(clock=FakeClock(0))
+        await backend.hit([("route", 1)], 60)
+
+        decision = await backend.hit([("client", 100), ("route", 1)], 60)
+
+        assert not decision.allowed
+        assert decision.limit == 1
+        # The denied request was not counted against the client key
+        assert (await backend.hit([("client", 1)], 60)).allowed
+
+    @pytest.mark.asyncio
+    async def test_idle_keys_are_evicted(self):
+        backend = LocalRateLimitBackend(max_keys=100, clock=FakeClock(0))
+
+        for i in range(1000):
+            await backend.hit([(f"ip:{i}", 5)], 60)
+
+        assert len(backend) == 100
+
+
+class TestRateLimitMiddleware:
+    """Tests for RateLimitMiddleware."""
+
+    @pytest.mark.asyncio
+    async def test_ip_limit_and_headers(self):
+        app = make_app(LocalRateLimitBackend(), requests_per_minute=2)
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            first = await client.get("/api/items")
+            await client.get("/api/items")
+            denied = await client.get("/api/items")
+
+        assert first.headers["X-RateLimit-Limit"] == "2"
+        assert first.headers["X-RateLimit-Remaining"] == "1"
+        assert denied.status_code == 429
+        assert int(denied.headers["Retry-After"]) > 0
+
+    @pytest.mark.asyncio
+    async def test_route_limit(self):
+        app = make_app(
+            LocalRateLimitBackend(),
+            requests_per_minute=100,
+            route_limits={"/api/auth/login": 1},
+        )
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            assert (await client.post("/api/auth/login")).status_code == 200
+            assert (await client.post("/api/auth/login")).status_code == 429
+            assert (await client.get("/api/items")).status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_users_have_separate_quotas(self):
+        app = make_app(
+            LocalRateLimitBackend(),
+            requests_per_minute=100,
+            user_requests_per_minute=2,
+            token_subject=fake_token_subject,
+        )
+        alice = {"Authorization": "Bearer alice-token"}
+        bob = {"Authorization": "Bearer bob-token"}
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            codes = [(await client.get("/api/items", headers=alice)).status_code for _ in range(3)]
+            assert (await client.get("/api/items", headers=bob)).status_code == 200
+            assert (await client.get("/api/items")).status_code == 200
+
+        assert codes == [200, 200, 429]
+
+    @pytest.mark.asyncio
+    async def test_user_quota_does_not_replace_ip_limit(self):
+        app = make_app(
+            LocalRateLimitBackend(),
+            requests_per_minute=2,
+            user_requests_per_minute=100,
+            token_subject=fake_token_subject,
+        )
+        alice = {"Authorization": "Bearer alice-token"}
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            codes = [(await client.get("/api/items", headers=alice)).status_code for _ in range(3)]
+
+        assert codes == [200, 200, 429]
+
+    @pytest.mark.asyncio
+    async def test_rotating_tokens_do_not_bypass_route_limit(self):
+        app = make_app(
+            LocalRateLimitBackend(),
+            requests_per_minute=100,
+            user_requests_per_minute=100,
+            route_limits={"/api/auth/login": 3},
+            token_subject=fake_token_subject,
+        )
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            codes = [
+                (await client.post("/api/auth/login", headers={"Authorization": f"Bearer junk-{i}"})).status_code
+                for i in range(50)
+            ]
+
+        assert codes.count(200) == 3
+
+    @pytest.mark.asyncio
+    async def test_backend_failure_falls_back_to_local_limits(self):
+        class BrokenBackend(LocalRateLimitBackend):
+            async def hit(self, checks, window_seconds):
+                raise ConnectionError("redis down")
+
+        app = make_app(BrokenBackend(), requests_per_minute=2)
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            codes = [(await client.get("/api/items")).status_code for _ in range(3)]
+
+        assert codes == [200, 200, 429]
+
+    @pytest.mark.asyncio
+    async def test_health_is_not_limited(self):
+        app = make_app(LocalRateLimitBackend(), requests_per_minute=1)
+
+        @app.get("/health")
+        async def health():
+            return {"status": "healthy"}
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            codes = [(await client.get("/health")).status_code for _ in range(3)]
+
+        assert codes == [200, 200, 200]
+{%- if cookiecutter.auth_strategy == 'jwt_builtin' %}
+
+
+class TestTokenSubject:
+    """Tests for the default user identity: only verified access tokens count."""
+
+    @pytest.mark.asyncio
+    async def test_valid_access_token(self):
+        from internal.services.auth_deps import create_access_token, token_subject
+
+        assert await token_subject(create_access_token({"sub": "user-1"})) == "user-1"
+
+    @pytest.mark.asyncio
+    async def test_forged_and_refresh_tokens_are_ignored(self):
+        from internal.services.auth_deps import create_refresh_token, token_subject
+
+        assert await token_subject("junk") is None
+        assert await token_subject(create_refresh_token({"sub": "user-1"})) is None
+{%- endif %}
+{%- if cookiecutter.use_redis == 'yes' %}
+
+
+class TestRedisBackend:
+    """Tests for the Lua backend, against fakeredis."""
+
+    @pytest.fixture
+    def backend(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")
+        from pkg.ratelimit import RedisRateLimitBackend
+        return RedisRateLimitBackend(fakeredis.FakeAsyncRedis())
+
+    @pytest.mark.asyncio
+    async def test_limit_is_shared(self, backend):
+        """Two middlewares (workers) on the same Redis share one budget."""
+        apps = [make_app(backend, requests_per_minute=3) for _ in range(2)]
+        codes = []
+        for i in range(4):
+            app = apps[i % 2]
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                codes.append((await client.get("/api/items")).status_code)
+
+        assert codes == [200, 200, 200, 429]
+
+    @pytest.mark.asyncio
+    async def test_all_or_nothing_across_keys(self, backend):
+        await backend.hit([("route", 1)], 60)
+
+        decision = await backend.hit([("client", 100), ("route", 1)], 60)
+
+        assert not decision.allowed
+        assert decision.limit == 1
+        assert decision.remaining == 0
+        assert (await backend.hit([("client", 1)], 60)).allowed
+
+    @pytest.mark.asyncio
+    async def test_keys_of_one_hit_share_a_cluster_slot(self, backend):
+        from redis.crc import key_slot
+
+        script = backend._script
+        calls = []
+
+        async def recording_script(keys, args):
+            calls.append(keys)
+            return await script(keys=keys, args=args)
+
+        backend._script = recording_script
+        app = make_app(
+            backend,
+            requests_per_minute=100,
+            user_requests_per_minute=100,
+            route_limits={"/api/auth/login": 10},
+            token_subject=fake_token_subject,
+        )
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            await client.post("/api/auth/login", headers={"Authorization": "Bearer alice-token"})
+
+        assert [len(keys) for keys in calls] == [2, 1]
+        for keys in calls:
+            assert len({key_slot(key.encode()) for key in keys}) == 1
+{%- endif %}
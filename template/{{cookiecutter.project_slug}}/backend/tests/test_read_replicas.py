@@ -0,0 +1,212 @@
+{%- if cookiecutter.database == 'postgresql' %}
+"""
+Tests for read-replica routing.
+Three file-backed SQLite databases stand in for a PostgreSQL primary and
+two replicas; each is seeded with a different user so tests can tell
+which database answered.
+"""
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from internal.adapters.db.connection import Base
+from internal.adapters.db.routing import ReplicaPool, RoutingSession
+from internal.adapters.db.unit_of_work import UnitOfWork
+from internal.entities.user import User
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+async def make_engine(path, seed_username=None):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    if seed_username:
+        factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with UnitOfWork(factory) as uow:
+            await uow.users.create(User(email=f"{seed_username}@example.com", username=seed_username))
+    return engine
+
+
+@pytest.fixture
+async def databases(tmp_path):
+    primary = await make_engine(tmp_path / "primary.db", "primary")
+    replica1 = await make_engine(tmp_path / "replica1.db", "replica1")
+    replica2 = await make_engine(tmp_path / "replica2.db", "replica2")
+    yield primary, replica1, replica2
+    for engine in (primary, replica1, replica2):
+        await engine.dispose()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def session_factory(primary, replicas):
+    return async_sessionmaker(
+        primary,
+        class_=AsyncSession,
+        sync_session_class=RoutingSession,
+        replicas=replicas,
+        expire_on_commit=False,
+    )
+
+
+async def answered_by(factory) -> str:
+    """Username seeded in the database that served the read."""
+    async with UnitOfWork(factory) as uow:
+        users = await uow.users.list_all()
+    return users[0].username
+
+
+class TestRoutingSession:
+    """Tests for RoutingSession."""
+
+    @pytest.mark.asyncio
+    async def test_without_replicas_uses_primary(self, databases):
+        primary, _, _ = databases
+
+        assert await answered_by(session_factory(primary, None)) == "primary"
+
+    @pytest.mark.asyncio
+    async def test_reads_go_to_replica_writes_to_primary(self, databases):
+        primary, replica1, _ = databases
+        factory = session_factory(primary, ReplicaPool([replica1]))
+
+        async with UnitOfWork(factory) as uow:
+            assert await uow.users.get_by_username("replica1") is not None
+            assert await uow.users.get_by_username("primary") is None
+
+        async with UnitOfWork(factory) as uow:
+            await uow.users.create(User(email="new@example.com", username="newuser"))
+
+        async with UnitOfWork(session_factory(primary, None)) as uow:
+            assert await uow.users.get_by_username("newuser") is not None
+
+    @pytest.mark.asyncio
+    async def test_read_your_writes(self, databases):
+        """After a write the rest of the session reads from the primary."""
+        primary, replica1, _ = databases
+        factory = session_factory(primary, ReplicaPool([replica1]))
+
+        async with UnitOfWork(factory) as uow:
+            await uow.users.create(User(email="new@example.com", username="newuser"))
+            assert await uow.users.get_by_username("newuser") is not None
+            assert await uow.users.get_by_username("primary") is not None
+            assert uow.session.sync_session.wrote
+
+    @pytest.mark.asyncio
+    async def test_round_robin(self, databases):
+        primary, replica1, replica2 = databases
+        factory = session_factory(primary, ReplicaPool([replica1, replica2]))
+
+        served = [await answered_by(factory) for _ in range(4)]
+
+        assert served == ["replica1", "replica2", "replica1", "replica2"]
+
+    @pytest.mark.asyncio
+    async def test_least_connections(self, databases):
+        primary, replica1, replica2 = databases
+        factory = session_factory(primary, ReplicaPool([replica1, replica2], policy="least_connections"))
+
+        async with replica1.connect():
+            assert await answered_by(factory) == "replica2"
+        async with replica2.connect():
+            assert await answered_by(factory) == "replica1"
+
+    def test_unknown_policy(self):
+        with pytest.raises(ValueError):
+            ReplicaPool([], policy="random")
+
+
+class TestReplicaHealth:
+    """Tests for replica ejection and re-admission."""
+
+    @pytest.mark.asyncio
+    async def test_unreachable_replica_is_ejected(self, databases, tmp_path, clock):
+        primary, replica1, _ = databases
+        dead = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'dead.db'}")
+        pool = ReplicaPool([dead, replica1], eject_seconds=30, clock=clock)
+        factory = session_factory(primary, pool)
+
+        # The read that hits the dead replica is retried on the next one
+        assert await answered_by(factory) == "replica1"
+
+        assert not pool.is_healthy(dead.sync_engine)
+        assert [await answered_by(factory) for _ in range(3)] == ["replica1"] * 3
+
+        clock.now += 30
+        assert pool.is_healthy(dead.sync_engine)
+        await dead.dispose()
+
+    @pytest.mark.asyncio
+    async def test_read_falls_back_to_primary_when_every_replica_fails(self, databases, tmp_path, clock):
+        primary, _, _ = databases
+        dead = [
+            create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / f'dead{i}.db'}")
+            for i in range(2)
+        ]
+        pool = ReplicaPool(dead, clock=clock)
+
+        assert await answered_by(session_factory(primary, pool)) == "primary"
+        assert not any(pool.is_healthy(engine.sync_engine) for engine in dead)
+        for engine in dead:
+            await engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_scalar_reads_are_retried(self, databases, tmp_path, clock):
+        from sqlalchemy import select
+
+        from internal.adapters.db.models import UserModel
+
+        primary, replica1, _ = databases
+        dead = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'dead.db'}")
+        pool = ReplicaPool([dead, replica1], clock=clock)
+
+        async with session_factory(primary, pool)() as session:
+            assert await session.scalar(select(UserModel.username)) == "replica1"
+
+        assert not pool.is_healthy(dead.sync_engine)
+        await dead.dispose()
+
+    @pytest.mark.asyncio
+    async def test_query_errors_are_not_retried(self, databases, clock):
+        from sqlalchemy import text
+        from sqlalchemy.exc import OperationalError
+
+        primary, replica1, _ = databases
+        pool = ReplicaPool([replica1], clock=clock)
+
+        async with session_factory(primary, pool)() as session:
+            with pytest.raises(OperationalError):
+                await session.execute(text("SELECT * FROM no_such_table"))
+
+        assert pool.is_healthy(replica1.sync_engine)
+
+    @pytest.mark.asyncio
+    async def test_all_replicas_ejected_falls_back_to_primary(self, databases, clock):
+        primary, replica1, _ = databases
+        pool = ReplicaPool([replica1], clock=clock)
+        pool.eject(replica1.sync_engine)
+
+        assert await answered_by(session_factory(primary, pool)) == "primary"
+
+    @pytest.mark.asyncio
+    async def test_check_health(self, databases, tmp_path, clock):
+        primary, replica1, _ = databases
+        dead = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'dead.db'}")
+        pool = ReplicaPool([dead, replica1], clock=clock)
+        pool.eject(replica1.sync_engine)
+
+        await pool.check_health()
+
+        assert not pool.is_healthy(dead.sync_engine)
+        assert pool.is_healthy(replica1.sync_engine)
+        await dead.dispose()
+{%- endif %}
@@ -0,0 +1,222 @@
+{%- if cookiecutter.use_redis == 'yes' %}
+"""
+Tests for RedisCacheRepository batch operations.
+"""
+import fakeredis
+import pytest
+from fakeredis.aioredis import FakeConnection
+from redis.asyncio.cluster import RedisCluster
+from redis.asyncio.sentinel import SentinelConnectionPool
+from redis.exceptions import ConnectionError
+
+from internal.adapters.cache import redis_cache
+from internal.adapters.cache.redis_cache import (
+    InstrumentedConnectionPool,
+    RedisCacheRepository,
+    create_redis_client,
+    key_batches,
+)
+from pkg.config.settings import settings
+
+
+@pytest.fixture
+def client():
+    return fakeredis.FakeAsyncRedis(decode_responses=True)
+
+
+@pytest.fixture
+def repo(client):
+    return RedisCacheRepository(client)
+
+
+class TestKeyBatches:
+    """Tests for batch sizing."""
+
+    def test_bounded_by_key_count(self):
+        batches = list(key_batches([f"k{i}" for i in range(25)], max_keys=10, max_bytes=1 << 20))
+
+        assert [len(b) for b in batches] == [10, 10, 5]
+
+    def test_bounded_by_payload_size(self):
+        values = {"a": "x" * 60, "b": "x" * 60, "c": "x" * 10}
+
+        batches = list(key_batches(values, max_keys=100, max_bytes=100, sizes=values))
+
+        assert batches == [["a"], ["b", "c"]]
+
+    def test_oversized_value_gets_its_own_batch(self):
+        values = {"a": "x" * 500, "b": "y"}
+
+        assert list(key_batches(values, max_keys=100, max_bytes=100, sizes=values)) == [["a"], ["b"]]
+
+
+class TestBatchOperations:
+    """Tests for get_many / set_many / delete_many / delete_pattern."""
+
+    @pytest.mark.asyncio
+    async def test_set_many_and_get_many(self, repo):
+        repo.BATCH_MAX_KEYS = 7
+        items = {f"user:{i}": str(i) for i in range(50)}
+
+        assert await repo.set_many(items) == 50
+        found = await repo.get_many(list(items) + ["user:missing"])
+
+        assert found == items
+
+    @pytest.mark.asyncio
+    async def test_set_many_with_one_ttl(self, repo, client):
+        await repo.set_many({"a": "1", "b": "2"}, expire_seconds=30)
+
+        assert 0 < await client.ttl("a") <= 30
+        assert 0 < await client.ttl("b") <= 30
+
+    @pytest.mark.asyncio
+    async def test_set_many_with_per_key_ttl(self, repo, client):
+        await repo.set_many({"short": "1", "long": "2", "forever": "3"}, expire_seconds={"short": 5, "long": 500})
+
+        assert 0 < await client.ttl("short") <= 5
+        assert 5 < await client.ttl("long") <= 500
+        assert await client.ttl("forever") == -1
+
+    @pytest.mark.asyncio
+    async def test_delete_many_counts_existing_keys(self, repo):
+        repo.BATCH_MAX_KEYS = 3
+        await repo.set_many({f"k{i}": "v" for i in range(10)})
+
+        assert await repo.delete_many([f"k{i}" for i in range(12)]) == 10
+        assert await repo.get_many([f"k{i}" for i in range(10)]) == {}
+
+    @pytest.mark.asyncio
+    async def test_delete_pattern(self, repo):
+        repo.BATCH_MAX_KEYS = 4
+        await repo.set_many({f"user:42:{i}": "v" for i in range(10)})
+        await repo.set_many({"user:7:a": "v", "user:420": "v"})
+
+        assert await repo.delete_pattern("user:42:*") == 10
+        assert await repo.get_many(["user:7:a", "user:420"]) == {"user:7:a": "v", "user:420": "v"}
+
+    @pytest.mark.asyncio
+    async def test_set_with_and_without_ttl(self, repo, client):
+        await repo.set("a", "1", expire_seconds=10)
+        await repo.set("b", "2")
+
+        assert 0 < await client.ttl("a") <= 10
+        assert await client.ttl("b") == -1
+
+
+class TestPipeline:
+    """Tests for pipeline()."""
+
+    @pytest.mark.asyncio
+    async def test_writes_are_sent_on_exit(self, repo):
+        await repo.set("old", "1")
+
+        async with repo.pipeline() as batch:
+            batch.set("a", "1", expire_seconds=60)
+            batch.delete("old")
+            assert await repo.get("a") is None
+
+        assert await repo.get_many(["a", "old"]) == {"a": "1"}
+
+    @pytest.mark.asyncio
+    async def test_nothing_is_sent_when_block_raises(self, repo):
+        with pytest.raises(RuntimeError):
+            async with repo.pipeline(transaction=True) as batch:
+                batch.set("a", "1")
+                raise RuntimeError("abort")
+
+        assert await repo.get("a") is None
+
+
+class TestCreateRedisClient:
+    """Tests for the client built from settings."""
+
+    def test_standalone_uses_instrumented_blocking_pool(self, monkeypatch):
+        monkeypatch.setattr(settings, "redis_max_connections", 7)
+        monkeypatch.setattr(settings, "redis_pool_timeout_seconds", 1.5)
+        monkeypatch.setattr(settings, "redis_socket_timeout_seconds", 3.0)
+        monkeypatch.setattr(settings, "redis_health_check_interval_seconds", 15)
+
+        client = create_redis_client(decode_responses=False)
+        pool = client.connection_pool
+
+        assert isinstance(pool, InstrumentedConnectionPool)
+        assert pool.max_connections == 7
+        assert pool.timeout == 1.5
+        assert pool.connection_kwargs["socket_timeout"] == 3.0
+        assert pool.connection_kwargs["health_check_interval"] == 15
+        assert pool.connection_kwargs["decode_responses"] is False
+
+    def test_sentinel(self, monkeypatch):
+        monkeypatch.setattr(settings, "redis_mode", "sentinel")
+        monkeypatch.setattr(settings, "redis_sentinels", ["s1:26379", "s2:26379"])
+        monkeypatch.setattr(settings, "redis_sentinel_master", "cache")
+
+        pool = create_redis_client().connection_pool
+
+        assert isinstance(pool, SentinelConnectionPool)
+        assert pool.service_name == "cache"
+        assert [s.connection_pool.connection_kwargs["host"] for s in pool.sentinel_manager.sentinels] == ["s1", "s2"]
+
+    def test_cluster(self, monkeypatch):
+        monkeypatch.setattr(settings, "redis_mode", "cluster")
+        monkeypatch.setattr(settings, "redis_cluster_nodes", ["n1:7000", "n2:7001"])
+
+        client = create_redis_client()
+
+        assert isinstance(client, RedisCluster)
+        assert [(n.host, n.port) for n in client.nodes_manager.startup_nodes.values()] == [("n1", 7000), ("n2", 7001)]
+
+    def test_unknown_mode(self, monkeypatch):
+        monkeypatch.setattr(settings, "redis_mode", "replicated")
+
+        with pytest.raises(ValueError):
+            create_redis_client()
+
+
+class TestPoolMetrics:
+    """Tests for pool instrumentation and redis_stats()."""
+
+    @pytest.mark.asyncio
+    async def test_pool_counts_waits_and_timeouts(self):
+        pool = InstrumentedConnectionPool(
+            connection_class=FakeConnection,
+            server=fakeredis.FakeServer(),
+            max_connections=1,
+            timeout=0.05,
+        )
+        held = await pool.get_connection()
+
+        with pytest.raises(ConnectionError):
+            await pool.get_connection()
+        await pool.release(held)
+
+        assert pool.checkouts == 2
+        assert pool.timeouts == 1
+        assert pool.wait_seconds_total >= 0.05
+
+    @pytest.mark.asyncio
+    async def test_stats_and_shutdown(self, monkeypatch):
+        pool = InstrumentedConnectionPool(
+            connection_class=FakeConnection,
+            server=fakeredis.FakeServer(),
+            max_connections=4,
+            decode_responses=True,
+        )
+        monkeypatch.setattr(redis_cache, "create_redis_client", lambda decode_responses=True: redis_cache.redis.Redis.from_pool(pool))
+        await redis_cache.init_redis()
+        client = redis_cache.get_redis()
+        await client.set("k", "v")
+
+        stats = redis_cache.redis_stats()
+
+        assert stats["connections_idle"] == 1
+        assert stats["connections_max"] == 4
+        assert stats["pool_checkouts"] == 1
+        assert stats["pool_utilization"] == 0.0
+
+        await redis_cache.close_redis()
+        with pytest.raises(RuntimeError):
+            redis_cache.get_redis()
+        assert redis_cache.redis_stats() is None
+{%- endif %}
@@ -0,0 +1,71 @@
+"""
+Unit tests for the XSS sanitizer engine.
+"""
+import json
+
+import pytest
+
+from api.middleware.sanitize import Sanitizer, sanitize_input
+
+
+class TestSanitizer:
+    """Tests for Sanitizer."""
+
+    @pytest.fixture
+    def sanitizer(self):
+        return Sanitizer()
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ("<script>alert(1)</script>hello", "hello"),
+            ('<img src=x onerror="alert(1)">', "&lt;img src=x &gt;"),
+            ("onclick=alert(1)", ""),
+            ("go to javascript:alert(1)", "go to alert(1)"),
+            ("width: expression(alert(1))", "width: alert(1))"),
+            ("<iframe src='x'>", ""),
+            ("Tom & Jerry", "Tom &amp; Jerry"),
+            ('say "hi"', "say &quot;hi&quot;"),
+            ("  plain text  ", "plain text"),
+        ],
+    )
+    def test_sanitize_string(self, sanitizer, value, expected):
+        assert sanitizer.sanitize_string(value) == expected
+
+    def test_removal_cannot_assemble_new_tag(self, sanitizer):
+        """Patterns are reapplied until nothing matches."""
+        assert sanitizer.sanitize_string("<scr<script>ipt>x") == "x"
+        assert "javascript:" not in sanitizer.sanitize_string("javajavascript:script:alert(1)")
+
+    def test_excluded_fields_untouched(self, sanitizer):
+        data = {"Password": "  <p@ss>  ", "nested": {"token": "a&b"}, "name": " <b>x</b> "}
+
+        result = sanitizer.sanitize(data)
+
+        assert result["Password"] == "  <p@ss>  "
+        assert result["nested"]["token"] == "a&b"
+        assert result["name"] == "&lt;b&gt;x&lt;/b&gt;"
+
+    def test_without_escaping_prefilter_still_catches_handlers(self):
+        sanitizer = Sanitizer(escape_html=False)
+
+        assert sanitizer.sanitize_string("a > b") == "a > b"
+        assert sanitizer.sanitize_string("x onload=steal()") == "x"
+
+    def test_extra_patterns(self):
+        sanitizer = Sanitizer(extra_patterns=[r"badword"])
+
+        assert sanitizer.sanitize_string("a BADWORD b") == "a  b"
+
+    def test_sanitize_json_falls_back_for_big_integers(self, sanitizer):
+        body = json.dumps({"n": 2 ** 70, "s": "<script>x</script>"}).encode()
+
+        result = json.loads(sanitizer.sanitize_json(body))
+
+        assert result == {"n": 2 ** 70, "s": ""}
+
+    def test_sanitize_json_rejects_invalid(self, sanitizer):
+        assert sanitizer.sanitize_json(b"{not json") is None
+
+    def test_sanitize_input(self):
+        assert sanitize_input(["<b>", {"a": "<i>"}]) == ["&lt;b&gt;", {"a": "&lt;i&gt;"}]
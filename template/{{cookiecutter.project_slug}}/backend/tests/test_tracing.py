@@ -0,0 +1,201 @@
+"""
+Tests for OpenTelemetry tracing.
+Spans are collected by an in-memory exporter; no collector is needed.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from httpx import AsyncClient, ASGITransport
+from opentelemetry import trace
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+{%- if cookiecutter.database == 'postgresql' %}
+import sqlalchemy.ext.asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+{%- endif %}
+
+from pkg.tracing import instrument_app, setup_tracing, trace_class, untrace_class
+{%- if cookiecutter.database == 'postgresql' %}
+from internal.adapters.db.connection import Base
+from internal.adapters.db.unit_of_work import UnitOfWork
+from internal.entities.user import User
+{%- endif %}
+{%- if cookiecutter.use_redis == 'yes' %}
+from internal.adapters.cache.redis_cache import RedisCacheRepository
+{%- endif %}
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+
+@pytest.fixture(scope="module")
+def exporter():
+    exporter = InMemorySpanExporter()
+    setup_tracing(exporter=exporter)
+    return exporter
+
+
+@pytest.fixture
+def spans(exporter):
+    """Each test starts with no finished spans."""
+    exporter.clear()
+    yield exporter
+    exporter.clear()
+
+
+def names(exporter):
+    return [span.name for span in exporter.get_finished_spans()]
+
+
+class Repository:
+    async def find(self, key):
+        return key
+
+    async def fail(self):
+        raise ValueError("boom")
+
+    def sync_method(self):
+        return "sync"
+
+
+class TestTraceClass:
+    """Tests for trace_class()."""
+
+    @pytest.mark.asyncio
+    async def test_public_async_methods_get_spans(self, spans):
+        trace_class(Repository)
+        try:
+            assert await Repository().find("a") == "a"
+            assert Repository().sync_method() == "sync"
+        finally:
+            untrace_class(Repository)
+
+        assert names(spans) == ["Repository.find"]
+
+    @pytest.mark.asyncio
+    async def test_exceptions_are_recorded(self, spans):
+        trace_class(Repository)
+        try:
+            with pytest.raises(ValueError):
+                await Repository().fail()
+        finally:
+            untrace_class(Repository)
+
+        (span,) = spans.get_finished_spans()
+        assert span.status.status_code == trace.StatusCode.ERROR
+        assert span.events[0].name == "exception"
+
+    @pytest.mark.asyncio
+    async def test_untrace_restores_methods(self, spans):
+        trace_class(Repository)
+        trace_class(Repository)
+        untrace_class(Repository)
+
+        await Repository().find("a")
+
+        assert names(spans) == []
+
+
+class TestRequestSpans:
+    """Tests for instrument_app()."""
+
+    @pytest.mark.asyncio
+    async def test_request_span_uses_route_template(self, spans):
+        app = FastAPI()
+        router = APIRouter()
+
+        @router.get("/items/{item_id}")
+        async def get_item(item_id: int):
+            with trace.get_tracer(__name__).start_as_current_span("handler"):
+                return {"id": item_id}
+
+        app.include_router(router, prefix="/api")
+        instrument_app(app)
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get(
+                "/api/items/1",
+                headers={"traceparent": "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"},
+            )
+
+        assert response.status_code == 200
+        finished = {span.name: span for span in spans.get_finished_spans()}
+        server = finished["GET /api/items/{item_id}"]
+        # The incoming trace context is continued, and the handler is a child
+        assert format(server.context.trace_id, "032x") == "0af7651916cd43dd8448eb211c80319c"
+        assert finished["handler"].parent.span_id == server.context.span_id
+{%- if cookiecutter.database == 'postgresql' %}
+
+
+class TestRepositorySpans:
+    """SQLAlchemyUserRepository calls wrap the SQL they run."""
+
+    @pytest.mark.asyncio
+    async def test_repository_and_sql_spans(self, spans, tmp_path):
+        # Engines created after setup_tracing() are instrumented as well
+        engine = sqlalchemy.ext.asyncio.create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'trace.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        spans.clear()
+
+        async with UnitOfWork(factory) as uow:
+            await uow.users.create(User(email="t@example.com", username="traced"))
+            await uow.users.get_by_username("traced")
+        await engine.dispose()
+
+        finished = spans.get_finished_spans()
+        repo_spans = {span.name: span for span in finished if span.name.startswith("SQLAlchemyUserRepository.")}
+        assert set(repo_spans) >= {"SQLAlchemyUserRepository.create", "SQLAlchemyUserRepository.get_by_username"}
+        lookup = repo_spans["SQLAlchemyUserRepository.get_by_username"]
+        sql = [span for span in finished if span.parent and span.parent.span_id == lookup.context.span_id]
+        assert sql and sql[0].attributes.get("db.statement", "").startswith("SELECT")
+{%- endif %}
+{%- if cookiecutter.use_redis == 'yes' %}
+
+
+class TestCacheSpans:
+    """RedisCacheRepository calls wrap the Redis commands they send."""
+
+    @pytest.mark.asyncio
+    async def test_cache_and_command_spans(self, spans):
+        import fakeredis
+
+        cache = RedisCacheRepository(fakeredis.FakeAsyncRedis(decode_responses=True))
+
+        await cache.set("key", "value")
+        assert await cache.get("key") == "value"
+
+        finished = {span.name: span for span in spans.get_finished_spans()}
+        assert "RedisCacheRepository.get" in finished
+        assert finished["GET"].parent.span_id == finished["RedisCacheRepository.get"].context.span_id
+{%- endif %}
+
+
+class TestSampling:
+    """settings.tracing_sample_ratio controls which new traces are kept."""
+
+    @pytest.mark.parametrize("ratio,expected", [("0", 0), ("1", 1)])
+    def test_sample_ratio(self, ratio, expected):
+        # A tracer provider can only be installed once per process
+        script = (
+            "from opentelemetry import trace\n"
+            "from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter\n"
+            "from pkg.tracing import setup_tracing\n"
+            "exporter = InMemorySpanExporter()\n"
+            "setup_tracing(exporter=exporter)\n"
+            "with trace.get_tracer('test').start_as_current_span('work'):\n"
+            "    pass\n"
+            "print(len(exporter.get_finished_spans()))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=BACKEND_DIR,
+            env={**os.environ, "TRACING_SAMPLE_RATIO": ratio},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert result.stdout.strip().splitlines()[-1] == str(expected)
@@ -0,0 +1,310 @@
+"""
+Tests for the typed cache-aside layer and its stampede protection.
+"""
+import asyncio
+from typing import List, Optional
+
+import pytest
+from pydantic import BaseModel
+
+from internal.entities.user import User
+from pkg.cache import MemoryCacheBackend, TypedCache, cached
+
+
+class FakeClock:
+    def __init__(self, now=1_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class BrokenCache:
+    """A store that is down."""
+
+    async def get(self, key):
+        raise ConnectionError("down")
+
+    async def set(self, key, value, expire_seconds=None):
+        raise ConnectionError("down")
+
+    async def delete(self, key):
+        raise ConnectionError("down")
+
+
+class Summary(BaseModel):
+    total: int
+    names: List[str]
+
+
+class CountingLoader:
+    def __init__(self, value=42, delay=0.0):
+        self.value = value
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.value
+
+
+class TestTypedCache:
+    """Tests for TypedCache.get_or_load()."""
+
+    @pytest.mark.asyncio
+    async def test_second_read_is_a_hit(self):
+        cache = TypedCache(MemoryCacheBackend())
+        loader = CountingLoader()
+
+        assert await cache.get_or_load("k", loader, ttl=60, type_=int) == 42
+        assert await cache.get_or_load("k", loader, ttl=60, type_=int) == 42
+
+        assert loader.calls == 1
+        assert cache.stats["hits"] == 1
+        assert cache.stats["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_values_come_back_typed(self):
+        cache = TypedCache(MemoryCacheBackend())
+        user = User(email="alice@example.com", username="alice")
+        summary = Summary(total=2, names=["a", "b"])
+
+        await cache.get_or_load("user", CountingLoader(user), ttl=60, type_=User)
+        await cache.get_or_load("summary", CountingLoader(summary), ttl=60, type_=Summary)
+        cached_user = await cache.get_or_load("user", CountingLoader(), ttl=60, type_=User)
+        cached_summary = await cache.get_or_load("summary", CountingLoader(), ttl=60, type_=Summary)
+
+        assert isinstance(cached_user, User)
+        assert cached_user.id == user.id
+        assert cached_user.created_at == user.created_at
+        assert cached_summary == summary
+
+    @pytest.mark.asyncio
+    async def test_none_is_cached(self):
+        cache = TypedCache(MemoryCacheBackend())
+        loader = CountingLoader(None)
+
+        for _ in range(3):
+            assert await cache.get_or_load("k", loader, ttl=60, type_=Optional[User]) is None
+
+        assert loader.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_value_of_another_type_is_a_miss(self):
+        cache = TypedCache(MemoryCacheBackend())
+        await cache.get_or_load("k", CountingLoader("not a number"), ttl=60)
+        loader = CountingLoader(7)
+
+        assert await cache.get_or_load("k", loader, ttl=60, type_=int) == 7
+        assert loader.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self):
+        cache = TypedCache(MemoryCacheBackend())
+        loader = CountingLoader(delay=0.05)
+
+        results = await asyncio.gather(
+            *(cache.get_or_load("hot", loader, ttl=60, type_=int) for _ in range(50))
+        )
+
+        assert results == [42] * 50
+        assert loader.calls == 1
+        assert cache.stats["coalesced"] == 49
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_load(self):
+        cache = TypedCache(MemoryCacheBackend())
+        loader = CountingLoader(delay=0.05)
+
+        first = asyncio.ensure_future(cache.get_or_load("hot", loader, ttl=60, type_=int))
+        second = asyncio.ensure_future(cache.get_or_load("hot", loader, ttl=60, type_=int))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert await second == 42
+        assert loader.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_loader_errors_reach_every_waiter_and_are_not_cached(self):
+        cache = TypedCache(MemoryCacheBackend())
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("db down")
+
+        results = await asyncio.gather(
+            *(cache.get_or_load("k", failing, ttl=60) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert await cache.get_or_load("k", CountingLoader(), ttl=60) == 42
+
+    @pytest.mark.asyncio
+    async def test_store_outage_falls_back_to_loader(self):
+        cache = TypedCache(BrokenCache())
+        loader = CountingLoader()
+
+        assert await cache.get_or_load("k", loader, ttl=60) == 42
+        assert await cache.invalidate("k") is False
+        assert cache.stats["errors"] == 3
+
+
+class TestXFetch:
+    """Tests for probabilistic early expiration."""
+
+    @pytest.mark.asyncio
+    async def test_refreshes_early_near_expiry(self):
+        clock = FakeClock()
+        cache = TypedCache(MemoryCacheBackend(), beta=1e9, clock=clock)
+
+        async def slow():
+            clock.now += 1  # the load takes a second
+            return 1
+
+        await cache.get_or_load("k", slow, ttl=60)
+        # 30s before expiry, but beta is huge: the read refreshes
+        clock.now += 30
+        loader = CountingLoader(2)
+
+        assert await cache.get_or_load("k", loader, ttl=60) == 2
+        assert loader.calls == 1
+        assert cache.stats["early_refreshes"] == 1
+
+    @pytest.mark.asyncio
+    async def test_beta_zero_never_refreshes_early(self):
+        clock = FakeClock()
+        cache = TypedCache(MemoryCacheBackend(), beta=0, clock=clock)
+        await cache.get_or_load("k", CountingLoader(1), ttl=60)
+        clock.now += 59
+        loader = CountingLoader(2)
+
+        assert await cache.get_or_load("k", loader, ttl=60) == 1
+        assert loader.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_other_readers_keep_the_value_during_refresh(self):
+        clock = FakeClock()
+        cache = TypedCache(MemoryCacheBackend(), beta=1e9, clock=clock)
+
+        async def slow():
+            clock.now += 1
+            return 1
+
+        await cache.get_or_load("k", slow, ttl=60)
+        loader = CountingLoader(2, delay=0.05)
+
+        refreshing = asyncio.ensure_future(cache.get_or_load("k", loader, ttl=60))
+        await asyncio.sleep(0.01)
+        others = [await cache.get_or_load("k", loader, ttl=60) for _ in range(3)]
+
+        assert await refreshing == 2
+        assert others == [1, 1, 1]
+        assert loader.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_early_refresh_returns_current_value(self):
+        clock = FakeClock()
+        cache = TypedCache(MemoryCacheBackend(), beta=1e9, clock=clock)
+
+        async def slow():
+            clock.now += 1
+            return 1
+
+        async def failing():
+            raise ConnectionError("database down")
+
+        await cache.get_or_load("k", slow, ttl=60)
+        clock.now += 30
+
+        assert await cache.get_or_load("k", failing, ttl=60, type_=int) == 1
+        assert cache.stats["early_refreshes"] == 1
+        assert cache.stats["errors"] == 1
+        # Still cached: the next successful refresh replaces it
+        assert await cache.get_or_load("k", CountingLoader(2), ttl=60) == 2
+
+
+class TestCachedDecorator:
+    """Tests for @cached."""
+
+    @pytest.mark.asyncio
+    async def test_key_from_arguments_and_invalidate(self):
+        cache = TypedCache(MemoryCacheBackend())
+
+        class Service:
+            def __init__(self):
+                self.calls = 0
+
+            @cached(key="users:count:{exact}", ttl=60, cache=lambda: cache)
+            async def count(self, exact: bool = False) -> int:
+                self.calls += 1
+                return 10 if exact else 9
+
+        service = Service()
+
+        assert await service.count() == 9
+        assert await service.count(exact=True) == 10
+        assert await service.count(exact=False) == 9
+        assert service.calls == 2
+        assert Service.count.key_for(service, True) == "users:count:True"
+
+        assert await Service.count.invalidate(service, exact=True) is True
+        assert await service.count(exact=True) == 10
+        assert service.calls == 3
+
+    @pytest.mark.asyncio
+    async def test_return_annotation_types_cached_values(self):
+        cache = TypedCache(MemoryCacheBackend())
+
+        @cached(key="summary", ttl=60, cache=cache)
+        async def summary() -> Summary:
+            return Summary(total=1, names=["a"])
+
+        await summary()
+
+        assert await summary() == Summary(total=1, names=["a"])
+        assert cache.stats["hits"] == 1
+{%- if cookiecutter.use_redis == 'yes' %}
+
+
+class TestDistributedLock:
+    """Tests for lock=True across workers sharing Redis."""
+
+    @pytest.fixture
+    def redis_client(self):
+        import fakeredis
+
+        return fakeredis.FakeAsyncRedis(decode_responses=True)
+
+    def make_worker(self, client, **kwargs):
+        from internal.adapters.cache.redis_cache import RedisCacheRepository
+
+        return TypedCache(RedisCacheRepository(client), lock_client=client, **kwargs)
+
+    @pytest.mark.asyncio
+    async def test_one_load_across_workers(self, redis_client):
+        workers = [self.make_worker(redis_client) for _ in range(4)]
+        loader = CountingLoader(delay=0.1)
+
+        results = await asyncio.gather(*(
+            worker.get_or_load("hot", loader, ttl=60, type_=int, lock=True)
+            for worker in workers
+            for _ in range(10)
+        ))
+
+        assert results == [42] * 40
+        assert loader.calls == 1
+        assert await redis_client.exists("cache:hot:lock") == 0
+
+    @pytest.mark.asyncio
+    async def test_waiter_loads_itself_when_holder_is_too_slow(self, redis_client):
+        await redis_client.set("cache:hot:lock", "someone-else")
+        worker = self.make_worker(redis_client, lock_wait_seconds=0.1)
+        loader = CountingLoader()
+
+        assert await worker.get_or_load("hot", loader, ttl=60, lock=True) == 42
+        assert loader.calls == 1
+        # The other holder's lock is left alone
+        assert await redis_client.get("cache:hot:lock") == "someone-else"
+{%- endif %}
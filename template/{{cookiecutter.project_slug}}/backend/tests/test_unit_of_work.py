@@ -0,0 +1,188 @@
+{%- if cookiecutter.database == 'postgresql' %}
+"""
+Load test for the request-scoped UnitOfWork.
+Fires 500 concurrent requests through FastAPI and checks that pooled
+connections stay bounded and are all returned when the requests finish.
+Uses a file-backed SQLite database as a stand-in for PostgreSQL.
+"""
+import asyncio
+
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from internal.adapters.db.connection import Base
+from internal.adapters.db.unit_of_work import UnitOfWork, get_unit_of_work
+from internal.services.auth_deps import get_user_service
+from internal.services.user_service import UserService
+
+POOL_SIZE = 5
+MAX_OVERFLOW = 5
+CONCURRENT_REQUESTS = 500
+
+
+class PoolTracker:
+    """Counts live checkouts of a connection pool."""
+
+    def __init__(self, engine):
+        self.checked_out = 0
+        self.peak = 0
+        event.listen(engine.sync_engine, "checkout", self._on_checkout)
+        event.listen(engine.sync_engine, "checkin", self._on_checkin)
+
+    def _on_checkout(self, *args):
+        self.checked_out += 1
+        self.peak = max(self.peak, self.checked_out)
+
+    def _on_checkin(self, *args):
+        self.checked_out -= 1
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'uow.db'}",
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_timeout=30,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def app(engine):
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def test_unit_of_work():
+        async with UnitOfWork(session_factory) as uow:
+            yield uow
+
+    async def current_user_stub(user_service: UserService = Depends(get_user_service)):
+        # Stands in for get_current_user, which resolves the same service
+        return user_service
+
+    app = FastAPI()
+    app.dependency_overrides[get_unit_of_work] = test_unit_of_work
+
+    @app.get("/users/count")
+    async def count_users(
+        auth_service: UserService = Depends(current_user_stub),
+        user_service: UserService = Depends(get_user_service),
+    ):
+        await asyncio.sleep(0)  # let other requests interleave
+        return {
+            "count": await user_service.count_users(exact=True),
+            "shared_session": auth_service.user_repo.session is user_service.user_repo.session,
+        }
+
+    return app
+
+
+class TestUnitOfWorkUnderLoad:
+    """Pool behaviour of the request-scoped UnitOfWork."""
+
+    @pytest.mark.asyncio
+    async def test_pool_checkouts_stay_bounded(self, app, engine):
+        """500 concurrent requests never exceed the pool and leak nothing."""
+        tracker = PoolTracker(engine)
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            responses = await asyncio.gather(
+                *(client.get("/users/count") for _ in range(CONCURRENT_REQUESTS))
+            )
+
+        assert all(r.status_code == 200 for r in responses)
+        assert all(r.json()["shared_session"] for r in responses)
+        assert 0 < tracker.peak <= POOL_SIZE + MAX_OVERFLOW
+        assert tracker.checked_out == 0
+        assert engine.pool.checkedout() == 0
+
+    @pytest.mark.asyncio
+    async def test_rollback_on_error(self, engine):
+        """Work is rolled back and the connection released when the request fails."""
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        from internal.entities.user import User
+
+        with pytest.raises(RuntimeError):
+            async with UnitOfWork(session_factory) as uow:
+                await uow.users.create(User(email="a@example.com", username="alice"))
+                raise RuntimeError("boom")
+
+        async with UnitOfWork(session_factory) as uow:
+            assert await uow.users.count() == 0
+        assert engine.pool.checkedout() == 0
+
+    @pytest.mark.asyncio
+    async def test_after_commit_runs_only_on_commit(self, engine):
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        calls = []
+
+        async def record():
+            calls.append("ran")
+
+        with pytest.raises(RuntimeError):
+            async with UnitOfWork(session_factory) as uow:
+                uow.after_commit(record)
+                raise RuntimeError("boom")
+        async with UnitOfWork(session_factory) as uow:
+            uow.after_commit(record)
+            assert calls == []
+
+        assert calls == ["ran"]
+
+
+class TestCommitBeforeResponse:
+    """The request's work is committed before the response is sent."""
+
+    @pytest.fixture
+    def session_factory(self, engine):
+        return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    def make_app(self, uow_factory):
+        from internal.entities.user import User
+
+        async def test_unit_of_work():
+            async with uow_factory() as uow:
+                yield uow
+
+        app = FastAPI()
+        app.dependency_overrides[get_unit_of_work] = test_unit_of_work
+
+        @app.post("/users", status_code=201)
+        async def create(user_service: UserService = Depends(get_user_service)):
+            await user_service.user_repo.create(User(email="a@example.com", username="alice"))
+            return {"ok": True}
+
+        @app.get("/users/count")
+        async def count(user_service: UserService = Depends(get_user_service)):
+            return {"count": await user_service.count_users(exact=True)}
+
+        return app
+
+    @pytest.mark.asyncio
+    async def test_failed_commit_is_an_error_response(self, session_factory):
+        class FailingCommit(UnitOfWork):
+            async def commit(self):
+                raise RuntimeError("commit failed")
+
+        app = self.make_app(lambda: FailingCommit(session_factory))
+        transport = ASGITransport(app=app, raise_app_exceptions=False)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post("/users")
+
+        assert response.status_code == 500
+
+    @pytest.mark.asyncio
+    async def test_write_is_visible_to_the_next_request(self, session_factory):
+        app = self.make_app(lambda: UnitOfWork(session_factory))
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            assert (await client.post("/users")).status_code == 201
+            assert (await client.get("/users/count")).json() == {"count": 1}
+{%- endif %}
@@ -154,3 +154,24 @@ class TestUserEntity:
         
         with pytest.raises(ValueError, match="Cannot change super admin role"):
             user.demote_to_user()
+    
+    def test_new_user_reports_all_fields_changed(self):
+        """A never-loaded user should be written in full."""
+        user = User(email="test@example.com", username="test")
+        assert {"email", "username", "status", "created_at"} <= user.changed_fields
+    
+    def test_clean_user_tracks_changed_fields(self):
+        """Only fields modified after loading should be reported."""
+        user = User(email="test@example.com", username="test")
+        user.mark_clean()
+        assert user.changed_fields == set()
+        
+        user.suspend()
+        assert user.changed_fields == {"status", "updated_at"}
+    
+    def test_assigning_same_value_is_not_a_change(self):
+        """Re-assigning an identical value should not mark the field dirty."""
+        user = User(email="test@example.com", username="test")
+        user.mark_clean()
+        user.username = "test"
+        assert user.changed_fields == set()
@@ -0,0 +1,192 @@
+{%- if cookiecutter.database == 'postgresql' %}
+"""
+Tests for SQLAlchemyUserRepository uniqueness handling and bulk operations.
+Uses a file-backed SQLite database as a stand-in for PostgreSQL.
+"""
+import asyncio
+{%- if cookiecutter.auth_strategy == 'jwt_builtin' %}
+from unittest.mock import AsyncMock
+{%- endif %}
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from internal.adapters.db.connection import Base
+from internal.adapters.db.unit_of_work import UnitOfWork
+from internal.dto.requests import CreateUserRequest
+from internal.entities.user import User
+from internal.services.user_service import UserService
+from pkg.errors.exceptions import ConflictError
+
+CONCURRENT_REGISTRATIONS = 20
+
+
+@pytest.fixture
+async def factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'users.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+def make_user(username, email=None):
+    return User(email=email or f"{username}@example.com", username=username)
+
+
+class TestListNumberedUsernames:
+    """Tests for list_numbered_usernames()."""
+
+    @pytest.mark.asyncio
+    async def test_matches_base_and_numbered_variants_only(self, factory):
+        async with UnitOfWork(factory) as uow:
+            for name in ("john", "john1", "john12", "johnny", "john1a", "ajohn", "jon"):
+                await uow.users.create(make_user(name))
+
+        async with UnitOfWork(factory) as uow:
+            names = await uow.users.list_numbered_usernames("John")
+
+        assert sorted(names) == ["john", "john1", "john12"]
+
+    @pytest.mark.asyncio
+    async def test_wildcards_are_literal(self, factory):
+        async with UnitOfWork(factory) as uow:
+            for name in ("a.b", "a.b2", "axb", "ab_", "ab_2", "abx2"):
+                await uow.users.create(make_user(name))
+
+        async with UnitOfWork(factory) as uow:
+            assert sorted(await uow.users.list_numbered_usernames("ab_")) == ["ab_", "ab_2"]
+            assert sorted(await uow.users.list_numbered_usernames("a.b")) == ["a.b", "a.b2"]
+
+
+class TestBulkOperations:
+    """Tests for get_many(), create_many() and upsert_many()."""
+
+    @pytest.fixture(autouse=True)
+    def small_chunks(self, monkeypatch):
+        # Exercise the chunking with a handful of rows
+        from internal.adapters.db.user_repo import SQLAlchemyUserRepository
+        monkeypatch.setattr(SQLAlchemyUserRepository, "BULK_CHUNK_SIZE", 3)
+
+    @pytest.mark.asyncio
+    async def test_create_many_and_get_many(self, factory):
+        users = [make_user(f"user{i}") for i in range(7)]
+        async with UnitOfWork(factory) as uow:
+            created = await uow.users.create_many(users)
+
+        assert all(not u.changed_fields for u in created)
+        async with UnitOfWork(factory) as uow:
+            found = await uow.users.get_many([u.id for u in users] + [make_user("ghost").id])
+
+        assert sorted(u.username for u in found) == sorted(u.username for u in users)
+
+    @pytest.mark.asyncio
+    async def test_upsert_inserts_and_updates(self, factory):
+        existing = make_user("alice")
+        async with UnitOfWork(factory) as uow:
+            await uow.users.create(existing)
+
+        renamed = make_user("alice", email="alice@example.com")
+        renamed.first_name = "Alice"
+        new_users = [make_user(f"new{i}") for i in range(4)]
+        async with UnitOfWork(factory) as uow:
+            written = await uow.users.upsert_many([renamed] + new_users)
+
+        assert written == 5
+        async with UnitOfWork(factory) as uow:
+            alice = await uow.users.get_by_email("alice@example.com")
+            assert await uow.users.count() == 5
+        # Matched on email: the existing row keeps its id, the rest is updated
+        assert alice.id == existing.id
+        assert alice.first_name == "Alice"
+
+    @pytest.mark.asyncio
+    async def test_upsert_counts_each_key_once(self, factory):
+        async with UnitOfWork(factory) as uow:
+            await uow.users.create(make_user("bob"))
+
+        first = make_user("bob2", email="bob@example.com")
+        last = make_user("bob3", email="bob@example.com")
+        unchanged = make_user("carol")
+        async with UnitOfWork(factory) as uow:
+            await uow.users.create(unchanged)
+        async with UnitOfWork(factory) as uow:
+            written = await uow.users.upsert_many([first, unchanged, last])
+
+        # Duplicates collapse to the last one; an unchanged row still counts
+        assert written == 2
+        async with UnitOfWork(factory) as uow:
+            assert (await uow.users.get_by_email("bob@example.com")).username == "bob3"
+
+    @pytest.mark.asyncio
+    async def test_upsert_rejects_unknown_key(self, factory):
+        async with UnitOfWork(factory) as uow:
+            with pytest.raises(ValueError):
+                await uow.users.upsert_many([make_user("dave")], conflict_on="first_name")
+
+
+class TestCreateConflicts:
+    """create() reports unique violations without breaking the transaction."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("duplicate", [
+        make_user("taken", email="other@example.com"),
+        make_user("other", email="taken@example.com"),
+    ])
+    async def test_duplicate_raises_conflict(self, factory, duplicate):
+        async with UnitOfWork(factory) as uow:
+            await uow.users.create(make_user("taken"))
+
+        async with UnitOfWork(factory) as uow:
+            with pytest.raises(ConflictError):
+                await uow.users.create(duplicate)
+            # The same transaction can retry with another username
+            await uow.users.create(make_user("taken2", email="retry@example.com"))
+
+        async with UnitOfWork(factory) as uow:
+            assert await uow.users.get_by_username("taken2") is not None
+
+
+async def register(factory, email, username):
+    """One registration in its own request-scoped unit of work."""
+    {%- if cookiecutter.auth_strategy == 'jwt_builtin' %}
+    hasher = AsyncMock()
+    hasher.hash.return_value = "hashed"
+    {%- endif %}
+    async with UnitOfWork(factory) as uow:
+        {%- if cookiecutter.auth_strategy == 'jwt_builtin' %}
+        service = UserService(uow.users, password_hasher=hasher)
+        request = CreateUserRequest(email=email, username=username, password="SecurePass123!")
+        {%- else %}
+        service = UserService(uow.users)
+        request = CreateUserRequest(email=email, username=username)
+        {%- endif %}
+        return await service.create_user(request)
+
+
+class TestConcurrentRegistration:
+    """Concurrent registrations of the same account: exactly one wins."""
+
+    @pytest.mark.asyncio
+    async def test_same_email(self, factory):
+        results = await asyncio.gather(
+            *(register(factory, "race@example.com", f"racer{i}") for i in range(CONCURRENT_REGISTRATIONS)),
+            return_exceptions=True,
+        )
+
+        winners = [r for r in results if isinstance(r, User)]
+        conflicts = [r for r in results if isinstance(r, ConflictError)]
+        assert len(winners) == 1
+        assert len(conflicts) == CONCURRENT_REGISTRATIONS - 1
+        assert all("email already exists" in c.message for c in conflicts)
+
+    @pytest.mark.asyncio
+    async def test_same_username(self, factory):
+        results = await asyncio.gather(
+            *(register(factory, f"racer{i}@example.com", "racer") for i in range(CONCURRENT_REGISTRATIONS)),
+            return_exceptions=True,
+        )
+
+        assert sum(isinstance(r, User) for r in results) == 1
+        assert sum(isinstance(r, ConflictError) for r in results) == CONCURRENT_REGISTRATIONS - 1
+{%- endif %}
@@ -3,9 +3,11 @@ Unit tests for User Service.
 Tests business logic with mocked dependencies.
 """
 import pytest
-from unittest.mock import AsyncMock, MagicMock
-from internal.services.user_service import UserService
+from unittest.mock import AsyncMock, MagicMock, call
+from internal.dto.requests import CreateUserRequest
+from internal.services.user_service import UserService, decode_cursor, encode_cursor, pick_username
 from internal.entities.user import User, UserRole, UserStatus
+from pkg.errors.exceptions import ConflictError, ValidationError
 
 
 class TestUserService:
@@ -128,3 +130,193 @@ class TestUserService:
 
         assert result is True
         mock_user_repo.delete.assert_called_once_with("123")
+
+
+class TestUserListPagination:
+    """Tests for keyset pagination in UserService."""
+
+    @pytest.fixture
+    def mock_user_repo(self):
+        return AsyncMock()
+
+    @pytest.fixture
+    def user_service(self, mock_user_repo):
+        return UserService(mock_user_repo)
+
+    @staticmethod
+    def _users(count):
+        return [
+            User(email=f"user{i}@example.com", username=f"user{i}")
+            for i in range(count)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_first_page_returns_next_cursor(self, user_service, mock_user_repo):
+        """Should fetch one extra row to detect a next page."""
+        users = self._users(3)
+        mock_user_repo.list_page.return_value = users
+
+        page, next_cursor = await user_service.list_users_page(limit=2)
+
+        assert page == users[:2]
+        assert decode_cursor(next_cursor) == (users[1].created_at, users[1].id)
+        mock_user_repo.list_page.assert_called_once_with(limit=3, after=None)
+
+    @pytest.mark.asyncio
+    async def test_last_page_has_no_cursor(self, user_service, mock_user_repo):
+        """Should return no cursor when the page is not full."""
+        mock_user_repo.list_page.return_value = self._users(1)
+
+        page, next_cursor = await user_service.list_users_page(limit=2)
+
+        assert len(page) == 1
+        assert next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_cursor_is_passed_to_repository(self, user_service, mock_user_repo):
+        """Should decode the cursor into the repository's keyset position."""
+        anchor = self._users(1)[0]
+        mock_user_repo.list_page.return_value = []
+
+        await user_service.list_users_page(limit=10, cursor=encode_cursor(anchor))
+
+        mock_user_repo.list_page.assert_called_once_with(
+            limit=11,
+            after=(anchor.created_at, anchor.id),
+        )
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor(self, user_service):
+        """Should reject tampered cursors."""
+        with pytest.raises(ValidationError):
+            await user_service.list_users_page(cursor="not-a-cursor")
+
+    @pytest.mark.asyncio
+    async def test_count_is_estimated_by_default(self, user_service, mock_user_repo):
+        """Should only run the exact count when asked to."""
+        mock_user_repo.estimate_count.return_value = 1000
+        mock_user_repo.count.return_value = 1003
+
+        assert await user_service.count_users() == 1000
+        assert await user_service.count_users(exact=True) == 1003
+
+
+class TestCreateUser:
+    """Registration relies on unique constraints instead of pre-checks."""
+
+    @pytest.fixture
+    def mock_user_repo(self):
+        repo = AsyncMock()
+        repo.create.side_effect = lambda user: user
+        return repo
+
+    @pytest.fixture
+    def user_service(self, mock_user_repo):
+        {%- if cookiecutter.auth_strategy == 'jwt_builtin' %}
+        hasher = AsyncMock()
+        hasher.hash.return_value = "hashed"
+        return UserService(mock_user_repo, password_hasher=hasher)
+        {%- else %}
+        return UserService(mock_user_repo)
+        {%- endif %}
+
+    @staticmethod
+    def _request(**fields):
+        {%- if cookiecutter.auth_strategy == 'jwt_builtin' %}
+        fields.setdefault("password", "SecurePass123!")
+        {%- endif %}
+        return CreateUserRequest(email="new@example.com", username="newuser", **fields)
+
+    @pytest.mark.asyncio
+    async def test_happy_path_is_one_repository_call(self, user_service, mock_user_repo):
+        user = await user_service.create_user(self._request())
+
+        assert user.username == "newuser"
+        assert mock_user_repo.method_calls == [call.create(user)]
+
+    @pytest.mark.asyncio
+    async def test_duplicate_email(self, user_service, mock_user_repo):
+        mock_user_repo.create.side_effect = ConflictError()
+        mock_user_repo.get_by_email.return_value = User(email="new@example.com", username="other")
+
+        with pytest.raises(ConflictError, match="email already exists"):
+            await user_service.create_user(self._request())
+
+    @pytest.mark.asyncio
+    async def test_duplicate_username(self, user_service, mock_user_repo):
+        mock_user_repo.create.side_effect = ConflictError()
+        mock_user_repo.get_by_email.return_value = None
+
+        with pytest.raises(ConflictError, match="Username already taken"):
+            await user_service.create_user(self._request())
+
+
+class TestPickUsername:
+    """Tests for pick_username()."""
+
+    def test_base_when_free(self):
+        assert pick_username("john", ["johnny", "john1"]) == "john"
+
+    def test_smallest_free_suffix(self):
+        assert pick_username("john", ["john", "john1", "john2", "john4", "johnny"]) == "john3"
+{%- if cookiecutter.auth_strategy == 'jwt_builtin' %}
+
+
+class TestCreateUserFromGoogle:
+    """Username allocation for OAuth signups."""
+
+    @pytest.fixture
+    def mock_user_repo(self):
+        repo = AsyncMock()
+        repo.create.side_effect = lambda user: user
+        return repo
+
+    @pytest.fixture
+    def user_service(self, mock_user_repo):
+        hasher = AsyncMock()
+        hasher.hash.return_value = "hashed"
+        return UserService(mock_user_repo, password_hasher=hasher)
+
+    @pytest.mark.asyncio
+    async def test_one_query_for_taken_usernames(self, user_service, mock_user_repo):
+        """Should pick a free suffix from a single lookup."""
+        mock_user_repo.list_numbered_usernames.return_value = ["john", "john1"]
+
+        user = await user_service.create_user_from_google(email="John@example.com")
+
+        assert user.username == "john2"
+        mock_user_repo.list_numbered_usernames.assert_called_once_with("john")
+        mock_user_repo.get_by_username.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_retries_when_username_is_taken_concurrently(self, user_service, mock_user_repo):
+        """Should re-read taken usernames and retry after a unique violation."""
+        mock_user_repo.list_numbered_usernames.side_effect = [["john"], ["john", "john1"]]
+        mock_user_repo.create.side_effect = [ConflictError(), User(email="john@example.com", username="john2")]
+        mock_user_repo.get_by_email.return_value = None
+
+        user = await user_service.create_user_from_google(email="john@example.com")
+
+        assert user.username == "john2"
+        assert [c.args[0].username for c in mock_user_repo.create.call_args_list] == ["john1", "john2"]
+
+    @pytest.mark.asyncio
+    async def test_returns_user_created_concurrently(self, user_service, mock_user_repo):
+        """Should return the account when the same email signed up meanwhile."""
+        existing = User(email="john@example.com", username="john")
+        mock_user_repo.list_numbered_usernames.return_value = []
+        mock_user_repo.create.side_effect = ConflictError()
+        mock_user_repo.get_by_email.return_value = existing
+
+        assert await user_service.create_user_from_google(email="john@example.com") is existing
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_attempts(self, user_service, mock_user_repo):
+        mock_user_repo.list_numbered_usernames.return_value = []
+        mock_user_repo.create.side_effect = ConflictError()
+        mock_user_repo.get_by_email.return_value = None
+
+        with pytest.raises(ConflictError):
+            await user_service.create_user_from_google(email="john@example.com")
+        assert mock_user_repo.create.call_count == UserService.USERNAME_ATTEMPTS
+{%- endif %}
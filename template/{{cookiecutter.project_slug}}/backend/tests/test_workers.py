@@ -0,0 +1,43 @@
+{%- if cookiecutter.task_runner == 'temporal' %}
+"""
+Tests for Temporal activities.
+"""
+import dataclasses
+
+import pytest
+from temporalio.testing import ActivityEnvironment
+
+from internal.workers.activities import ProcessBatchInput, process_batch_activity
+
+
+def done(item):
+    return {"input": item, "processed_at": "earlier", "status": "completed"}
+
+
+class TestProcessBatchActivity:
+    @pytest.mark.asyncio
+    async def test_processes_every_item_and_heartbeats_progress(self):
+        env = ActivityEnvironment()
+        heartbeats = []
+        env.on_heartbeat = lambda *details: heartbeats.append(list(details[0]))
+
+        results = await env.run(process_batch_activity, ProcessBatchInput(items=["a", "b", "c"]))
+
+        assert [r["input"] for r in results] == ["a", "b", "c"]
+        assert [len(h) for h in heartbeats] == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_retry_resumes_after_last_heartbeat(self):
+        env = ActivityEnvironment()
+        env.info = dataclasses.replace(env.info, heartbeat_details=[[done("a"), done("b")]])
+        heartbeats = []
+        env.on_heartbeat = lambda *details: heartbeats.append(list(details[0]))
+
+        results = await env.run(process_batch_activity, ProcessBatchInput(items=["a", "b", "c", "d"]))
+
+        assert [r["input"] for r in results] == ["a", "b", "c", "d"]
+        # Items from the previous attempt are kept, not reprocessed
+        assert results[:2] == [done("a"), done("b")]
+        assert [r["input"] for r in heartbeats[0]] == ["a", "b", "c"]
+        assert len(heartbeats) == 2
+{%- endif %}